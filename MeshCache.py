@@ -3,8 +3,7 @@
 # All rights reserved.
 # SPDX-License-Identifier: BSD-3-Clause
 
-from math import log2
-from typing import List, Tuple
+from typing import List, Optional, Tuple
 
 from gem5.utils.requires import requires
 from gem5.utils.override import overrides
@@ -39,10 +38,20 @@ from .components.DMATile import DMATile
 from .components.L3OnlyTile import L3OnlyTile
 from .components.L3Slice import L3Slice
 from .components.MemTile import MemTile
-from .components.MeshDescriptor import MeshTracker, NodeType
-from .components.MeshNetwork import MeshNetwork
+from .components.MeshDescriptor import (
+    MeshTracker,
+    NetworkBackend,
+    NodeType,
+    RoutingAlgorithm,
+    TopologyType,
+)
+from .components.MeshNetwork import GarnetMeshNetwork, MeshNetwork
 from .components.NetworkComponents import RubyRouter
+from .components.Tile import Tile
+from .utils.AddressInterleaving import AddressInterleaving, check_slice_ranges
 from .utils.SizeArithmetic import SizeArithmetic
+from .utils.SubNumaClustering import SubNumaClustering
+from .utils.TopologyPlan import TopologyPlan
 
 
 class MeshCache(AbstractRubyCacheHierarchy, AbstractThreeLevelCacheHierarchy):
@@ -60,6 +69,12 @@ class MeshCache(AbstractRubyCacheHierarchy, AbstractThreeLevelCacheHierarchy):
         is_fullsystem: bool,
         data_prefetcher_class: str,
         mesh_descriptor: MeshTracker,
+        routing_algorithm: RoutingAlgorithm = RoutingAlgorithm.Shortest,
+        l3_interleaving: Optional[AddressInterleaving] = None,
+        snc_clustering: Optional[SubNumaClustering] = None,
+        topology: TopologyType = TopologyType.Mesh,
+        topology_plan: Optional[TopologyPlan] = None,
+        network_backend: NetworkBackend = NetworkBackend.Simple,
     ):
         AbstractRubyCacheHierarchy.__init__(self=self)
         AbstractThreeLevelCacheHierarchy.__init__(
@@ -78,6 +93,15 @@ class MeshCache(AbstractRubyCacheHierarchy, AbstractThreeLevelCacheHierarchy):
         self._num_core_complexes = num_core_complexes
         self._is_fullsystem = is_fullsystem
         self._mesh_descriptor = mesh_descriptor
+        self._routing_algorithm = routing_algorithm
+        self._topology = topology
+        if l3_interleaving is None:
+            l3_interleaving = AddressInterleaving()
+        self._l3_interleaving = l3_interleaving
+        self._snc_clustering = snc_clustering
+        self._snc_regions = []
+        self._topology_plan = topology_plan
+        self._network_backend = network_backend
         self._has_dma = False
         self._has_l3_only_tiles = False
 
@@ -126,8 +150,16 @@ class MeshCache(AbstractRubyCacheHierarchy, AbstractThreeLevelCacheHierarchy):
     def _setup_ruby_system(self) -> None:
         self.ruby_system = RubySystem()
         self.ruby_system.number_of_virtual_networks = 4
-        self.ruby_system.network = MeshNetwork(
-            ruby_system=self.ruby_system, mesh_descriptor=self._mesh_descriptor
+        if self._network_backend == NetworkBackend.Garnet:
+            network_class = GarnetMeshNetwork
+        else:
+            network_class = MeshNetwork
+        self.ruby_system.network = network_class(
+            ruby_system=self.ruby_system,
+            mesh_descriptor=self._mesh_descriptor,
+            routing_algorithm=self._routing_algorithm,
+            topology=self._topology,
+            topology_plan=self._topology_plan,
         )
         self.ruby_system.network.number_of_virtual_networks = 4
         self.ruby_system.num_of_sequencers = 0
@@ -137,10 +169,7 @@ class MeshCache(AbstractRubyCacheHierarchy, AbstractThreeLevelCacheHierarchy):
         self.ruby_system.num_of_sequencers = (
             self.ruby_system.network.get_num_sequencers()
         )
-        self.ruby_system.network.int_links = self.ruby_system.network._int_links
-        self.ruby_system.network.ext_links = self.ruby_system.network._ext_links
-        self.ruby_system.network.routers = self.ruby_system.network._routers
-        self.ruby_system.network.setup_buffers()
+        self.ruby_system.network.finalize()
 
     def _create_core_tiles(
         self, board: AbstractBoard, data_prefetcher_class: str
@@ -211,23 +240,65 @@ class MeshCache(AbstractRubyCacheHierarchy, AbstractThreeLevelCacheHierarchy):
         # mem_start = board.get_memory().get_start_addr()
         mem_start = self._find_board_mem_start(board)
         mem_size = board.get_memory().get_size()
-        interleaving_size = "4KiB"
-        num_offset_bits = int(log2(SizeArithmetic(interleaving_size).bytes))
         all_l3_slices = self._get_all_l3_slices()
-        num_l3_slices = len(all_l3_slices)
-        num_slice_indexing_bits = int(log2(num_l3_slices))
-        address_ranges = [
-            AddrRange(
-                start=mem_start,
-                size=mem_size,
-                intlvHighBit=num_offset_bits + num_slice_indexing_bits - 1,
-                intlvBits=num_slice_indexing_bits,
-                intlvMatch=i,
+        if self._topology_plan is not None:
+            self._check_topology_plan(mem_start, mem_size)
+            slice_ranges = self._topology_plan.get_l3_slice_ranges()
+            self._snc_regions = self._topology_plan.get_snc_regions()
+        elif self._snc_clustering is None:
+            slice_ranges = self._l3_interleaving.get_slice_ranges(
+                mem_start, mem_size, len(all_l3_slices)
+            )
+            check_slice_ranges(slice_ranges, mem_start, mem_size)
+        else:
+            slice_ranges = self._snc_clustering.get_slice_ranges(
+                self._l3_interleaving,
+                [tile.get_coordinate() for tile in self._get_all_l3_tiles()],
+                self._mesh_descriptor,
+                mem_start,
+                mem_size,
+            )
+            self._set_snc_regions(mem_start, mem_size)
+        for ranges, l3_slice in zip(slice_ranges, all_l3_slices):
+            l3_slice.addr_ranges = [r.to_addr_range() for r in ranges]
+
+    def _check_topology_plan(self, mem_start: int, mem_size: int) -> None:
+        assert self._topology_plan.matches(
+            self._mesh_descriptor,
+            mem_start,
+            mem_size,
+            self._routing_algorithm,
+            self._topology,
+            self._l3_interleaving,
+            self._snc_clustering,
+        ), (
+            "The topology plan "
+            f"{self._topology_plan.get_config_hash()} was made for another "
+            "configuration"
+        )
+
+    def _set_snc_regions(self, mem_start: int, mem_size: int) -> None:
+        clusters = [
+            self._snc_clustering.get_cluster(
+                tile.get_coordinate(), self._mesh_descriptor
+            )
+            for tile in self.core_tiles
+        ]
+        self._snc_regions = [
+            (
+                region_start,
+                region_size,
+                [core_id for core_id, c in enumerate(clusters) if c == cluster],
+            )
+            for cluster, (region_start, region_size) in enumerate(
+                self._snc_clustering.get_regions(mem_start, mem_size)
             )
-            for i in range(num_l3_slices)
         ]
-        for address_range, l3_slice in zip(address_ranges, all_l3_slices):
-            l3_slice.addr_ranges = address_range
+
+    # The (start, size, core ids) of the memory region of every SNC cluster,
+    # e.g. to describe the NUMA nodes to the OS. Empty without SNC.
+    def get_snc_regions(self) -> List[Tuple[int, int, List[int]]]:
+        return self._snc_regions
 
     def _create_memory_tiles(self, board: AbstractBoard) -> None:
         # ARM full system has a functional memory port
@@ -304,6 +375,11 @@ class MeshCache(AbstractRubyCacheHierarchy, AbstractThreeLevelCacheHierarchy):
         for tile in self.dma_tiles:
             self.ruby_system.network.incorporate_ruby_subsystem(tile)
 
+    def _get_all_l3_tiles(self) -> List[Tile]:
+        if self._has_l3_only_tiles:
+            return self.core_tiles + self.l3_only_tiles
+        return self.core_tiles
+
     def _get_all_l3_slices(self) -> List[L3Slice]:
         if self._has_l3_only_tiles:
             all_l3_slices = [tile.l3_slice for tile in self.core_tiles] + [
@@ -318,11 +394,11 @@ class MeshCache(AbstractRubyCacheHierarchy, AbstractThreeLevelCacheHierarchy):
         l3_routers = []
         for tile in self.core_tiles:
             l3_slices.append(tile.l3_slice)
-            l3_routers.append(tile.l3_router)
+            l3_routers.append(tile.get_l3_router())
         if self._has_l3_only_tiles:
             for tile in self.l3_only_tiles:
                 l3_slices.append(tile.l3_slice)
-                l3_routers.append(tile.l3_router)
+                l3_routers.append(tile.get_l3_router())
         return l3_slices, l3_routers
 
     def _set_downstream_destinations(self) -> None:
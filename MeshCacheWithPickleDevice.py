@@ -3,8 +3,9 @@
 # All rights reserved.
 # SPDX-License-Identifier: BSD-3-Clause
 
+import json
 from math import log2
-from typing import List
+from typing import Any, Dict, List, Optional
 
 from gem5.utils.requires import requires
 from gem5.utils.override import overrides
@@ -35,6 +36,8 @@ from m5.objects import (
     TrafficMux,
     PickleDevice,
     LLCPrefetchAgent,
+    NoncoherentXBar,
+    Bridge,
     NULL
 )
 
@@ -44,10 +47,24 @@ from .components.L3OnlyTile import L3OnlyTile
 from .components.L3Slice import L3Slice
 from .components.MemTile import MemTile
 from .components.PickleDeviceTile import PickleDeviceTile
-from .components.MeshDescriptor import MeshTracker, NodeType
+from .components.MeshDescriptor import (
+    LinkClass,
+    MeshTracker,
+    NetworkBackend,
+    NodeType,
+    RoutingAlgorithm,
+    TopologyType,
+)
 from .components.MeshNetwork import MeshNetwork
+from .components.NetworkComponents import RubyRouter
 from .components.custom_components.DummyCacheController import DummyCacheController
+from .utils.AddressInterleaving import AddressInterleaving, check_slice_ranges
+from .utils.MeshAnalyzer import MeshAnalyzer
+from .utils.PrefetchThrottle import PrefetchThrottle
 from .utils.SizeArithmetic import SizeArithmetic
+from .utils.SubNumaClustering import SubNumaClustering
+from .utils.TranslationCaches import TranslationCaches
+from .utils.TopologyPlan import TopologyPlan
 from .MeshCache import MeshCache
 
 
@@ -69,6 +86,16 @@ class MeshCacheWithPickleDevice(MeshCache):
         device_cache_size: str,
         device_cache_assoc: int,
         pdev_num_tbes: int,
+        routing_algorithm: RoutingAlgorithm = RoutingAlgorithm.Shortest,
+        l3_interleaving: Optional[AddressInterleaving] = None,
+        snc_clustering: Optional[SubNumaClustering] = None,
+        topology: TopologyType = TopologyType.Mesh,
+        topology_plan: Optional[TopologyPlan] = None,
+        network_backend: NetworkBackend = NetworkBackend.Simple,
+        pickle_device_assignment: Optional[List[int]] = None,
+        llc_prefetch_throttle: Optional[PrefetchThrottle] = None,
+        pdev_translation_caches: Optional[TranslationCaches] = None,
+        pdev_interleaving: Optional[AddressInterleaving] = None,
     ):
         MeshCache.__init__(
             self=self,
@@ -84,12 +111,25 @@ class MeshCacheWithPickleDevice(MeshCache):
             is_fullsystem=is_fullsystem,
             data_prefetcher_class=data_prefetcher_class,
             mesh_descriptor=mesh_descriptor,
+            routing_algorithm=routing_algorithm,
+            l3_interleaving=l3_interleaving,
+            snc_clustering=snc_clustering,
+            topology=topology,
+            topology_plan=topology_plan,
+            network_backend=network_backend,
         )
         self._pickle_devices = []
         self._device_cache_size = device_cache_size
         self._device_cache_assoc = device_cache_assoc
         self._pdev_num_tbes = pdev_num_tbes
         self._addr_range_assigned = False
+        self._pickle_device_assignment = pickle_device_assignment
+        self._llc_prefetch_throttle = llc_prefetch_throttle
+        self._pdev_translation_caches = pdev_translation_caches
+        # how the memory is split between the device caches
+        if pdev_interleaving is None:
+            pdev_interleaving = AddressInterleaving()
+        self._pdev_interleaving = pdev_interleaving
 
     def set_pickle_devices(self, pickle_devices):
         self._pickle_devices = pickle_devices
@@ -97,6 +137,24 @@ class MeshCacheWithPickleDevice(MeshCache):
     def set_traffic_uncacheable_forwarders(self, uncacheable_forwarders):
         self._uncacheable_forwarders = uncacheable_forwarders
 
+    # The index of the pickle device of every core: the given assignment, or
+    # the device tile the fewest hops away from the core tile.
+    def get_pickle_device_assignment(self) -> List[int]:
+        core_tile_coordinates = self._mesh_descriptor.get_tiles_coordinates(
+            NodeType.CoreTile
+        )
+        if self._pickle_device_assignment is not None:
+            assert len(self._pickle_device_assignment) == len(
+                core_tile_coordinates
+            ), "pickle_device_assignment must have a pickle device for every core"
+            return self._pickle_device_assignment
+        return MeshAnalyzer(
+            self._mesh_descriptor, self._routing_algorithm, self._topology
+        ).get_nearest(
+            core_tile_coordinates,
+            self._mesh_descriptor.get_tiles_coordinates(NodeType.PickleDeviceTile),
+        )
+
     @overrides(MeshCache)
     def _create_core_tiles(
         self,
@@ -111,6 +169,7 @@ class MeshCacheWithPickleDevice(MeshCache):
         cores = board.get_processor().get_cores()
         num_l3_slices = self._mesh_descriptor.get_num_l3_slices()
         l3_slice_size = (SizeArithmetic(self._l3_size) // num_l3_slices).get()
+        assignment = self.get_pickle_device_assignment()
         self.core_tiles = [
             CoreTile(
                 board=board,
@@ -127,7 +186,7 @@ class MeshCacheWithPickleDevice(MeshCache):
                 l2_associativity=self._l2_assoc,
                 l3_slice_size=l3_slice_size,
                 l3_associativity=self._l3_assoc,
-                pickle_device=pickle_devices[0],
+                pickle_device=pickle_devices[assignment[core_id]],
                 uncacheable_forwarder=uncacheable_forwarders[core_id],
                 data_prefetcher_class=data_prefetcher_class,
             )
@@ -199,6 +258,28 @@ class MeshCacheWithPickleDevice(MeshCache):
         # Assign the LLC prefetch agent to the Pickle prefetcher
         for pickle_device in self._pickle_devices:
             pickle_device.prefetcher.llc_prefetch_agents = self.llc_prefetch_agents
+        self._create_llc_prefetch_agent_dummy_caches(board, l3_slices, l3_routers)
+        if self._llc_prefetch_throttle is not None:
+            for sequencer, dummy_cache, outstanding in zip(
+                self.llc_prefetch_agent_sequencers,
+                self.llc_prefetch_agent_dummy_caches,
+                self._llc_prefetch_throttle.get_outstanding(len(l3_slices)),
+            ):
+                self._llc_prefetch_throttle.configure(
+                    sequencer, dummy_cache, outstanding
+                )
+        # Connect sequencer to the agent
+        for agent, sequencer in zip(
+            self.llc_prefetch_agents, self.llc_prefetch_agent_sequencers
+        ):
+            agent.mem_side_port = sequencer.in_ports
+
+    def _create_llc_prefetch_agent_dummy_caches(
+        self,
+        board: AbstractBoard,
+        l3_slices: List[L3Slice],
+        l3_routers: List[RubyRouter],
+    ) -> None:
         # Create one dummy cache and one sequencer per LLC prefetch agent
         self.llc_prefetch_agent_dummy_caches = [
             DummyCacheController(
@@ -229,17 +310,44 @@ class MeshCacheWithPickleDevice(MeshCache):
             self.llc_prefetch_agent_dummy_caches, l3_slices
         ):
             dummy_cache.downstream_destinations = [l3_slice]
+        internal_profile = self._mesh_descriptor.get_link_profile(
+            LinkClass.TileInternal
+        )
         self.dummy_cache_and_l3_router_links = [
-            self.ruby_system.network.create_ext_link(dummy_cache, l3_router)
+            self.ruby_system.network.create_ext_link(
+                dummy_cache, l3_router, profile=internal_profile
+            )
             for dummy_cache, l3_router in zip(
                 self.llc_prefetch_agent_dummy_caches, l3_routers
             )
         ]
-        # Connect sequencer to the agent
-        for agent, sequencer in zip(
-            self.llc_prefetch_agents, self.llc_prefetch_agent_sequencers
-        ):
-            agent.mem_side_port = sequencer.in_ports
+
+    # The paths of the LLC prefetch agents and of their sequencers and L3
+    # slices, with the parameters of the throttle, for PrefetchThrottle.
+    # Without a throttle, the sequencers keep their default of 16 requests in
+    # flight, which is the default throttle.
+    def get_llc_prefetch_metadata(self) -> Dict[str, Any]:
+        l3_slices, _ = self._get_all_l3_slices_and_l3_routers()
+        throttle = self._llc_prefetch_throttle or PrefetchThrottle()
+        return {
+            "throttle": throttle.get_params(),
+            "agents": [
+                {
+                    "agent": agent.path(),
+                    "sequencer": sequencer.path(),
+                    "l3_slice": l3_slice.path(),
+                }
+                for agent, sequencer, l3_slice in zip(
+                    self.llc_prefetch_agents,
+                    self.llc_prefetch_agent_sequencers,
+                    l3_slices,
+                )
+            ],
+        }
+
+    def dump_llc_prefetch_metadata(self, path: str) -> None:
+        with open(path, "w") as f:
+            json.dump(self.get_llc_prefetch_metadata(), f, indent=1)
 
     def _create_pickle_device_component_tiles(
         self,
@@ -265,42 +373,91 @@ class MeshCacheWithPickleDevice(MeshCache):
             for pickle_device_tile_coordinate in pickle_device_tile_coordinates
         ]
         assert len(pickle_devices) == len(self.pickle_device_component_tiles)
-        for pd, tile in zip(pickle_devices, self.pickle_device_component_tiles):
-            self.traffic_mux = TrafficMux()
-            self.traffic_mux.rsp_ports = pd.request_port
+        if len(self.pickle_device_component_tiles) > 1:
+            self._create_pickle_device_xbar(board)
+        # one traffic mux per device, into the device caches
+        self.traffic_muxes = [TrafficMux() for _ in pickle_devices]
+        for pd, tile, traffic_mux in zip(
+            pickle_devices, self.pickle_device_component_tiles, self.traffic_muxes
+        ):
+            traffic_mux.rsp_ports = pd.request_port
+            if self._pdev_translation_caches is not None:
+                for mmu in [pd.mmu, pd.functional_mmu]:
+                    if mmu != NULL:
+                        self._pdev_translation_caches.configure(
+                            mmu, board.get_processor().get_isa()
+                        )
             if pd.mmu != NULL:
-                pd.mmu.connectWalkerPorts(
-                    self.traffic_mux.rsp_ports, self.traffic_mux.rsp_ports
-                )
+                pd.mmu.connectWalkerPorts(traffic_mux.rsp_ports, traffic_mux.rsp_ports)
             pd.functional_mmu.connectWalkerPorts(
-                self.traffic_mux.rsp_ports, self.traffic_mux.rsp_ports
+                traffic_mux.rsp_ports, traffic_mux.rsp_ports
             )
-            self.traffic_mux.req_port = tile.controller.sequencer.in_ports
-        all_l2_controllers = [tile.l2_cache for tile in self.core_tiles]
+            if len(self.pickle_device_component_tiles) > 1:
+                traffic_mux.req_port = self.pickle_device_xbar.cpu_side_ports
+            else:
+                traffic_mux.req_port = tile.controller.sequencer.in_ports
         for tile in self.pickle_device_component_tiles:
             self.ruby_system.network.incorporate_ruby_subsystem(tile)
 
+    # The device caches partition the memory with pdev_interleaving. The
+    # requests of every device and of its MMUs go through one crossbar to the
+    # device cache owning their line, behind a bridge claiming the ranges of
+    # that device cache, so no two device caches hold the same line.
+    def _create_pickle_device_xbar(self, board: AbstractBoard) -> None:
+        mem_start = self._find_board_mem_start(board)
+        mem_size = board.get_memory().get_size()
+        self.pickle_device_slice_ranges = self._pdev_interleaving.get_slice_ranges(
+            mem_start, mem_size, len(self.pickle_device_component_tiles)
+        )
+        check_slice_ranges(self.pickle_device_slice_ranges, mem_start, mem_size)
+        self.pickle_device_xbar = NoncoherentXBar(
+            width=self._cache_line_size,
+            frontend_latency=0,
+            forward_latency=0,
+            response_latency=0,
+            clk_domain=self._clk_domain,
+        )
+        self.pickle_device_bridges = [
+            Bridge(ranges=[r.to_addr_range() for r in ranges], delay="0ns")
+            for ranges in self.pickle_device_slice_ranges
+        ]
+        for tile, bridge in zip(
+            self.pickle_device_component_tiles, self.pickle_device_bridges
+        ):
+            bridge.cpu_side_port = self.pickle_device_xbar.mem_side_ports
+            bridge.mem_side_port = tile.controller.sequencer.in_ports
+
     def post_instantiate(self) -> None:
         pass
 
     @overrides(MeshCache)
     def _assign_addr_range(self, board: AbstractBoard) -> None:
         MeshCache._assign_addr_range(self, board)
-        pickle_device_tile = self.pickle_device_component_tiles[0]
-        pickle_device_tile.controller.addr_ranges = [AddrRange((1 << 64) - 2, size=1)]
+        # The lines are split between the device caches by the crossbar in
+        # front of them. The device caches are requesters, so their
+        # controllers only need an address range of their own that the L2s
+        # can tell apart from the L3 slices: one address below the top of the
+        # address space, the first one the same as with a single device.
+        for i, pickle_device_tile in enumerate(self.pickle_device_component_tiles):
+            pickle_device_tile.controller.addr_ranges = [
+                AddrRange((1 << 64) - 2 - i, size=1)
+            ]
         self._addr_range_assigned = True
 
     @overrides(MeshCache)
     def _set_downstream_destinations(self) -> None:
         all_l3_slices = self._get_all_l3_slices()
         all_mem_ctrls = [mem_tile.memory_controller for mem_tile in self.memory_tiles]
-        pickle_device_tile = self.pickle_device_component_tiles[0]
-        all_l3_slices_and_pickle_device_tile = all_l3_slices + [
-            pickle_device_tile.controller
-        ]
-        for tile in self.core_tiles:
-            tile.set_l2_downstream_destinations(all_l3_slices_and_pickle_device_tile)
-        pickle_device_tile.controller.downstream_destinations = all_l3_slices
+        # every core reaches the device cache of its own pickle device
+        for tile, device_index in zip(
+            self.core_tiles, self.get_pickle_device_assignment()
+        ):
+            pickle_device_tile = self.pickle_device_component_tiles[device_index]
+            tile.set_l2_downstream_destinations(
+                all_l3_slices + [pickle_device_tile.controller]
+            )
+        for pickle_device_tile in self.pickle_device_component_tiles:
+            pickle_device_tile.controller.downstream_destinations = all_l3_slices
         for l3_slice in all_l3_slices:
             l3_slice.downstream_destinations = all_mem_ctrls
         if self._has_dma:
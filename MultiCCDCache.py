@@ -2,8 +2,9 @@
 # All rights reserved.
 # SPDX-License-Identifier: BSD-3-Clause
 
+import copy
 from math import log2
-from typing import List, Tuple
+from typing import List, Optional, Tuple
 
 from gem5.utils.requires import requires
 from gem5.utils.override import overrides
@@ -35,8 +36,17 @@ from m5.objects import (
 
 from .multiccds_components.CCD import CCD
 from .multiccds_components.IOD import IOD
-from .components.MeshDescriptor import MeshTracker, NodeType
-from .components.MultiMeshNetwork import MultiMeshNetwork
+from .multiccds_components.IODPort import IODPort
+from .components.MeshDescriptor import (
+    LinkClass,
+    MeshTracker,
+    NetworkBackend,
+    NodeType,
+    TopologyType,
+)
+from .components.MultiMeshNetwork import GarnetMultiMeshNetwork, MultiMeshNetwork
+from .components.PrebuiltMesh import PrebuiltMesh
+from .utils.AddressInterleaving import AddressInterleaving
 
 
 class MultiCCDCache(AbstractRubyCacheHierarchy, AbstractThreeLevelCacheHierarchy):
@@ -55,6 +65,15 @@ class MultiCCDCache(AbstractRubyCacheHierarchy, AbstractThreeLevelCacheHierarchy
         data_prefetcher_class: str,
         mesh_descriptors: list[MeshTracker],
         num_memory_channels: int,
+        l3_interleaving: Optional[AddressInterleaving] = None,
+        network_backend: NetworkBackend = NetworkBackend.Simple,
+        iod_descriptor: Optional[MeshTracker] = None,
+        iod_topology: TopologyType = TopologyType.Mesh,
+        iod_ports: Optional[List[List[IODPort]]] = None,
+        num_iod_ports: int = 1,
+        l3_sizes: Optional[List[str]] = None,
+        num_global_directories: Optional[int] = None,
+        directory_interleaving: Optional[AddressInterleaving] = None,
     ):
         AbstractRubyCacheHierarchy.__init__(self=self)
         AbstractThreeLevelCacheHierarchy.__init__(
@@ -72,8 +91,34 @@ class MultiCCDCache(AbstractRubyCacheHierarchy, AbstractThreeLevelCacheHierarchy
         self._data_prefetcher_class = data_prefetcher_class
         self._num_ccds = num_ccds
         self._is_fullsystem = is_fullsystem
-        self._mesh_descriptors = mesh_descriptors
+        # every CCD registers its cross-tile routers on its own MeshTracker
+        self._mesh_descriptors = []
+        for mesh_descriptor in mesh_descriptors:
+            if any(mesh_descriptor is d for d in self._mesh_descriptors):
+                mesh_descriptor = copy.deepcopy(mesh_descriptor)
+            self._mesh_descriptors.append(mesh_descriptor)
+        # by default, the IOD is a ring of memory tiles, with a DMA tile for
+        # every DMA port of the board; it is built with the board
+        if iod_descriptor is None:
+            iod_topology = TopologyType.Torus
+        self._iod_descriptor = iod_descriptor
+        self._iod_topology = iod_topology
+        self._iod_ports = iod_ports
+        self._num_iod_ports = num_iod_ports
+        if iod_descriptor is not None and iod_ports is not None:
+            self._check_iod_ports()
+        # the total L3 size of every CCD, which is split between its slices
+        if l3_sizes is None:
+            l3_sizes = [l3_size] * len(self._mesh_descriptors)
+        assert len(l3_sizes) == len(
+            self._mesh_descriptors
+        ), "l3_sizes must have an L3 size for every CCD"
+        self._l3_sizes = l3_sizes
+        self._num_global_directories = num_global_directories
+        self._directory_interleaving = directory_interleaving
         self._num_memory_channels = num_memory_channels
+        self._l3_interleaving = l3_interleaving
+        self._network_backend = network_backend
         self._has_dma = False
         self._has_l3_only_tiles = False
 
@@ -92,10 +137,46 @@ class MultiCCDCache(AbstractRubyCacheHierarchy, AbstractThreeLevelCacheHierarchy
 
         requires(coherence_protocol_required=CoherenceProtocol.CHI)
 
+    def _create_iod_descriptor(self, board: AbstractBoard) -> None:
+        if self._iod_descriptor is None:
+            num_dma_ports = 0
+            if board.has_dma_ports():
+                num_dma_ports = len(board.get_dma_ports())
+            self._iod_descriptor = PrebuiltMesh.getIOD(
+                "iod", self._num_memory_channels, num_dma_ports
+            )
+        if self._iod_ports is None:
+            self._iod_ports = [
+                IODPort.get_default_ports(
+                    ccd_index,
+                    len(self._mesh_descriptors),
+                    mesh_descriptor,
+                    self._iod_descriptor,
+                    self._num_iod_ports,
+                )
+                for ccd_index, mesh_descriptor in enumerate(self._mesh_descriptors)
+            ]
+        self._check_iod_ports()
+
+    def _check_iod_ports(self) -> None:
+        assert len(self._iod_ports) == len(
+            self._mesh_descriptors
+        ), "iod_ports must have a list of ports for every CCD"
+        for mesh_descriptor, ports in zip(self._mesh_descriptors, self._iod_ports):
+            assert ports, f"CCD {mesh_descriptor.name} has no IOD port"
+            for port in ports:
+                assert mesh_descriptor.has_node(
+                    port.get_ccd_coordinate()
+                ), f"IOD port {port} is not on a tile of {mesh_descriptor.name}"
+                assert self._iod_descriptor.has_node(
+                    port.get_iod_coordinate()
+                ), f"IOD port {port} is not on a tile of the IOD"
+
     @overrides(AbstractCacheHierarchy)
     def incorporate_cache(self, board: AbstractBoard) -> None:
         self._setup_ruby_system()
         self._get_board_info(board)
+        self._create_iod_descriptor(board)
 
         # This function will create the core tiles and the l3-only tiles.
         self._create_ccds(
@@ -105,18 +186,24 @@ class MultiCCDCache(AbstractRubyCacheHierarchy, AbstractThreeLevelCacheHierarchy
             l1d_assoc=self._l1d_assoc,
             l2_size=self._l2_size,
             l2_assoc=self._l2_assoc,
-            l3_size=self._l3_size,
+            l3_sizes=self._l3_sizes,
             l3_assoc=self._l3_assoc,
             board=board,
             ruby_system=self.ruby_system,
             mesh_descriptors=self._mesh_descriptors,
             data_prefetcher_class=self._data_prefetcher_class,
+            l3_interleaving=self._l3_interleaving,
         )
+        self.ruby_system.network.create_mesh()
         self._create_iod(
             board=board,
             ruby_system=self.ruby_system,
             num_memory_channels=self._num_memory_channels,
             is_fullsystem=self._is_fullsystem,
+            iod_descriptor=self._iod_descriptor,
+            iod_topology=self._iod_topology,
+            num_global_directories=self._num_global_directories,
+            directory_interleaving=self._directory_interleaving,
         )
         self._link_ccds_to_iod()
         self._incorporate_system_ports(board)
@@ -135,7 +222,11 @@ class MultiCCDCache(AbstractRubyCacheHierarchy, AbstractThreeLevelCacheHierarchy
     def _setup_ruby_system(self) -> None:
         self.ruby_system = RubySystem()
         self.ruby_system.number_of_virtual_networks = 4
-        self.ruby_system.network = MultiMeshNetwork(
+        if self._network_backend == NetworkBackend.Garnet:
+            network_class = GarnetMultiMeshNetwork
+        else:
+            network_class = MultiMeshNetwork
+        self.ruby_system.network = network_class(
             ruby_system=self.ruby_system, mesh_descriptors=self._mesh_descriptors
         )
         self.ruby_system.network.number_of_virtual_networks = 4
@@ -149,12 +240,13 @@ class MultiCCDCache(AbstractRubyCacheHierarchy, AbstractThreeLevelCacheHierarchy
         l1d_assoc: int,
         l2_size: str,
         l2_assoc: int,
-        l3_size: str,
+        l3_sizes: List[str],
         l3_assoc: int,
         board: AbstractBoard,
         ruby_system: RubySystem,
         mesh_descriptors: list[MeshTracker],
         data_prefetcher_class: str,
+        l3_interleaving: Optional[AddressInterleaving],
     ) -> None:
         cores = board.get_processor().get_cores()
         # partition the cores to each mesh
@@ -176,7 +268,7 @@ class MultiCCDCache(AbstractRubyCacheHierarchy, AbstractThreeLevelCacheHierarchy
                 l1d_assoc=l1d_assoc,
                 l2_size=l2_size,
                 l2_assoc=l2_assoc,
-                l3_size=l3_size,
+                l3_size=l3_sizes[ccd_index],
                 l3_assoc=l3_assoc,
                 ccd_index=ccd_index,
                 board=board,
@@ -184,8 +276,11 @@ class MultiCCDCache(AbstractRubyCacheHierarchy, AbstractThreeLevelCacheHierarchy
                 ruby_system=ruby_system,
                 mesh_descriptor=mesh_descriptor,
                 data_prefetcher_class=data_prefetcher_class,
+                l3_interleaving=l3_interleaving,
+            )
+            for ccd_index, (core_list, mesh_descriptor) in enumerate(
+                zip(core_lists, mesh_descriptors)
             )
-            for ccd_index, core_list in enumerate(core_lists)
         ]
         for ccd in self.ccds:
             self.ruby_system.network.incorporate_ruby_subsystem(ccd)
@@ -196,40 +291,58 @@ class MultiCCDCache(AbstractRubyCacheHierarchy, AbstractThreeLevelCacheHierarchy
         ruby_system: RubySystem,
         num_memory_channels: int,
         is_fullsystem: bool,
+        iod_descriptor: MeshTracker,
+        iod_topology: TopologyType,
+        num_global_directories: Optional[int],
+        directory_interleaving: Optional[AddressInterleaving],
     ) -> None:
         self.iod = IOD(
             board=board,
             ruby_system=ruby_system,
             num_memory_channels=num_memory_channels,
             is_fullsystem=is_fullsystem,
+            iod_descriptor=iod_descriptor,
+            topology=iod_topology,
+            num_global_directories=num_global_directories,
+            directory_interleaving=directory_interleaving,
         )
         self.ruby_system.network.incorporate_ruby_subsystem(self.iod)
 
+    # Every IOD port is a pair of links between a CCD tile and an IOD tile,
+    # so the number of links grows with the number of ports. A path through
+    # another CCD crosses two ports, and the port links weigh more than any
+    # path inside the IOD so that such paths are never taken.
     def _link_ccds_to_iod(self) -> None:
-        for ccd in self.ccds:
-            if ccd._has_l3_only_tiles:
-                tiles = [
-                    *ccd.core_tiles,
-                    *ccd.l3_only_tiles,
-                ]
-            else:
-                tiles = ccd.core_tiles
-
-            for tile in tiles:
-                tile.to_iod_links = [
-                    self.ruby_system.network.create_int_link(
-                        src_node=tile.cross_tile_router,
-                        dst_node=global_directory_tile.global_directory_router
+        network = self.ruby_system.network
+        weight = self._iod_descriptor.get_width() + self._iod_descriptor.get_height()
+        for ccd, ports in zip(self.ccds, self._iod_ports):
+            default_profile = ccd._mesh_descriptor.get_link_profile(
+                LinkClass.IODAttach
+            )
+            ccd.to_iod_links = []
+            ccd.from_iod_links = []
+            for port in ports:
+                profile = port.get_profile(default_profile)
+                ccd_router = ccd._mesh_descriptor.get_cross_tile_router(
+                    port.get_ccd_coordinate()
+                )
+                iod_router = self.iod.get_iod_router(port.get_iod_coordinate())
+                ccd.to_iod_links.append(
+                    network.create_int_link(
+                        src_node=ccd_router,
+                        dst_node=iod_router,
+                        weight=weight,
+                        profile=profile,
                     )
-                    for global_directory_tile in self.iod.global_directory_tiles
-                ]
-                tile.from_iod_links = [
-                    self.ruby_system.network.create_int_link(
-                        src_node=global_directory_tile.global_directory_router,
-                        dst_node=tile.cross_tile_router,
+                )
+                ccd.from_iod_links.append(
+                    network.create_int_link(
+                        src_node=iod_router,
+                        dst_node=ccd_router,
+                        weight=weight,
+                        profile=profile,
                     )
-                    for global_directory_tile in self.iod.global_directory_tiles
-                ]
+                )
 
     def _incorporate_system_ports(self, board: AbstractBoard) -> None:
         self.ruby_system.sys_port_proxy = RubyPortProxy()
@@ -259,7 +372,4 @@ class MultiCCDCache(AbstractRubyCacheHierarchy, AbstractThreeLevelCacheHierarchy
         self.ruby_system.num_of_sequencers = (
             self.ruby_system.network.get_num_sequencers()
         )
-        self.ruby_system.network.int_links = self.ruby_system.network._int_links
-        self.ruby_system.network.ext_links = self.ruby_system.network._ext_links
-        self.ruby_system.network.routers = self.ruby_system.network._routers
-        self.ruby_system.network.setup_buffers()
+        self.ruby_system.network.finalize()
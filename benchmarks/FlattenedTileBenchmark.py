@@ -0,0 +1,123 @@
+# Copyright (c) 2026 The Regents of the University of California
+# All rights reserved.
+# SPDX-License-Identifier: BSD-3-Clause
+
+# Compares the regular tiles with the flattened tiles of
+# MeshTracker.set_flattened_tiles(). It runs under gem5, which builds the
+# cache hierarchies.
+#
+# Without --simulate, builds a MeshCache on generated meshes in both modes,
+# without instantiating it, and prints the number of routers and links of
+# its network, i.e. of the tiles and of the mesh links between them;
+# SimpleNetwork wakes up and buffers per router, so these drive the host
+# time of a simulation.
+#
+#   gem5.opt -m MeshCache.benchmarks.FlattenedTileBenchmark
+#
+# With --simulate, runs random traffic generators on a MeshCache and prints
+# the simulated seconds per host second, one mode per run since a gem5
+# process can only instantiate one system:
+#
+#   gem5.opt -m MeshCache.benchmarks.FlattenedTileBenchmark --simulate \
+#       --cores 64 [--flattened]
+
+import argparse
+import time
+from typing import Tuple
+
+from ..components.PrebuiltMesh import PrebuiltMesh
+
+
+def create_board(cores: int, flattened: bool, duration: str, rate: str):
+    from gem5.components.boards.test_board import TestBoard
+    from gem5.components.memory.multi_channel import DualChannelDDR4_2400
+    from gem5.components.processors.random_generator import RandomGenerator
+
+    from ..MeshCache import MeshCache
+
+    mesh = PrebuiltMesh.generate(f"mesh{cores}", cores=cores, mem_channels=2)
+    mesh.set_flattened_tiles(flattened)
+    memory = DualChannelDDR4_2400(size="2GiB")
+    generator = RandomGenerator(
+        num_cores=cores,
+        duration=duration,
+        rate=rate,
+        block_size=64,
+        min_addr=0,
+        max_addr=memory.get_size(),
+        rd_perc=70,
+    )
+    cache_hierarchy = MeshCache(
+        l1i_size="32KiB",
+        l1i_assoc=8,
+        l1d_size="32KiB",
+        l1d_assoc=8,
+        l2_size="512KiB",
+        l2_assoc=8,
+        l3_size=f"{2 * cores}MiB",
+        l3_assoc=16,
+        num_core_complexes=1,
+        is_fullsystem=False,
+        data_prefetcher_class="none",
+        mesh_descriptor=mesh,
+    )
+    return TestBoard(
+        clk_freq="3GHz",
+        generator=generator,
+        memory=memory,
+        cache_hierarchy=cache_hierarchy,
+    )
+
+
+# (routers, int links, ext links) of the network the cache hierarchy of the
+# board builds
+def get_network_size(board) -> Tuple[int, int, int]:
+    network = board.get_cache_hierarchy().ruby_system.network
+    return (
+        len(network.get_routers()),
+        len(network.get_int_links()),
+        len(network.get_ext_links()),
+    )
+
+
+def simulate(cores: int, flattened: bool, duration: str, rate: str) -> None:
+    from gem5.simulate.simulator import Simulator
+
+    board = create_board(cores, flattened, duration, rate)
+    simulator = Simulator(board=board)
+    start = time.time()
+    simulator.run()
+    host_seconds = time.time() - start
+    sim_seconds = simulator.get_current_tick() / 1e12
+    num_routers, _, _ = get_network_size(board)
+    print(
+        f"{cores} cores, {'flattened' if flattened else 'regular'} tiles: "
+        f"{num_routers} routers, {sim_seconds / host_seconds:.3e} simulated "
+        f"seconds per host second"
+    )
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--simulate", action="store_true")
+    parser.add_argument("--cores", type=int, default=16)
+    parser.add_argument("--flattened", action="store_true")
+    parser.add_argument("--duration", default="100us")
+    parser.add_argument("--rate", default="16GiB/s")
+    args = parser.parse_args()
+
+    if args.simulate:
+        simulate(args.cores, args.flattened, args.duration, args.rate)
+    else:
+        print(f"{'cores':>5} {'routers':>15} {'int links':>15} {'ext links':>15}")
+        for cores in [1, 4, 16, 64, 128, 256]:
+            sizes = []
+            for flattened in [False, True]:
+                # the network is built when the hierarchy is incorporated,
+                # which the board does before instantiating it
+                board = create_board(cores, flattened, args.duration, args.rate)
+                board.get_cache_hierarchy().incorporate_cache(board)
+                sizes.append(get_network_size(board))
+            print(
+                f"{cores:>5} "
+                + " ".join(f"{f'{r} -> {f}':>15}" for r, f in zip(*sizes))
+            )
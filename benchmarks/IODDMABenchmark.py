@@ -0,0 +1,121 @@
+# Copyright (c) 2026 The Regents of the University of California
+# All rights reserved.
+# SPDX-License-Identifier: BSD-3-Clause
+
+# A hop and link-count model of the DMA traffic of the MultiCCDCache IOD, not
+# a simulation: no gem5 objects are created, and every line is counted on the
+# routers of its shortest paths, without queueing, bandwidth or timing. The
+# DMA engines transfer contiguous runs of lines from random 4KiB pages. For
+# every number of global directories, prints the largest share of the lines
+# owned by one directory, and entering the router of one directory tile when
+# every line is routed to its directory, as IOD does, or to the first
+# directory, as IOD used to.
+#
+# Usage (from the directory containing the MeshCache package):
+#   python3 -m MeshCache.benchmarks.IODDMABenchmark
+
+import argparse
+import random
+from typing import Dict, List, Tuple
+
+from ..components.MeshDescriptor import MeshTracker, NodeType, TopologyType
+from ..components.PrebuiltMesh import PrebuiltMesh
+from ..utils.AddressInterleaving import AddressInterleaving
+from ..utils.MeshAnalyzer import MeshAnalyzer
+from ..utils.SizeArithmetic import SizeArithmetic
+
+mem_start = 0x80000000
+mem_size = 2**34
+
+
+def get_dma_lines(
+    num_engines: int, num_transfers: int, transfer_size: str, seed: int = 0
+) -> List[Tuple[int, int]]:
+    # (engine, address) of every line the DMA engines transfer
+    rng = random.Random(seed)
+    num_lines = SizeArithmetic(transfer_size).bytes // 64
+    lines = []
+    for engine in range(num_engines):
+        for _ in range(num_transfers):
+            start = mem_start + rng.randrange(mem_size // 4096) * 4096
+            lines += [(engine, start + i * 64) for i in range(num_lines)]
+    return lines
+
+
+def get_max_router_share(
+    iod: MeshTracker, lines: List[Tuple[int, int]], tiles: List[Tuple[int, int]]
+) -> float:
+    # the largest share of the lines entering the router of one of the
+    # tiles, every line going from the first to the second tile of its pair
+    demand: Dict[Tuple[Tuple[int, int], Tuple[int, int]], float] = {}
+    for key in lines:
+        demand[key] = demand.get(key, 0.0) + 1
+    flows = [(src, dst, amount) for (src, dst), amount in demand.items() if src != dst]
+    loads = MeshAnalyzer(iod, topology=TopologyType.Torus).get_link_loads(flows)
+    router_loads = {tile: 0.0 for tile in tiles}
+    for (src, dst), load in loads.items():
+        if dst in router_loads:
+            router_loads[dst] += load
+    return max(router_loads.values()) / len(lines)
+
+
+def run(
+    mem_channels: int,
+    num_engines: int,
+    num_directories: int,
+    interleaving: AddressInterleaving,
+    lines: List[Tuple[int, int]],
+) -> Tuple[float, float, float]:
+    iod = PrebuiltMesh.getIOD("iod", mem_channels, num_engines)
+    mem_tiles = [c.get_hash() for c in iod.get_tiles_coordinates(NodeType.MemTile)]
+    dma_tiles = [c.get_hash() for c in iod.get_tiles_coordinates(NodeType.DMATile)]
+    directory_tiles = [
+        mem_tiles[i % len(mem_tiles)] for i in range(num_directories)
+    ]
+    mem_end = mem_start + mem_size
+
+    num_lines = [0] * num_directories
+    routed_lines = []
+    legacy_lines = []
+    for engine, address in lines:
+        directory = interleaving.get_slice_index(address, num_directories, mem_end)
+        num_lines[directory] += 1
+        routed_lines.append((dma_tiles[engine], directory_tiles[directory]))
+        legacy_lines.append((dma_tiles[engine], directory_tiles[0]))
+    max_share = max(num_lines) / len(lines)
+    max_router_share = get_max_router_share(iod, routed_lines, directory_tiles)
+    legacy_share = get_max_router_share(iod, legacy_lines, directory_tiles)
+    return max_share, max_router_share, legacy_share
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--mem-channels", type=int, default=4)
+    parser.add_argument("--engines", type=int, default=2)
+    parser.add_argument("--transfers", type=int, default=256)
+    parser.add_argument("--transfer-size", default="64KiB")
+    args = parser.parse_args()
+
+    lines = get_dma_lines(args.engines, args.transfers, args.transfer_size)
+    print(
+        f"Link-count model (no timing) of {args.engines} DMA engines, "
+        f"{len(lines)} lines in {args.transfer_size} transfers, "
+        f"{args.mem_channels} memory channels"
+    )
+    print(
+        f"{'directories':>11} {'interleaving':>14} {'directory':>10} "
+        f"{'router':>10} {'first directory only':>21}"
+    )
+    configs = [(args.mem_channels, AddressInterleaving(granularity="4KiB"))]
+    for num_directories in [args.mem_channels, 2 * args.mem_channels, 16]:
+        configs.append(
+            (num_directories, AddressInterleaving(granularity="256B", hashed=True))
+        )
+    for num_directories, interleaving in configs:
+        max_share, max_router_share, legacy_share = run(
+            args.mem_channels, args.engines, num_directories, interleaving, lines
+        )
+        print(
+            f"{num_directories:>11} {str(interleaving):>14} {max_share:>10.3f} "
+            f"{max_router_share:>10.3f} {legacy_share:>21.3f}"
+        )
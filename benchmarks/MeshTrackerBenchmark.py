@@ -0,0 +1,82 @@
+# Copyright (c) 2026 The Regents of the University of California
+# All rights reserved.
+# SPDX-License-Identifier: BSD-3-Clause
+
+# Measures how long it takes to describe a mesh and to run the MeshTracker
+# queries that MeshCache.incorporate_cache() and MeshNetwork.create_mesh()
+# issue while building the cache hierarchy. No gem5 objects are created.
+#
+# Usage (from the directory containing the MeshCache package):
+#   python3 -m MeshCache.benchmarks.MeshTrackerBenchmark
+
+import sys
+import timeit
+
+from ..components.MeshDescriptor import Coordinate, MeshTracker, NodeType
+
+
+def build_mesh(width: int, height: int) -> MeshTracker:
+    # memory tiles on the top and bottom rows, core tiles everywhere else
+    mesh = MeshTracker(name=f"mesh{width}x{height}")
+    for y in range(height):
+        for x in range(width):
+            if y == 0 or y == height - 1:
+                node_type = NodeType.MemTile
+            else:
+                node_type = NodeType.CoreTile
+            mesh.add_node(Coordinate(x=x, y=y), node_type)
+    return mesh
+
+
+def replay_config_queries(mesh: MeshTracker) -> None:
+    # MeshCache.__init__
+    mesh.get_tiles_coordinates(NodeType.PickleDeviceTile)
+    # MeshCache._create_core_tiles / _create_l3_only_tiles
+    mesh.get_tiles_coordinates(NodeType.CoreTile)
+    mesh.get_num_l3_slices()
+    mesh.get_tiles_coordinates(NodeType.L3OnlyTile)
+    mesh.get_num_l3_slices()
+    # MeshCache._create_memory_tiles / _create_dma_tiles
+    mesh.get_tiles_coordinates(NodeType.FunctionalMemTile)
+    mesh.get_tiles_coordinates(NodeType.MemTile)
+    mesh.get_tiles_coordinates(NodeType.DMATile)
+    # CCD / MultiCCDCache count the tiles of every mesh
+    mesh.get_num_core_tiles()
+    mesh.get_num_mem_tiles()
+    mesh.get_num_pickle_device_tiles()
+    # MeshNetwork.create_mesh
+    width = mesh.get_width()
+    height = mesh.get_height()
+    for y in range(height):
+        for x in range(width):
+            coordinate = Coordinate(x, y)
+            if not mesh.has_node(coordinate):
+                continue
+            mesh.has_node(coordinate.get_north())
+            mesh.has_node(coordinate.get_south())
+            mesh.has_node(coordinate.get_west())
+            mesh.has_node(coordinate.get_east())
+
+
+def best_time_ms(fn, repeats: int) -> float:
+    return min(timeit.repeat(fn, number=1, repeat=repeats)) * 1000
+
+
+def run_benchmark(sizes, repeats: int) -> None:
+    print(f"{'mesh':>10} {'tiles':>7} {'build (ms)':>12} {'queries (ms)':>14}")
+    for width, height in sizes:
+        build_time = best_time_ms(lambda: build_mesh(width, height), repeats)
+        mesh = build_mesh(width, height)
+        query_time = best_time_ms(lambda: replay_config_queries(mesh), repeats)
+        print(
+            f"{f'{width}x{height}':>10} {width * height:>7} "
+            f"{build_time:>12.3f} {query_time:>14.3f}"
+        )
+
+
+if __name__ == "__main__":
+    repeats = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    run_benchmark(
+        sizes=[(2, 8), (4, 4), (8, 8), (16, 16), (32, 32), (64, 64)],
+        repeats=repeats,
+    )
@@ -24,7 +24,8 @@ from m5.objects import (
 from .L1Cache import L1Cache
 from .L2Cache import L2Cache
 from .L3Slice import L3Slice
-from .MeshDescriptor import Coordinate, MeshTracker
+from .MeshDescriptor import Coordinate, LinkClass, MeshTracker
+from .NetworkComponents import RubyRouter
 from .Tile import Tile
 
 
@@ -237,29 +238,59 @@ class CoreTile(Tile):
         self.l1i_cache.downstream_destinations = [self.l2_cache]
         self.l1d_cache.downstream_destinations = [self.l2_cache]
 
+    def get_l3_router(self) -> RubyRouter:
+        if self._mesh_descriptor.has_flattened_tiles():
+            return self.cross_tile_router
+        return self.l3_router
+
     def _create_links(self):
+        # the L1/L2 caches talk to each other through the router they are
+        # attached to, so their links are not merged in a flattened tile
+        cache_profile = self._mesh_descriptor.get_link_profile(
+            LinkClass.PrivateCacheAttach
+        )
+        internal_profile = self._mesh_descriptor.get_attach_profile(
+            LinkClass.TileInternal, LinkClass.TileInternal
+        )
+        if self._mesh_descriptor.has_flattened_tiles():
+            self.l1i_router_link = self.create_ext_link(
+                self.l1i_cache, self.cross_tile_router, profile=cache_profile
+            )
+            self.l1d_router_link = self.create_ext_link(
+                self.l1d_cache, self.cross_tile_router, profile=cache_profile
+            )
+            self.l2_router_link = self.create_ext_link(
+                self.l2_cache, self.cross_tile_router, profile=cache_profile
+            )
+            self.l3_router_link = self.create_ext_link(
+                self.l3_slice, self.cross_tile_router, profile=internal_profile
+            )
+            return
+
         self.intra_tile_router = self.create_router(self._ruby_system)
         self.l1i_router_link = self.create_ext_link(
-            self.l1i_cache, self.intra_tile_router, bandwidth_factor=64
+            self.l1i_cache, self.intra_tile_router, profile=cache_profile
         )
         self.l1d_router_link = self.create_ext_link(
-            self.l1d_cache, self.intra_tile_router, bandwidth_factor=64
+            self.l1d_cache, self.intra_tile_router, profile=cache_profile
         )
         self.l2_router_link = self.create_ext_link(
-            self.l2_cache, self.intra_tile_router, bandwidth_factor=64
+            self.l2_cache, self.intra_tile_router, profile=cache_profile
         )
         self.intra_tile_router_to_cross_tile_router_link = self.create_int_link(
-            self.intra_tile_router, self.cross_tile_router
+            self.intra_tile_router, self.cross_tile_router, profile=internal_profile
         )
         self.cross_tile_router_to_intra_tile_router_link = self.create_int_link(
-            self.cross_tile_router, self.intra_tile_router
+            self.cross_tile_router, self.intra_tile_router, profile=internal_profile
         )
 
         self.l3_router = self.create_router(self._ruby_system)
-        self.l3_router_link = self.create_ext_link(self.l3_slice, self.l3_router)
+        self.l3_router_link = self.create_ext_link(
+            self.l3_slice, self.l3_router, profile=internal_profile
+        )
         self.l3_router_to_cross_tile_router_link = self.create_int_link(
-            self.l3_router, self.cross_tile_router
+            self.l3_router, self.cross_tile_router, profile=internal_profile
         )
         self.cross_tile_router_to_l3_router_link = self.create_int_link(
-            self.cross_tile_router, self.l3_router
+            self.cross_tile_router, self.l3_router, profile=internal_profile
         )
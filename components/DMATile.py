@@ -13,7 +13,7 @@ from m5.objects import (
     RubySequencer,
 )
 
-from .MeshDescriptor import Coordinate, MeshTracker
+from .MeshDescriptor import Coordinate, LinkClass, MeshTracker
 from .Tile import Tile
 
 
@@ -55,13 +55,22 @@ class DMATile(Tile):
         self._create_links()
 
     def _create_links(self):
+        internal_profile = self._mesh_descriptor.get_attach_profile(
+            LinkClass.TileInternal, LinkClass.TileInternal
+        )
+        if self._mesh_descriptor.has_flattened_tiles():
+            self.dma_router_link = self.create_ext_link(
+                self.dma_controller, self.cross_tile_router, profile=internal_profile
+            )
+            return
+
         self.dma_router = self.create_router(self._ruby_system)
         self.dma_router_link = self.create_ext_link(
-            self.dma_controller, self.dma_router
+            self.dma_controller, self.dma_router, profile=internal_profile
         )
         self.dma_router_to_cross_tile_router = self.create_int_link(
-            self.dma_router, self.cross_tile_router
+            self.dma_router, self.cross_tile_router, profile=internal_profile
         )
         self.cross_tile_router_to_dma_router = self.create_int_link(
-            self.cross_tile_router, self.dma_router
+            self.cross_tile_router, self.dma_router, profile=internal_profile
         )
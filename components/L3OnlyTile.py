@@ -12,7 +12,8 @@ from gem5.isas import ISA
 from m5.objects import SubSystem, RubySystem, NULL, RubyController, RubySequencer
 
 from .L3Slice import L3Slice
-from .MeshDescriptor import Coordinate, MeshTracker
+from .MeshDescriptor import Coordinate, LinkClass, MeshTracker
+from .NetworkComponents import RubyRouter
 from .Tile import Tile
 
 
@@ -60,12 +61,28 @@ class L3OnlyTile(Tile):
             is_home_node=is_home_node,
         )
 
+    def get_l3_router(self) -> RubyRouter:
+        if self._mesh_descriptor.has_flattened_tiles():
+            return self.cross_tile_router
+        return self.l3_router
+
     def _create_links(self):
+        internal_profile = self._mesh_descriptor.get_attach_profile(
+            LinkClass.TileInternal, LinkClass.TileInternal
+        )
+        if self._mesh_descriptor.has_flattened_tiles():
+            self.l3_router_link = self.create_ext_link(
+                self.l3_slice, self.cross_tile_router, profile=internal_profile
+            )
+            return
+
         self.l3_router = self.create_router(self._ruby_system)
-        self.l3_router_link = self.create_ext_link(self.l3_slice, self.l3_router)
+        self.l3_router_link = self.create_ext_link(
+            self.l3_slice, self.l3_router, profile=internal_profile
+        )
         self.l3_router_to_cross_tile_router_link = self.create_int_link(
-            self.l3_router, self.cross_tile_router
+            self.l3_router, self.cross_tile_router, profile=internal_profile
         )
         self.cross_tile_router_to_l3_router_link = self.create_int_link(
-            self.cross_tile_router, self.l3_router
+            self.cross_tile_router, self.l3_router, profile=internal_profile
         )
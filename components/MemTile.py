@@ -10,7 +10,7 @@ from gem5.components.cachehierarchies.chi.nodes.memory_controller import (
 
 from m5.objects import SubSystem, RubySystem, NULL, RubyController, AddrRange, Port
 
-from .MeshDescriptor import Coordinate, MeshTracker
+from .MeshDescriptor import Coordinate, LinkClass, MeshTracker
 from .Tile import Tile
 
 
@@ -39,13 +39,22 @@ class MemTile(Tile):
         self._create_links()
 
     def _create_links(self):
+        memory_profile = self._mesh_descriptor.get_attach_profile(
+            LinkClass.MemoryAttach, LinkClass.MemoryAttach
+        )
+        if self._mesh_descriptor.has_flattened_tiles():
+            self.memory_router_link = self.create_ext_link(
+                self.memory_controller, self.cross_tile_router, profile=memory_profile
+            )
+            return
+
         self.memory_router = self.create_router(self._ruby_system)
         self.memory_router_link = self.create_ext_link(
-            self.memory_controller, self.memory_router
+            self.memory_controller, self.memory_router, profile=memory_profile
         )
         self.memory_router_to_cross_tile_router = self.create_int_link(
-            self.memory_router, self.cross_tile_router
+            self.memory_router, self.cross_tile_router, profile=memory_profile
         )
         self.cross_tile_router_to_memory_router = self.create_int_link(
-            self.cross_tile_router, self.memory_router
+            self.cross_tile_router, self.memory_router, profile=memory_profile
         )
@@ -3,9 +3,13 @@
 # All rights reserved.
 # SPDX-License-Identifier: BSD-3-Clause
 
-from typing import Any, Optional, Tuple, List
+from bisect import insort
+from typing import TYPE_CHECKING, Any, Dict, Optional, Tuple, List
 
-from .NetworkComponents import RubyRouter, RubyExtLink
+# The network components pull in m5.objects; only import them for type
+# checking so that a MeshTracker can be built and inspected without gem5.
+if TYPE_CHECKING:
+    from .NetworkComponents import RubyRouter, RubyExtLink
 
 
 class Coordinate:
@@ -59,6 +63,236 @@ class NodeType:
         return name_map[obj]
 
 
+class RoutingAlgorithm:
+    # SimpleNetwork builds its routing tables from the link weights: among
+    # the minimal-weight paths, each router prefers the output link with the
+    # lowest weight. Making the links of one dimension cheaper than the other
+    # therefore resolves every route in that dimension first.
+    Shortest = 0  # all mesh links have the same weight
+    XY = 1  # route along x first, then along y
+    YX = 2  # route along y first, then along x
+
+    @classmethod
+    def to_string(cls, obj: "RoutingAlgorithm") -> str:
+        name_map = {
+            RoutingAlgorithm.Shortest: "Shortest",
+            RoutingAlgorithm.XY: "XY",
+            RoutingAlgorithm.YX: "YX",
+        }
+        return name_map[obj]
+
+    # returns (weight of the horizontal links, weight of the vertical links)
+    @classmethod
+    def get_link_weights(cls, obj: "RoutingAlgorithm") -> Tuple[int, int]:
+        weight_map = {
+            RoutingAlgorithm.Shortest: (1, 1),
+            RoutingAlgorithm.XY: (1, 2),
+            RoutingAlgorithm.YX: (2, 1),
+        }
+        return weight_map[obj]
+
+
+class NetworkBackend:
+    # Both backends build the same routers and links from a MeshTracker, and
+    # the Garnet table-based routing uses the link weights like SimpleNetwork.
+    Simple = 0  # SimpleNetwork: fast, models link bandwidth and latency
+    Garnet = 1  # GarnetNetwork: router pipelines, virtual channels, credits
+
+    @classmethod
+    def to_string(cls, obj: "NetworkBackend") -> str:
+        name_map = {
+            NetworkBackend.Simple: "Simple",
+            NetworkBackend.Garnet: "Garnet",
+        }
+        return name_map[obj]
+
+
+class LinkProfile:
+    # the default latency of the link SimObjects and the routing latency of
+    # the SimpleNetwork routers, in cycles
+    default_latency = 1
+    router_latency = 1
+
+    # bandwidth_factor is in bytes per cycle; latency is in cycles, None keeps
+    # the default latency of the link SimObject
+    def __init__(self, bandwidth_factor: int = 32, latency: Optional[int] = None):
+        self.bandwidth_factor = bandwidth_factor
+        self.latency = latency
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, LinkProfile):
+            return NotImplemented
+        return (self.bandwidth_factor, self.latency) == (
+            other.bandwidth_factor,
+            other.latency,
+        )
+
+    def get_latency(self) -> int:
+        if self.latency is None:
+            return self.default_latency
+        return self.latency
+
+    # The profile of a single link replacing this link, the router it leads
+    # to and the next link, with the same latency and the bandwidth of the
+    # narrowest of the two links.
+    def get_merged(self, next_link: "LinkProfile") -> "LinkProfile":
+        return LinkProfile(
+            bandwidth_factor=min(self.bandwidth_factor, next_link.bandwidth_factor),
+            latency=self.get_latency() + self.router_latency + next_link.get_latency(),
+        )
+
+    def __str__(self) -> str:
+        latency = "default" if self.latency is None else f"{self.latency} cycles"
+        return f"bandwidth_factor={self.bandwidth_factor}, latency={latency}"
+
+
+class LinkClass:
+    MeshHorizontal = 0  # between the cross-tile routers of a row
+    MeshVertical = 1  # between the cross-tile routers of a column
+    TileInternal = 2  # inside a tile, e.g. L3 slice and DMA links
+    PrivateCacheAttach = 3  # L1/L2 caches to the intra-tile router
+    MemoryAttach = 4  # memory controller links
+    IODAttach = 5  # between a CCD tile and the IOD
+    MeshLong = 6  # between cross-tile routers that are not neighbors
+    MeshExpress = 7  # express links declared on the MeshTracker
+
+    @classmethod
+    def to_string(cls, obj: "LinkClass") -> str:
+        name_map = {
+            LinkClass.MeshHorizontal: "MeshHorizontal",
+            LinkClass.MeshVertical: "MeshVertical",
+            LinkClass.TileInternal: "TileInternal",
+            LinkClass.PrivateCacheAttach: "PrivateCacheAttach",
+            LinkClass.MemoryAttach: "MemoryAttach",
+            LinkClass.IODAttach: "IODAttach",
+            LinkClass.MeshLong: "MeshLong",
+            LinkClass.MeshExpress: "MeshExpress",
+        }
+        return name_map[obj]
+
+    @classmethod
+    def get_default_profile(cls, obj: "LinkClass") -> LinkProfile:
+        if obj == LinkClass.PrivateCacheAttach:
+            return LinkProfile(bandwidth_factor=64)
+        return LinkProfile(bandwidth_factor=32)
+
+
+class TopologyType:
+    # How the cross-tile routers described by a MeshTracker are linked. Every
+    # maximal run of consecutive tiles of a row or a column is a line of the
+    # mesh or a ring:
+    Mesh = 0  # lines, i.e. links between neighbors only
+    Torus = 1  # rings closed by a wraparound link between the ends of a run
+    FoldedTorus = 2  # rings whose links all span two tiles
+    RingOfRings = 3  # a ring through the tiles of every row, and a ring
+    # through the first tile of every row
+    # The express links declared on the MeshTracker are added to all of them.
+
+    @classmethod
+    def to_string(cls, obj: "TopologyType") -> str:
+        name_map = {
+            TopologyType.Mesh: "Mesh",
+            TopologyType.Torus: "Torus",
+            TopologyType.FoldedTorus: "FoldedTorus",
+            TopologyType.RingOfRings: "RingOfRings",
+        }
+        return name_map[obj]
+
+    # Returns the directed links between the cross-tile routers as
+    # (source, destination, direction) where direction is "north", "south",
+    # "west" or "east". On rings, "east" and "south" go forward around the
+    # ring. The links of a Mesh are in the order MeshNetwork always created
+    # them: row-major over the tiles, then north, south, west, east.
+    @classmethod
+    def get_links(
+        cls, obj: "TopologyType", mesh: "MeshTracker"
+    ) -> List[Tuple[Coordinate, Coordinate, str]]:
+        links = []
+        if obj in (TopologyType.Mesh, TopologyType.Torus):
+            for x, y in mesh.get_sorted_coordinate():
+                coordinate = Coordinate(x, y)
+                for neighbor, direction in (
+                    (coordinate.get_north(), "north"),
+                    (coordinate.get_south(), "south"),
+                    (coordinate.get_west(), "west"),
+                    (coordinate.get_east(), "east"),
+                ):
+                    if mesh.has_node(neighbor):
+                        links.append((coordinate, neighbor, direction))
+        if obj == TopologyType.Torus:
+            for run in cls._get_runs(mesh, rows=True):
+                links += cls._get_wraparound_links(run, "east", "west")
+            for run in cls._get_runs(mesh, rows=False):
+                links += cls._get_wraparound_links(run, "south", "north")
+        elif obj == TopologyType.FoldedTorus:
+            for run in cls._get_runs(mesh, rows=True):
+                links += cls._get_ring_links(cls._fold(run), "east", "west")
+            for run in cls._get_runs(mesh, rows=False):
+                links += cls._get_ring_links(cls._fold(run), "south", "north")
+        elif obj == TopologyType.RingOfRings:
+            rows = {}
+            for x, y in mesh.get_sorted_coordinate():
+                rows.setdefault(y, []).append(Coordinate(x, y))
+            for row in rows.values():
+                links += cls._get_ring_links(row, "east", "west")
+            stations = [row[0] for row in rows.values()]
+            links += cls._get_ring_links(stations, "south", "north")
+        for src, dst in mesh.get_express_links():
+            if src.x == dst.x:
+                links.append((src, dst, "south"))
+                links.append((dst, src, "north"))
+            else:
+                links.append((src, dst, "east"))
+                links.append((dst, src, "west"))
+        return links
+
+    # maximal runs of consecutive tiles of every row (or column)
+    @classmethod
+    def _get_runs(cls, mesh: "MeshTracker", rows: bool) -> List[List[Coordinate]]:
+        coordinates = mesh.get_sorted_coordinate()
+        if not rows:
+            coordinates = sorted(coordinates)
+        runs = []
+        for x, y in coordinates:
+            coordinate = Coordinate(x, y)
+            if runs:
+                last = runs[-1][-1]
+                if rows and last.y == y and last.x == x - 1:
+                    runs[-1].append(coordinate)
+                    continue
+                if not rows and last.x == x and last.y == y - 1:
+                    runs[-1].append(coordinate)
+                    continue
+            runs.append([coordinate])
+        return runs
+
+    @classmethod
+    def _get_wraparound_links(
+        cls, run: List[Coordinate], forward: str, backward: str
+    ) -> List[Tuple[Coordinate, Coordinate, str]]:
+        # with two tiles or less, the ends are already neighbors
+        if len(run) < 3:
+            return []
+        return [(run[-1], run[0], forward), (run[0], run[-1], backward)]
+
+    @classmethod
+    def _get_ring_links(
+        cls, ring: List[Coordinate], forward: str, backward: str
+    ) -> List[Tuple[Coordinate, Coordinate, str]]:
+        links = []
+        for i in range(len(ring) - 1):
+            links.append((ring[i], ring[i + 1], forward))
+            links.append((ring[i + 1], ring[i], backward))
+        return links + cls._get_wraparound_links(ring, forward, backward)
+
+    # ring order of a folded run: the even positions forward, then the odd
+    # positions backward, so that consecutive tiles of the ring are two
+    # positions apart (one at the ends)
+    @classmethod
+    def _fold(cls, run: List[Coordinate]) -> List[Coordinate]:
+        return run[0::2] + run[1::2][::-1]
+
+
 class MeshNode:
     def __init__(self, coordinate: Coordinate, node_type: NodeType) -> None:
         self.coordinate = coordinate
@@ -80,6 +314,34 @@ class MeshTracker:
         self.node_cross_tile_router = {}
         # self.node_ext_link = {}
 
+        # The typed queries below are called many times while a cache
+        # hierarchy is being built, so the grid is also kept in a dense form
+        # that add_node() updates incrementally:
+        # - the bounding box of the mesh,
+        # - a flat row-major array of node types (rebuilt lazily when the
+        #   bounding box grows),
+        # - per node type, the (y, x) keys of the nodes in row-major order.
+        self._width = 0
+        self._height = 0
+        self._node_type_grid: Optional[List[int]] = []
+        self._tiles_by_type: Dict[int, List[Tuple[int, int]]] = {}
+        self._tiles_coordinates_cache: Dict[int, List[Coordinate]] = {}
+
+        # bandwidth and latency of the links of each LinkClass, and of the
+        # mesh links between specific pairs of neighbors
+        self._link_profiles: Dict[int, LinkProfile] = {}
+        self._mesh_link_profiles: Dict[
+            Tuple[Tuple[int, int], Tuple[int, int]], LinkProfile
+        ] = {}
+
+        # express links, as (north or west end, south or east end) keys
+        self._express_links: List[Tuple[Tuple[int, int], Tuple[int, int]]] = []
+        self._express_link_keys = set()
+
+        # whether the controllers of a tile attach directly to its cross-tile
+        # router instead of going through intra-tile routers
+        self._flattened_tiles = False
+
     def add_node(self, coordinate: Coordinate, node_type: NodeType) -> None:
         new_node = MeshNode(coordinate, node_type)
         assert (
@@ -88,7 +350,19 @@ class MeshTracker:
         )
         self.grid_tracker[coordinate.get_hash()] = new_node
 
-    def add_cross_tile_router(self, coordinate: Coordinate, router: RubyRouter) -> None:
+        x, y = coordinate.get_hash()
+        if x >= self._width or y >= self._height:
+            self._width = max(self._width, x + 1)
+            self._height = max(self._height, y + 1)
+            self._node_type_grid = None
+        elif self._node_type_grid is not None:
+            self._node_type_grid[y * self._width + x] = node_type
+        insort(self._tiles_by_type.setdefault(node_type, []), (y, x))
+        self._tiles_coordinates_cache.pop(node_type, None)
+
+    def add_cross_tile_router(
+        self, coordinate: Coordinate, router: "RubyRouter"
+    ) -> None:
         assert (
             coordinate.get_hash() in self.grid_tracker
             and f"Node with coordinate {coordinate} does not exist"
@@ -98,11 +372,24 @@ class MeshTracker:
     # def add_ext_link(self, coordinate: Coordinate, ext_link: RubyExtLink) -> None:
     #    assert(coordinate.get_hash() in self.grid_tracker, f"Node with coordinate {coordinate} does not exist")
     #    self.node_ext_link[coordinate.get_hash()] = ext_link
-    def get_sorted_coordinate(self) -> List[Coordinate]:
-        coor = list(self.grid_tracker.keys())
-        width = self.get_width()
-        coor = sorted(coor, key=lambda k: k[0] + width * k[1])
-        return coor
+    def get_sorted_coordinate(self) -> List[Tuple[int, int]]:
+        # row-major order, i.e. sorted by x + width * y
+        return sorted(self.grid_tracker.keys(), key=lambda k: (k[1], k[0]))
+
+    def get_node_type_grid(self) -> List[int]:
+        # Flat row-major array of node types, indexed by y * width + x.
+        # Positions without a node are NodeType.EmptyTile.
+        if self._node_type_grid is None:
+            grid = [NodeType.EmptyTile] * (self._width * self._height)
+            for (x, y), node in self.grid_tracker.items():
+                grid[y * self._width + x] = node.node_type
+            self._node_type_grid = grid
+        return self._node_type_grid
+
+    def get_node_type(self, coordinate: Coordinate) -> NodeType:
+        if not self.has_node(coordinate):
+            return NodeType.EmptyTile
+        return self.grid_tracker[coordinate.get_hash()].node_type
 
     def has_node(self, coordinate: Coordinate) -> bool:
         return coordinate.get_hash() in self.grid_tracker
@@ -127,44 +414,205 @@ class MeshTracker:
     def get_nodes(self) -> List[MeshNode]:
         return list(self.grid_tracker.values())
 
-    def get_cross_tile_router(self, coordinate: Coordinate) -> RubyRouter:
+    def get_cross_tile_router(self, coordinate: Coordinate) -> "RubyRouter":
         return self.node_cross_tile_router[coordinate.get_hash()]
 
-    def get_ext_link(self, coordinate: Coordinate) -> RubyExtLink:
+    def get_ext_link(self, coordinate: Coordinate) -> "RubyExtLink":
         return self.node_ext_link[coordinate.get_hash()]
 
     def get_tiles_coordinates(self, tile_type: NodeType) -> List[Coordinate]:
-        coor = self.get_sorted_coordinate()
-        filtered_coor = filter(
-            lambda c: self.grid_tracker[c].node_type == tile_type, coor
-        )
-        return list(map(Coordinate.create_coordinate_from_tuple, filtered_coor))
+        coordinates = self._tiles_coordinates_cache.get(tile_type)
+        if coordinates is None:
+            coordinates = [
+                Coordinate(x, y) for y, x in self._tiles_by_type.get(tile_type, [])
+            ]
+            self._tiles_coordinates_cache[tile_type] = coordinates
+        # callers are free to modify the returned list
+        return list(coordinates)
+
+    def get_num_tiles(self, tile_type: NodeType) -> int:
+        return len(self._tiles_by_type.get(tile_type, ()))
 
     def get_num_core_tiles(self):
-        return len(self.get_tiles_coordinates(NodeType.CoreTile))
+        return self.get_num_tiles(NodeType.CoreTile)
 
     def get_num_pickle_device_tiles(self):
-        return len(self.get_tiles_coordinates(NodeType.PickleDeviceTile))
+        return self.get_num_tiles(NodeType.PickleDeviceTile)
 
     def get_num_l3_slices(self):  # tiles that have an L3 slice
-        return len(self.get_tiles_coordinates(NodeType.CoreTile)) + len(
-            self.get_tiles_coordinates(NodeType.L3OnlyTile)
+        return self.get_num_tiles(NodeType.CoreTile) + self.get_num_tiles(
+            NodeType.L3OnlyTile
         )
 
     def get_num_mem_tiles(self):
-        return len(self.get_tiles_coordinates(NodeType.MemTile))
+        return self.get_num_tiles(NodeType.MemTile)
+
+    # In a flattened tile, the L1/L2 caches, the L3 slice, the memory
+    # controller and the DMA controller are attached to the cross-tile router,
+    # which removes most of the routers of the mesh. The L1/L2 caches keep
+    # their own link profile, so the traffic between them is unchanged. The
+    # links of the other controllers cover the router and internal link they
+    # replace.
+    def set_flattened_tiles(self, flattened: bool = True) -> None:
+        self._flattened_tiles = flattened
+
+    def has_flattened_tiles(self) -> bool:
+        return self._flattened_tiles
+
+    # The profile of the ext link attaching a controller of a tile to a router
+    # of the tile through link_class, then to the cross-tile router through
+    # internal_link_class; merged into a single link in a flattened tile.
+    def get_attach_profile(
+        self, link_class: LinkClass, internal_link_class: LinkClass
+    ) -> LinkProfile:
+        profile = self.get_link_profile(link_class)
+        if self._flattened_tiles:
+            return profile.get_merged(self.get_link_profile(internal_link_class))
+        return profile
+
+    def set_link_profile(self, link_class: LinkClass, profile: LinkProfile) -> None:
+        self._link_profiles[link_class] = profile
+
+    def get_link_profile(self, link_class: LinkClass) -> LinkProfile:
+        profile = self._link_profiles.get(link_class)
+        if profile is None:
+            return LinkClass.get_default_profile(link_class)
+        return profile
+
+    # Overrides the profile of the mesh link from src to dst (and of the link
+    # from dst to src if bidirectional), e.g. for a slow die edge.
+    def set_mesh_link_profile(
+        self,
+        src: Coordinate,
+        dst: Coordinate,
+        profile: LinkProfile,
+        bidirectional: bool = True,
+    ) -> None:
+        self._mesh_link_profiles[(src.get_hash(), dst.get_hash())] = profile
+        if bidirectional:
+            self._mesh_link_profiles[(dst.get_hash(), src.get_hash())] = profile
+
+    def get_mesh_link_profile(self, src: Coordinate, dst: Coordinate) -> LinkProfile:
+        profile = self._mesh_link_profiles.get((src.get_hash(), dst.get_hash()))
+        if profile is not None:
+            return profile
+        if self.is_express_link(src, dst):
+            return self.get_link_profile(LinkClass.MeshExpress)
+        if abs(src.x - dst.x) + abs(src.y - dst.y) != 1:
+            return self.get_link_profile(LinkClass.MeshLong)
+        if src.y == dst.y:
+            return self.get_link_profile(LinkClass.MeshHorizontal)
+        return self.get_link_profile(LinkClass.MeshVertical)
+
+    # A bidirectional link between two tiles of the same row or column that
+    # skips the tiles in between. With the usual link weights, a route takes
+    # it whenever it saves hops.
+    def add_express_link(self, src: Coordinate, dst: Coordinate) -> None:
+        assert self.has_node(src) and self.has_node(
+            dst
+        ), f"Express link {src} <-> {dst} between tiles that do not exist"
+        assert (src.x == dst.x and abs(src.y - dst.y) > 1) or (
+            src.y == dst.y and abs(src.x - dst.x) > 1
+        ), f"Express link {src} <-> {dst} does not skip tiles of a row or column"
+        key = self._get_express_link_key(src, dst)
+        assert (
+            key not in self._express_link_keys
+        ), f"Express link {src} <-> {dst} exists"
+        self._express_links.append(key)
+        self._express_link_keys.add(key)
+
+    # Adds express links of length skip every skip rows (vertical) and/or
+    # every skip columns (horizontal), starting from row/column 0.
+    def add_express_links(
+        self, skip: int, vertical: bool = True, horizontal: bool = False
+    ) -> None:
+        assert skip > 1
+        for x, y in self.get_sorted_coordinate():
+            src = Coordinate(x, y)
+            south = Coordinate(x, y + skip)
+            east = Coordinate(x + skip, y)
+            if vertical and y % skip == 0 and self.has_node(south):
+                self.add_express_link(src, south)
+            if horizontal and x % skip == 0 and self.has_node(east):
+                self.add_express_link(src, east)
+
+    # (north or west end, south or east end) of every express link
+    def get_express_links(self) -> List[Tuple[Coordinate, Coordinate]]:
+        return [
+            (
+                Coordinate.create_coordinate_from_tuple(src),
+                Coordinate.create_coordinate_from_tuple(dst),
+            )
+            for src, dst in self._express_links
+        ]
+
+    def is_express_link(self, src: Coordinate, dst: Coordinate) -> bool:
+        return self._get_express_link_key(src, dst) in self._express_link_keys
+
+    def _get_express_link_key(
+        self, src: Coordinate, dst: Coordinate
+    ) -> Tuple[Tuple[int, int], Tuple[int, int]]:
+        if (src.y, src.x) <= (dst.y, dst.x):
+            return (src.get_hash(), dst.get_hash())
+        return (dst.get_hash(), src.get_hash())
 
     def get_width(self) -> int:
-        max_x = -1
-        for x, y in self.grid_tracker.keys():
-            max_x = max(x, max_x)
-        return max_x + 1
+        return self._width
 
     def get_height(self) -> int:
-        max_y = -1
-        for x, y in self.grid_tracker.keys():
-            max_y = max(y, max_y)
-        return max_y + 1
+        return self._height
+
+    # A JSON-serializable description of the mesh: the tiles, the express
+    # links, the link profiles and the tile mode. The routers are not part of
+    # it.
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "tiles": [
+                [x, y, self.grid_tracker[(x, y)].node_type]
+                for x, y in self.get_sorted_coordinate()
+            ],
+            "express_links": [
+                [src[0], src[1], dst[0], dst[1]] for src, dst in self._express_links
+            ],
+            "link_profiles": [
+                [link_class, profile.bandwidth_factor, profile.latency]
+                for link_class, profile in sorted(self._link_profiles.items())
+            ],
+            "mesh_link_profiles": [
+                [
+                    src[0],
+                    src[1],
+                    dst[0],
+                    dst[1],
+                    profile.bandwidth_factor,
+                    profile.latency,
+                ]
+                for (src, dst), profile in self._mesh_link_profiles.items()
+            ],
+            "flattened_tiles": self._flattened_tiles,
+        }
+
+    @classmethod
+    def from_dict(cls, d: Dict[str, Any]) -> "MeshTracker":
+        mesh = MeshTracker(name=d["name"])
+        for x, y, node_type in d["tiles"]:
+            mesh.add_node(Coordinate(x, y), node_type)
+        for src_x, src_y, dst_x, dst_y in d.get("express_links", []):
+            mesh.add_express_link(Coordinate(src_x, src_y), Coordinate(dst_x, dst_y))
+        for link_class, bandwidth_factor, latency in d.get("link_profiles", []):
+            mesh.set_link_profile(link_class, LinkProfile(bandwidth_factor, latency))
+        for src_x, src_y, dst_x, dst_y, bandwidth_factor, latency in d.get(
+            "mesh_link_profiles", []
+        ):
+            mesh.set_mesh_link_profile(
+                Coordinate(src_x, src_y),
+                Coordinate(dst_x, dst_y),
+                LinkProfile(bandwidth_factor, latency),
+                bidirectional=False,
+            )
+        mesh.set_flattened_tiles(d.get("flattened_tiles", False))
+        return mesh
 
     def __str__(self) -> str:
         s = []
@@ -0,0 +1,161 @@
+# Copyright (c) 2026 The Regents of the University of California
+# All rights reserved.
+# SPDX-License-Identifier: BSD-3-Clause
+
+# Mesh layouts as ASCII grids, one letter per tile ("C L M D P F", "." for no
+# tile) with the rows separated by newlines or "/", e.g. "P . / M M / C C".
+# load() and save() read and write them bare, or with the rest of
+# MeshTracker.to_dict() as JSON or YAML.
+
+import json
+import os
+from typing import Any, Dict, List
+
+from .MeshDescriptor import Coordinate, MeshTracker, NodeType
+
+
+class MeshLayout:
+    letters = {
+        NodeType.EmptyTile: ".",
+        NodeType.CoreTile: "C",
+        NodeType.L3OnlyTile: "L",
+        NodeType.MemTile: "M",
+        NodeType.DMATile: "D",
+        NodeType.PickleDeviceTile: "P",
+        NodeType.FunctionalMemTile: "F",
+    }
+    node_types = {letter: node_type for node_type, letter in letters.items()}
+
+    @classmethod
+    def from_ascii(cls, name: str, layout: str) -> MeshTracker:
+        return cls.from_description({"name": name, "layout": layout})
+
+    # the tiles of the layout in the format of MeshTracker.to_dict()
+    @classmethod
+    def _parse_ascii(cls, name: str, layout: str) -> List[List[int]]:
+        tiles = []
+        y = 0
+        for row in layout.replace("/", "\n").split("\n"):
+            letters = row.split()
+            if not letters:
+                continue
+            for x, letter in enumerate(letters):
+                node_type = cls.node_types.get(letter)
+                assert (
+                    node_type is not None
+                ), f"Unknown tile {letter!r} at ({x}, {y}) of mesh {name}"
+                if node_type != NodeType.EmptyTile:
+                    tiles.append([x, y, node_type])
+            y += 1
+        return tiles
+
+    @classmethod
+    def to_ascii(cls, mesh: MeshTracker, row_separator: str = "\n") -> str:
+        width = mesh.get_width()
+        grid = mesh.get_node_type_grid()
+        rows = []
+        for y in range(mesh.get_height()):
+            row = grid[y * width : (y + 1) * width]
+            rows.append(" ".join(cls.letters[node_type] for node_type in row))
+        return row_separator.join(rows)
+
+    @classmethod
+    def from_description(cls, description: Dict[str, Any]) -> MeshTracker:
+        assert (
+            "layout" in description or "tiles" in description
+        ), f"The description of mesh {description.get('name')} has no layout"
+        d = dict(description)
+        if "layout" in d:
+            d["tiles"] = cls._parse_ascii(d["name"], d.pop("layout"))
+        mesh = MeshTracker.from_dict(d)
+        cls.validate(mesh)
+        return mesh
+
+    @classmethod
+    def to_description(cls, mesh: MeshTracker) -> Dict[str, Any]:
+        d = mesh.to_dict()
+        del d["tiles"]
+        description = {"name": d.pop("name"), "layout": cls.to_ascii(mesh, " / ")}
+        # only keep what differs from the defaults
+        description.update((key, value) for key, value in d.items() if value)
+        return description
+
+    # Checks what MeshCache would otherwise only catch while instantiating
+    # the hierarchy.
+    @classmethod
+    def validate(cls, mesh: MeshTracker) -> None:
+        assert mesh.get_num_core_tiles() > 0, f"Mesh {mesh.name} has no core tile"
+        assert (
+            mesh.get_num_tiles(NodeType.FunctionalMemTile) <= 1
+        ), f"Mesh {mesh.name} has more than one functional memory tile"
+        # Every tile must be reachable from every other one, which is always
+        # the case when the mesh fills its bounding box.
+        tiles = mesh.get_sorted_coordinate()
+        if len(tiles) == mesh.get_width() * mesh.get_height():
+            return
+        neighbors = {}
+        for src, dst in mesh.get_express_links():
+            neighbors.setdefault(src.get_hash(), []).append(dst.get_hash())
+            neighbors.setdefault(dst.get_hash(), []).append(src.get_hash())
+        reached = {tiles[0]}
+        stack = [tiles[0]]
+        while stack:
+            x, y = stack.pop()
+            for neighbor in [(x, y - 1), (x, y + 1), (x - 1, y), (x + 1, y)] + (
+                neighbors.get((x, y), [])
+            ):
+                if neighbor in mesh.grid_tracker and neighbor not in reached:
+                    reached.add(neighbor)
+                    stack.append(neighbor)
+        assert len(reached) == len(tiles), (
+            f"Mesh {mesh.name} is not connected, "
+            f"{len(tiles) - len(reached)} tiles cannot be reached from "
+            f"{Coordinate.create_coordinate_from_tuple(tiles[0])}"
+        )
+
+    @classmethod
+    def load(cls, path: str) -> MeshTracker:
+        extension = os.path.splitext(path)[1]
+        with open(path) as f:
+            if extension == ".json":
+                return cls.from_description(json.load(f))
+            if extension in (".yaml", ".yml"):
+                import yaml
+
+                return cls.from_description(yaml.safe_load(f))
+            name = os.path.splitext(os.path.basename(path))[0]
+            return cls.from_ascii(name, f.read())
+
+    @classmethod
+    def save(cls, mesh: MeshTracker, path: str) -> None:
+        extension = os.path.splitext(path)[1]
+        with open(path, "w") as f:
+            if extension == ".json":
+                json.dump(cls.to_description(mesh), f, indent=2)
+            elif extension in (".yaml", ".yml"):
+                import yaml
+
+                yaml.safe_dump(cls.to_description(mesh), f, sort_keys=False)
+            else:
+                f.write(cls.to_ascii(mesh) + "\n")
+
+
+if __name__ == "__main__":
+    import time
+
+    from ..benchmarks.MeshTrackerBenchmark import build_mesh
+
+    for width, height in [(2, 8), (8, 10), (16, 18), (32, 34)]:
+        mesh = build_mesh(width, height)
+        mesh.add_express_links(4)
+        description = json.dumps(MeshLayout.to_description(mesh))
+        num_loads = max(1, 20000 // (width * height))
+        start = time.time()
+        for _ in range(num_loads):
+            loaded = MeshLayout.from_description(json.loads(description))
+        elapsed = (time.time() - start) / num_loads
+        assert loaded.to_dict() == mesh.to_dict()
+        print(
+            f"{width}x{height}: {len(description)} bytes, "
+            f"{elapsed * 1e6:.0f} us per load"
+        )
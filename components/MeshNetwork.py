@@ -3,108 +3,76 @@
 # All rights reserved.
 # SPDX-License-Identifier: BSD-3-Clause
 
-from .MeshDescriptor import Coordinate, MeshTracker
-from .NetworkComponents import RubyNetworkComponent
+from .MeshDescriptor import MeshTracker, RoutingAlgorithm, TopologyType
+from .MeshNetworkBase import GarnetMeshNetworkBase, MeshNetworkBase
+from ..utils.TopologyPlan import TopologyPlan
 
-from m5.objects import SimpleNetwork, RubySystem
+from m5.objects import SimpleNetwork, GarnetNetwork, RubySystem
 
-from typing import Any
+from typing import Any, Optional
 
 
-class MeshNetwork(SimpleNetwork, RubyNetworkComponent):
-    def __init__(self, ruby_system: RubySystem, mesh_descriptor: MeshTracker) -> None:
-        SimpleNetwork.__init__(self=self)
-        RubyNetworkComponent.__init__(self=self)
-
-        self.ruby_system = ruby_system
-        self.number_of_virtual_networks = ruby_system.number_of_virtual_networks
-
-        self.routers = []
-        self.int_links = []
-        self.ext_links = []
-        self.netifs = []
-
-        self._tile_routers = []
-        self._sequencer_tracker = 0
+# Creates the links between the cross-tile routers of a MeshTracker, for the
+# network classes of every backend.
+class MeshTopologyBuilder:
+    def _setup_mesh(
+        self,
+        mesh_descriptor: MeshTracker,
+        routing_algorithm: RoutingAlgorithm,
+        topology: TopologyType,
+        topology_plan: Optional[TopologyPlan],
+    ) -> None:
         self._mesh_descriptor = mesh_descriptor
-
-    def get_num_sequencers(self):
-        return self._sequencer_tracker
-
-    def get_next_sequencer_id(self):
-        self._sequencer_tracker += 1
-        return self._sequencer_tracker - 1
+        self._routing_algorithm = routing_algorithm
+        self._topology = topology
+        self._topology_plan = topology_plan
+
+    def get_routing_algorithm(self) -> RoutingAlgorithm:
+        return self._routing_algorithm
+
+    def get_topology(self) -> TopologyType:
+        return self._topology
+
+    # (source, destination, direction, weight, profile) of every mesh link
+    def _get_mesh_links(self):
+        if self._topology_plan is not None:
+            return self._topology_plan.get_mesh_links()
+        horizontal_weight, vertical_weight = RoutingAlgorithm.get_link_weights(
+            self._routing_algorithm
+        )
+        mesh_links = []
+        for src, dst, direction in TopologyType.get_links(
+            self._topology, self._mesh_descriptor
+        ):
+            if src.y == dst.y:
+                weight = horizontal_weight
+            else:
+                weight = vertical_weight
+            profile = self._mesh_descriptor.get_mesh_link_profile(src, dst)
+            mesh_links.append((src, dst, direction, weight, profile))
+        return mesh_links
 
     def create_mesh(self) -> None:
-        mesh_width = self._mesh_descriptor.get_width()
-        mesh_height = self._mesh_descriptor.get_height()
-
         self._north_links = []
         self._south_links = []
         self._west_links = []
         self._east_links = []
-
-        for y in range(mesh_height):
-            for x in range(mesh_width):
-                curr_node_coordinate = Coordinate(x, y)
-                if not self._mesh_descriptor.has_node(curr_node_coordinate):
-                    continue
-
-                # North
-                north_neighbor_coordinate = curr_node_coordinate.get_north()
-                if self._mesh_descriptor.has_node(north_neighbor_coordinate):
-                    self._north_links.append(
-                        self.create_int_link(
-                            self._mesh_descriptor.get_cross_tile_router(
-                                curr_node_coordinate
-                            ),
-                            self._mesh_descriptor.get_cross_tile_router(
-                                north_neighbor_coordinate
-                            ),
-                        )
-                    )
-
-                # South
-                south_neighbor_coordinate = curr_node_coordinate.get_south()
-                if self._mesh_descriptor.has_node(south_neighbor_coordinate):
-                    self._south_links.append(
-                        self.create_int_link(
-                            self._mesh_descriptor.get_cross_tile_router(
-                                curr_node_coordinate
-                            ),
-                            self._mesh_descriptor.get_cross_tile_router(
-                                south_neighbor_coordinate
-                            ),
-                        )
-                    )
-
-                # West
-                west_neighbor_coordinate = curr_node_coordinate.get_west()
-                if self._mesh_descriptor.has_node(west_neighbor_coordinate):
-                    self._west_links.append(
-                        self.create_int_link(
-                            self._mesh_descriptor.get_cross_tile_router(
-                                curr_node_coordinate
-                            ),
-                            self._mesh_descriptor.get_cross_tile_router(
-                                west_neighbor_coordinate
-                            ),
-                        )
-                    )
-
-                # East
-                east_neighbor_coordinate = curr_node_coordinate.get_east()
-                if self._mesh_descriptor.has_node(east_neighbor_coordinate):
-                    self._east_links.append(
-                        self.create_int_link(
-                            self._mesh_descriptor.get_cross_tile_router(
-                                curr_node_coordinate
-                            ),
-                            self._mesh_descriptor.get_cross_tile_router(
-                                east_neighbor_coordinate
-                            ),
-                        )
-                    )
+        links_by_direction = {
+            "north": self._north_links,
+            "south": self._south_links,
+            "west": self._west_links,
+            "east": self._east_links,
+        }
+
+        for src, dst, direction, weight, profile in self._get_mesh_links():
+            link = self.create_int_link(
+                self._mesh_descriptor.get_cross_tile_router(src),
+                self._mesh_descriptor.get_cross_tile_router(dst),
+                weight=weight,
+                profile=profile,
+            )
+            link.set_network_position(src, dst, direction)
+            links_by_direction[direction].append(link)
 
         # gem5 doesn't like empty arrays
         if self._north_links:
@@ -115,3 +83,41 @@ class MeshNetwork(SimpleNetwork, RubyNetworkComponent):
             self.west_links = self._west_links
         if self._east_links:
             self.east_links = self._east_links
+
+
+class MeshNetwork(SimpleNetwork, MeshNetworkBase, MeshTopologyBuilder):
+    def __init__(
+        self,
+        ruby_system: RubySystem,
+        mesh_descriptor: MeshTracker,
+        routing_algorithm: RoutingAlgorithm = RoutingAlgorithm.Shortest,
+        topology: TopologyType = TopologyType.Mesh,
+        topology_plan: Optional[TopologyPlan] = None,
+    ) -> None:
+        SimpleNetwork.__init__(self=self)
+        MeshNetworkBase.__init__(self=self, ruby_system=ruby_system)
+        self._setup_mesh(mesh_descriptor, routing_algorithm, topology, topology_plan)
+
+
+# The same mesh on Garnet, e.g. for congestion studies.
+class GarnetMeshNetwork(GarnetNetwork, GarnetMeshNetworkBase, MeshTopologyBuilder):
+    def __init__(
+        self,
+        ruby_system: RubySystem,
+        mesh_descriptor: MeshTracker,
+        routing_algorithm: RoutingAlgorithm = RoutingAlgorithm.Shortest,
+        topology: TopologyType = TopologyType.Mesh,
+        topology_plan: Optional[TopologyPlan] = None,
+        router_latency: int = 1,
+        flit_size: int = 32,
+        vcs_per_vnet: int = 4,
+    ) -> None:
+        GarnetNetwork.__init__(self=self)
+        GarnetMeshNetworkBase.__init__(
+            self=self,
+            ruby_system=ruby_system,
+            router_latency=router_latency,
+            flit_size=flit_size,
+            vcs_per_vnet=vcs_per_vnet,
+        )
+        self._setup_mesh(mesh_descriptor, routing_algorithm, topology, topology_plan)
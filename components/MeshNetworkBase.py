@@ -0,0 +1,181 @@
+# Copyright (c) 2026 The Regents of the University of California
+# All rights reserved.
+# SPDX-License-Identifier: BSD-3-Clause
+
+import json
+
+from .MeshDescriptor import NetworkBackend
+from .NetworkComponents import RubyNetworkComponent
+
+from m5.objects import RubySystem, GarnetNetworkInterface
+
+# the machine types of CHI, in the order of their MachineType enum
+_machine_types = ["Cache", "Memory", "MiscNode"]
+
+
+# The number of a controller in the Topology of Ruby, which numbers the
+# controllers by machine type, then by version.
+def _get_controller_number(controller):
+    for cls in type(controller).__mro__:
+        for machine_type, name in enumerate(_machine_types):
+            if cls.__name__.endswith(f"{name}_Controller"):
+                return (machine_type, int(controller.version))
+    assert False, f"{controller.path()} is not a CHI controller"
+
+
+# The part of the networks that does not depend on the topology. A network
+# class derives from the SimObject of its backend and from one of these.
+class MeshNetworkBase(RubyNetworkComponent):
+    def __init__(self, ruby_system: RubySystem) -> None:
+        RubyNetworkComponent.__init__(self=self)
+
+        self.ruby_system = ruby_system
+        self.number_of_virtual_networks = ruby_system.number_of_virtual_networks
+
+        self.routers = []
+        self.int_links = []
+        self.ext_links = []
+        self.netifs = []
+
+        self._tile_routers = []
+        self._sequencer_tracker = 0
+
+    def get_backend(self) -> NetworkBackend:
+        return NetworkBackend.Simple
+
+    def get_num_sequencers(self):
+        return self._sequencer_tracker
+
+    def get_next_sequencer_id(self):
+        self._sequencer_tracker += 1
+        return self._sequencer_tracker - 1
+
+    # The networks index their routers by id, which the routers take from a
+    # counter shared by all the networks of the process.
+    def _check_router_ids(self) -> None:
+        for i, router in enumerate(self._routers):
+            assert (
+                int(router.router_id) == i
+            ), f"Router {router.router_id} is at index {i} of the network"
+
+    # should be called once all the routers and links are created
+    def finalize(self) -> None:
+        self._check_router_ids()
+        self.int_links = self._int_links
+        self.ext_links = self._ext_links
+        self.routers = self._routers
+        self.setup_buffers()
+
+    # The coordinates of the routers and links, with their paths in the stats,
+    # for utils/MeshHeatmap.py. The paths are only known once the simulation
+    # is instantiated, so this must be called after m5.instantiate().
+    def get_network_metadata(self):
+        def get_position(obj):
+            position = {}
+            for key, coordinate in [
+                ("coordinate", obj.get_coordinate()),
+                ("dst_coordinate", obj.get_dst_coordinate()),
+            ]:
+                if coordinate is not None:
+                    position[key] = list(coordinate.get_hash())
+            if obj.get_direction() is not None:
+                position["direction"] = obj.get_direction()
+            return position
+
+        routers = []
+        for router in self._routers:
+            # SimpleNetwork numbers the output ports of a router, hence its
+            # throttles, by destination: the controllers first, by machine
+            # type and version, then the routers by id
+            throttles = [
+                link.path()
+                for link in sorted(
+                    (link for link in self._ext_links if link.int_node is router),
+                    key=lambda link: _get_controller_number(link.ext_node),
+                )
+            ]
+            throttles += [
+                link.path()
+                for link in sorted(
+                    (link for link in self._int_links if link.src_node is router),
+                    key=lambda link: int(link.dst_node.router_id),
+                )
+            ]
+            routers.append(
+                {
+                    "id": int(router.router_id),
+                    "path": router.path(),
+                    "throttles": throttles,
+                    **get_position(router),
+                }
+            )
+        int_links = [
+            {
+                "id": int(link.link_id),
+                "path": link.path(),
+                "src": int(link.src_node.router_id),
+                "dst": int(link.dst_node.router_id),
+                "bandwidth_factor": int(link.bandwidth_factor),
+                "latency": int(link.latency),
+                **get_position(link),
+            }
+            for link in self._int_links
+        ]
+        ext_links = [
+            {
+                "id": int(link.link_id),
+                "path": link.path(),
+                "router": int(link.int_node.router_id),
+                "controller": link.ext_node.path(),
+                **get_position(link),
+            }
+            for link in self._ext_links
+        ]
+        return {
+            "backend": NetworkBackend.to_string(self.get_backend()),
+            "routers": routers,
+            "int_links": int_links,
+            "ext_links": ext_links,
+        }
+
+    def dump_network_metadata(self, path: str) -> None:
+        with open(path, "w") as f:
+            json.dump(self.get_network_metadata(), f, indent=1)
+
+
+class GarnetMeshNetworkBase(MeshNetworkBase):
+    def __init__(
+        self,
+        ruby_system: RubySystem,
+        router_latency: int = 1,
+        flit_size: int = 32,
+        vcs_per_vnet: int = 4,
+    ) -> None:
+        MeshNetworkBase.__init__(self=self, ruby_system=ruby_system)
+
+        self.ni_flit_size = flit_size
+        self.vcs_per_vnet = vcs_per_vnet
+        # table-based routing, from the link weights
+        self.routing_algorithm = 0
+        self._router_latency = router_latency
+
+    def get_backend(self) -> NetworkBackend:
+        return NetworkBackend.Garnet
+
+    def get_router_latency(self) -> int:
+        return self._router_latency
+
+    def finalize(self) -> None:
+        self._check_router_ids()
+        self.int_links = self._int_links
+        self.ext_links = self._ext_links
+        self.routers = self._routers
+        # one network interface per controller, in the order of the ext links
+        self.netifs = [
+            GarnetNetworkInterface(
+                id=i,
+                virt_nets=self.number_of_virtual_networks,
+                vcs_per_vnet=self.vcs_per_vnet,
+            )
+            for i in range(len(self._ext_links))
+        ]
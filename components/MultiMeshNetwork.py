@@ -2,110 +2,45 @@
 # All rights reserved.
 # SPDX-License-Identifier: BSD-3-Clause
 
-from .MeshDescriptor import Coordinate, MeshTracker
-from .NetworkComponents import RubyNetworkComponent
+from .MeshDescriptor import MeshTracker, TopologyType
+from .MeshNetworkBase import GarnetMeshNetworkBase, MeshNetworkBase
 
-from m5.objects import SimpleNetwork, RubySystem
+from m5.objects import SimpleNetwork, GarnetNetwork, RubySystem
 
 from typing import Any
 
 
-# For multi-ccd setup
-class MultiMeshNetwork(SimpleNetwork, RubyNetworkComponent):
-    def __init__(self, ruby_system: RubySystem, mesh_descriptors: list[MeshTracker]) -> None:
-        SimpleNetwork.__init__(self=self)
-        RubyNetworkComponent.__init__(self=self)
-
-        self.ruby_system = ruby_system
-        self.number_of_virtual_networks = ruby_system.number_of_virtual_networks
-
-        self.routers = []
-        self.int_links = []
-        self.ext_links = []
-        self.netifs = []
-
-        self._tile_routers = []
-        self._sequencer_tracker = 0
+# Creates the links between the cross-tile routers of every mesh, for the
+# network classes of every backend.
+class MultiMeshTopologyBuilder:
+    def _setup_meshes(self, mesh_descriptors: list[MeshTracker]) -> None:
         self._mesh_descriptors = mesh_descriptors
 
-    def get_num_sequencers(self):
-        return self._sequencer_tracker
-
-    def get_next_sequencer_id(self):
-        self._sequencer_tracker += 1
-        return self._sequencer_tracker - 1
-
+    # The meshes may have different shapes; each one is linked like a
+    # MeshNetwork with TopologyType.Mesh, express links included.
     def create_mesh(self) -> None:
-        mesh_width = self._mesh_descriptors[0].get_width()
-        mesh_height = self._mesh_descriptors[0].get_height()
-
         self._north_links = []
         self._south_links = []
         self._west_links = []
         self._east_links = []
+        links_by_direction = {
+            "north": self._north_links,
+            "south": self._south_links,
+            "west": self._west_links,
+            "east": self._east_links,
+        }
 
         for mesh_descriptor in self._mesh_descriptors:
-            for y in range(mesh_height):
-                for x in range(mesh_width):
-                    curr_node_coordinate = Coordinate(x, y)
-                    if not mesh_descriptor.has_node(curr_node_coordinate):
-                        continue
-
-                    # North
-                    north_neighbor_coordinate = curr_node_coordinate.get_north()
-                    if mesh_descriptor.has_node(north_neighbor_coordinate):
-                        self._north_links.append(
-                            self.create_int_link(
-                                mesh_descriptor.get_cross_tile_router(
-                                    curr_node_coordinate
-                                ),
-                                mesh_descriptor.get_cross_tile_router(
-                                    north_neighbor_coordinate
-                                ),
-                            )
-                        )
-
-                    # South
-                    south_neighbor_coordinate = curr_node_coordinate.get_south()
-                    if mesh_descriptor.has_node(south_neighbor_coordinate):
-                        self._south_links.append(
-                            self.create_int_link(
-                                mesh_descriptor.get_cross_tile_router(
-                                    curr_node_coordinate
-                                ),
-                                mesh_descriptor.get_cross_tile_router(
-                                    south_neighbor_coordinate
-                                ),
-                            )
-                        )
-
-                    # West
-                    west_neighbor_coordinate = curr_node_coordinate.get_west()
-                    if mesh_descriptor.has_node(west_neighbor_coordinate):
-                        self._west_links.append(
-                            self.create_int_link(
-                                mesh_descriptor.get_cross_tile_router(
-                                    curr_node_coordinate
-                                ),
-                                mesh_descriptor.get_cross_tile_router(
-                                    west_neighbor_coordinate
-                                ),
-                            )
-                        )
-
-                    # East
-                    east_neighbor_coordinate = curr_node_coordinate.get_east()
-                    if mesh_descriptor.has_node(east_neighbor_coordinate):
-                        self._east_links.append(
-                            self.create_int_link(
-                                mesh_descriptor.get_cross_tile_router(
-                                    curr_node_coordinate
-                                ),
-                                mesh_descriptor.get_cross_tile_router(
-                                    east_neighbor_coordinate
-                                ),
-                            )
-                        )
+            for src, dst, direction in TopologyType.get_links(
+                TopologyType.Mesh, mesh_descriptor
+            ):
+                link = self.create_int_link(
+                    mesh_descriptor.get_cross_tile_router(src),
+                    mesh_descriptor.get_cross_tile_router(dst),
+                    profile=mesh_descriptor.get_mesh_link_profile(src, dst),
+                )
+                link.set_network_position(src, dst, direction)
+                links_by_direction[direction].append(link)
 
         # gem5 doesn't like empty arrays
         if self._north_links:
@@ -116,3 +51,35 @@ class MultiMeshNetwork(SimpleNetwork, RubyNetworkComponent):
             self.west_links = self._west_links
         if self._east_links:
             self.east_links = self._east_links
+
+
+# For multi-ccd setup
+class MultiMeshNetwork(SimpleNetwork, MeshNetworkBase, MultiMeshTopologyBuilder):
+    def __init__(
+        self, ruby_system: RubySystem, mesh_descriptors: list[MeshTracker]
+    ) -> None:
+        SimpleNetwork.__init__(self=self)
+        MeshNetworkBase.__init__(self=self, ruby_system=ruby_system)
+        self._setup_meshes(mesh_descriptors)
+
+
+class GarnetMultiMeshNetwork(
+    GarnetNetwork, GarnetMeshNetworkBase, MultiMeshTopologyBuilder
+):
+    def __init__(
+        self,
+        ruby_system: RubySystem,
+        mesh_descriptors: list[MeshTracker],
+        router_latency: int = 1,
+        flit_size: int = 32,
+        vcs_per_vnet: int = 4,
+    ) -> None:
+        GarnetNetwork.__init__(self=self)
+        GarnetMeshNetworkBase.__init__(
+            self=self,
+            ruby_system=ruby_system,
+            router_latency=router_latency,
+            flit_size=flit_size,
+            vcs_per_vnet=vcs_per_vnet,
+        )
+        self._setup_meshes(mesh_descriptors)
@@ -3,7 +3,39 @@
 # All rights reserved.
 # SPDX-License-Identifier: BSD-3-Clause
 
-from m5.objects import Switch, SimpleIntLink, SimpleExtLink, RubySequencer
+from m5.objects import (
+    Switch,
+    SimpleIntLink,
+    SimpleExtLink,
+    RubySequencer,
+    GarnetRouter,
+    GarnetIntLink,
+    GarnetExtLink,
+)
+
+from .MeshDescriptor import NetworkBackend
+
+
+# The position in the mesh of a router or link, which
+# MeshNetworkBase.dump_network_metadata() records with its SimObject path.
+class NetworkPosition:
+    _coordinate = None
+    _dst_coordinate = None
+    _direction = None
+
+    def set_network_position(self, coordinate, dst_coordinate=None, direction=None):
+        self._coordinate = coordinate
+        self._dst_coordinate = dst_coordinate
+        self._direction = direction
+
+    def get_coordinate(self):
+        return self._coordinate
+
+    def get_dst_coordinate(self):
+        return self._dst_coordinate
+
+    def get_direction(self):
+        return self._direction
 
 
 class RubyNetworkComponent:
@@ -13,6 +45,11 @@ class RubyNetworkComponent:
         self._ext_links = []
         self._int_links = []
 
+    # the coordinate of the routers and links this component creates, None
+    # outside of the mesh tiles
+    def get_network_coordinate(self):
+        return None
+
     def _add_router(self, router):
         self._routers.append(router)
 
@@ -22,18 +59,49 @@ class RubyNetworkComponent:
     def _add_int_link(self, link):
         self._int_links.append(link)
 
+    # The routers are of the backend of the network, and the links of the
+    # backend of the routers they connect.
     def create_router(self, ruby_system):
-        new_router = RubyRouter(ruby_system.network)
+        if ruby_system.network.get_backend() == NetworkBackend.Garnet:
+            new_router = GarnetRubyRouter(ruby_system.network)
+        else:
+            new_router = RubyRouter(ruby_system.network)
+        new_router.set_network_position(self.get_network_coordinate())
         self._add_router(new_router)
         return new_router
 
-    def create_ext_link(self, ext_node, int_node, bandwidth_factor=32):
-        new_ext_link = RubyExtLink(ext_node, int_node, bandwidth_factor)
+    # A profile, when given, overrides bandwidth_factor and latency.
+    def create_ext_link(
+        self, ext_node, int_node, bandwidth_factor=32, latency=None, profile=None
+    ):
+        if profile is not None:
+            bandwidth_factor, latency = profile.bandwidth_factor, profile.latency
+        if isinstance(int_node, GarnetRubyRouter):
+            link_class = GarnetRubyExtLink
+        else:
+            link_class = RubyExtLink
+        new_ext_link = link_class(ext_node, int_node, bandwidth_factor, latency)
+        new_ext_link.set_network_position(self.get_network_coordinate())
         self._add_ext_link(new_ext_link)
         return new_ext_link
 
-    def create_int_link(self, src_node, dst_node, bandwidth_factor=32):
-        new_int_link = RubyIntLink(src_node, dst_node, bandwidth_factor)
+    def create_int_link(
+        self,
+        src_node,
+        dst_node,
+        bandwidth_factor=32,
+        weight=None,
+        latency=None,
+        profile=None,
+    ):
+        if profile is not None:
+            bandwidth_factor, latency = profile.bandwidth_factor, profile.latency
+        if isinstance(src_node, GarnetRubyRouter):
+            link_class = GarnetRubyIntLink
+        else:
+            link_class = RubyIntLink
+        new_int_link = link_class(src_node, dst_node, bandwidth_factor, weight, latency)
+        new_int_link.set_network_position(self.get_network_coordinate())
         self._add_int_link(new_int_link)
         return new_int_link
 
@@ -52,7 +120,7 @@ class RubyNetworkComponent:
         self._int_links.extend(other_ruby_subsystem.get_int_links())
 
 
-class RubyRouter(Switch):
+class RubyRouter(Switch, NetworkPosition):
     _router_id = 0
 
     @classmethod
@@ -66,7 +134,7 @@ class RubyRouter(Switch):
         self.virt_nets = network.number_of_virtual_networks
 
 
-class RubyExtLink(SimpleExtLink):
+class RubyExtLink(SimpleExtLink, NetworkPosition):
     _link_id = 0
 
     @classmethod
@@ -74,15 +142,17 @@ class RubyExtLink(SimpleExtLink):
         cls._link_id += 1
         return cls._link_id - 1
 
-    def __init__(self, ext_node, int_node, bandwidth_factor=32):
+    def __init__(self, ext_node, int_node, bandwidth_factor=32, latency=None):
         super().__init__()
         self.link_id = self._get_link_id()
         self.ext_node = ext_node
         self.int_node = int_node
         self.bandwidth_factor = bandwidth_factor
+        if latency is not None:
+            self.latency = latency
 
 
-class RubyIntLink(SimpleIntLink):
+class RubyIntLink(SimpleIntLink, NetworkPosition):
     _link_id = 0
 
     @classmethod
@@ -97,9 +167,54 @@ class RubyIntLink(SimpleIntLink):
             RubyIntLink(node_2, node_1, bandwidth_factor),
         ]
 
-    def __init__(self, src_node, dst_node, bandwidth_factor=32):
+    def __init__(
+        self, src_node, dst_node, bandwidth_factor=32, weight=None, latency=None
+    ):
         super().__init__()
         self.link_id = self._get_link_id()
         self.src_node = src_node
         self.dst_node = dst_node
         self.bandwidth_factor = bandwidth_factor
+        # keep the SimObject's default weight and latency unless given
+        if weight is not None:
+            self.weight = weight
+        if latency is not None:
+            self.latency = latency
+
+
+# The Garnet routers and links share the ids of the SimpleNetwork ones; the id
+# of a router must be its index in the routers of the network.
+class GarnetRubyRouter(GarnetRouter, NetworkPosition):
+    def __init__(self, network):
+        super().__init__()
+        self.router_id = RubyRouter._get_router_id()
+        self.virt_nets = network.number_of_virtual_networks
+        self.latency = network.get_router_latency()
+
+
+# Garnet links carry one flit of the network's ni_flit_size per cycle, so
+# bandwidth_factor does not change their bandwidth.
+class GarnetRubyExtLink(GarnetExtLink, NetworkPosition):
+    def __init__(self, ext_node, int_node, bandwidth_factor=32, latency=None):
+        super().__init__()
+        self.link_id = RubyExtLink._get_link_id()
+        self.ext_node = ext_node
+        self.int_node = int_node
+        self.bandwidth_factor = bandwidth_factor
+        if latency is not None:
+            self.latency = latency
+
+
+class GarnetRubyIntLink(GarnetIntLink, NetworkPosition):
+    def __init__(
+        self, src_node, dst_node, bandwidth_factor=32, weight=None, latency=None
+    ):
+        super().__init__()
+        self.link_id = RubyIntLink._get_link_id()
+        self.src_node = src_node
+        self.dst_node = dst_node
+        self.bandwidth_factor = bandwidth_factor
+        if weight is not None:
+            self.weight = weight
+        if latency is not None:
+            self.latency = latency
@@ -22,7 +22,7 @@ from m5.objects import (
     LLCPrefetchAgent,
 )
 
-from .MeshDescriptor import Coordinate, MeshTracker
+from .MeshDescriptor import Coordinate, LinkClass, MeshTracker
 from .Tile import Tile
 from .custom_components.PickleDeviceController import PickleDeviceController
 
@@ -68,4 +68,5 @@ class PickleDeviceTile(Tile):
         self.controller_cross_tile_router_link = self.create_ext_link(
             self.controller,
             self.cross_tile_router,
+            profile=self._mesh_descriptor.get_link_profile(LinkClass.TileInternal),
         )
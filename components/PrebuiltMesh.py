@@ -3,226 +3,268 @@
 # All rights reserved.
 # SPDX-License-Identifier: BSD-3-Clause
 
+import math
+
 from .MeshDescriptor import *
+from .MeshLayout import MeshLayout
+
+# The layouts are in the ASCII format of MeshLayout, one row of the mesh per
+# line starting from y = 0.
 
 
 class PrebuiltMesh:
     @classmethod
     def getMesh0(cls, name, has_dma):
-        mesh = MeshTracker(name=name)
-        mesh.add_node(Coordinate(x=0, y=0), NodeType.CoreTile)
-        mesh.add_node(Coordinate(x=0, y=1), NodeType.MemTile)
         if has_dma:
-            mesh.add_node(Coordinate(x=1, y=0), NodeType.DMATile)
-            mesh.add_node(Coordinate(x=1, y=1), NodeType.DMATile)
-        return mesh
+            layout = """
+            C D
+            M D
+            """
+        else:
+            layout = """
+            C
+            M
+            """
+        return MeshLayout.from_ascii(name, layout)
 
     @classmethod
     def getMesh1(cls, name, has_dma):
-        mesh = MeshTracker(name=name)
-        mesh.add_node(Coordinate(x=0, y=0), NodeType.MemTile)
-        mesh.add_node(Coordinate(x=1, y=0), NodeType.MemTile)
-        mesh.add_node(Coordinate(x=0, y=1), NodeType.CoreTile)
-        mesh.add_node(Coordinate(x=1, y=1), NodeType.CoreTile)
-        mesh.add_node(Coordinate(x=0, y=2), NodeType.CoreTile)
-        mesh.add_node(Coordinate(x=1, y=2), NodeType.CoreTile)
-        mesh.add_node(Coordinate(x=0, y=3), NodeType.CoreTile)
-        mesh.add_node(Coordinate(x=1, y=3), NodeType.CoreTile)
-        mesh.add_node(Coordinate(x=0, y=4), NodeType.CoreTile)
-        mesh.add_node(Coordinate(x=1, y=4), NodeType.CoreTile)
-        mesh.add_node(Coordinate(x=0, y=5), NodeType.MemTile)
-        mesh.add_node(Coordinate(x=1, y=5), NodeType.MemTile)
+        layout = """
+            M M
+            C C
+            C C
+            C C
+            C C
+            M M
+            """
         if has_dma:
-            mesh.add_node(Coordinate(x=0, y=6), NodeType.DMATile)
-            mesh.add_node(Coordinate(x=1, y=6), NodeType.DMATile)
-        return mesh
+            layout += "D D"
+        return MeshLayout.from_ascii(name, layout)
 
     @classmethod
     def getMesh2(cls, name, has_dma):
-        mesh = MeshTracker(name=name)
-        mesh.add_node(Coordinate(x=0, y=0), NodeType.MemTile)
-        mesh.add_node(Coordinate(x=1, y=0), NodeType.MemTile)
-        mesh.add_node(Coordinate(x=0, y=1), NodeType.CoreTile)
-        mesh.add_node(Coordinate(x=1, y=1), NodeType.L3OnlyTile)
-        mesh.add_node(Coordinate(x=0, y=2), NodeType.L3OnlyTile)
-        mesh.add_node(Coordinate(x=1, y=2), NodeType.L3OnlyTile)
-        mesh.add_node(Coordinate(x=0, y=3), NodeType.L3OnlyTile)
-        mesh.add_node(Coordinate(x=1, y=3), NodeType.L3OnlyTile)
-        mesh.add_node(Coordinate(x=0, y=4), NodeType.L3OnlyTile)
-        mesh.add_node(Coordinate(x=1, y=4), NodeType.L3OnlyTile)
-        mesh.add_node(Coordinate(x=0, y=5), NodeType.MemTile)
-        mesh.add_node(Coordinate(x=1, y=5), NodeType.MemTile)
+        layout = """
+            M M
+            C L
+            L L
+            L L
+            L L
+            M M
+            """
         if has_dma:
-            mesh.add_node(Coordinate(x=0, y=6), NodeType.DMATile)
-            mesh.add_node(Coordinate(x=1, y=6), NodeType.DMATile)
-        return mesh
+            layout += "D D"
+        return MeshLayout.from_ascii(name, layout)
 
     @classmethod
     def getMesh3(cls, name, has_dma):
-        mesh = MeshTracker(name=name)
-        mesh.add_node(Coordinate(x=0, y=0), NodeType.PickleDeviceTile)
-        mesh.add_node(Coordinate(x=1, y=0), NodeType.MemTile)
-        mesh.add_node(Coordinate(x=0, y=1), NodeType.MemTile)
-        mesh.add_node(Coordinate(x=1, y=1), NodeType.MemTile)
-        mesh.add_node(Coordinate(x=0, y=2), NodeType.CoreTile)
-        mesh.add_node(Coordinate(x=1, y=2), NodeType.CoreTile)
-        mesh.add_node(Coordinate(x=0, y=3), NodeType.CoreTile)
-        mesh.add_node(Coordinate(x=1, y=3), NodeType.CoreTile)
-        mesh.add_node(Coordinate(x=0, y=4), NodeType.CoreTile)
-        mesh.add_node(Coordinate(x=1, y=4), NodeType.CoreTile)
-        mesh.add_node(Coordinate(x=0, y=5), NodeType.CoreTile)
-        mesh.add_node(Coordinate(x=1, y=5), NodeType.CoreTile)
-        mesh.add_node(Coordinate(x=0, y=6), NodeType.MemTile)
-        mesh.add_node(Coordinate(x=1, y=6), NodeType.MemTile)
+        layout = """
+            P M
+            M M
+            C C
+            C C
+            C C
+            C C
+            M M
+            """
         if has_dma:
-            mesh.add_node(Coordinate(x=0, y=7), NodeType.DMATile)
-            # mesh.add_node(Coordinate(x = 1, y = 7), NodeType.DMATile)
-        return mesh
+            layout += "D ."
+        return MeshLayout.from_ascii(name, layout)
 
     @classmethod
     def getMesh4(cls, name, has_dma):
-        mesh = MeshTracker(name=name)
-        mesh.add_node(Coordinate(x=0, y=0), NodeType.PickleDeviceTile)
-        mesh.add_node(Coordinate(x=0, y=1), NodeType.MemTile)
-        mesh.add_node(Coordinate(x=1, y=1), NodeType.MemTile)
-        mesh.add_node(Coordinate(x=0, y=2), NodeType.CoreTile)
-        mesh.add_node(Coordinate(x=1, y=2), NodeType.L3OnlyTile)
-        mesh.add_node(Coordinate(x=0, y=3), NodeType.L3OnlyTile)
-        mesh.add_node(Coordinate(x=1, y=3), NodeType.L3OnlyTile)
-        mesh.add_node(Coordinate(x=0, y=4), NodeType.L3OnlyTile)
-        mesh.add_node(Coordinate(x=1, y=4), NodeType.L3OnlyTile)
-        mesh.add_node(Coordinate(x=0, y=5), NodeType.L3OnlyTile)
-        mesh.add_node(Coordinate(x=1, y=5), NodeType.L3OnlyTile)
-        mesh.add_node(Coordinate(x=0, y=6), NodeType.MemTile)
-        mesh.add_node(Coordinate(x=1, y=6), NodeType.MemTile)
+        layout = """
+            P .
+            M M
+            C L
+            L L
+            L L
+            L L
+            M M
+            """
         if has_dma:
-            mesh.add_node(Coordinate(x=0, y=7), NodeType.DMATile)
-            mesh.add_node(Coordinate(x=1, y=7), NodeType.DMATile)
-        return mesh
+            layout += "D D"
+        return MeshLayout.from_ascii(name, layout)
 
     @classmethod
     def getMesh5(cls, name, has_dma):
-        mesh = MeshTracker(name=name)
-        mesh.add_node(Coordinate(x=0, y=0), NodeType.PickleDeviceTile)
-        mesh.add_node(Coordinate(x=0, y=1), NodeType.MemTile)
-        mesh.add_node(Coordinate(x=1, y=1), NodeType.MemTile)
-        mesh.add_node(Coordinate(x=0, y=2), NodeType.CoreTile)
-        mesh.add_node(Coordinate(x=1, y=2), NodeType.CoreTile)
-        mesh.add_node(Coordinate(x=0, y=3), NodeType.CoreTile)
-        mesh.add_node(Coordinate(x=1, y=3), NodeType.CoreTile)
-        mesh.add_node(Coordinate(x=0, y=4), NodeType.CoreTile)
-        mesh.add_node(Coordinate(x=1, y=4), NodeType.CoreTile)
-        mesh.add_node(Coordinate(x=0, y=5), NodeType.CoreTile)
-        mesh.add_node(Coordinate(x=1, y=5), NodeType.CoreTile)
-        mesh.add_node(Coordinate(x=0, y=6), NodeType.MemTile)
-        mesh.add_node(Coordinate(x=1, y=6), NodeType.MemTile)
+        layout = """
+            P .
+            M M
+            C C
+            C C
+            C C
+            C C
+            M M
+            """
         if has_dma:
-            mesh.add_node(Coordinate(x=0, y=7), NodeType.DMATile)
-            mesh.add_node(Coordinate(x=1, y=7), NodeType.DMATile)
-        return mesh
+            layout += "D D"
+        return MeshLayout.from_ascii(name, layout)
 
     @classmethod
     def getMesh6(cls, name, has_dma):
-        mesh = MeshTracker(name=name)
-        mesh.add_node(Coordinate(x=0, y=0), NodeType.PickleDeviceTile)
-        mesh.add_node(Coordinate(x=0, y=1), NodeType.MemTile)
-        mesh.add_node(Coordinate(x=1, y=1), NodeType.MemTile)
-        mesh.add_node(Coordinate(x=0, y=2), NodeType.CoreTile)
-        mesh.add_node(Coordinate(x=1, y=2), NodeType.L3OnlyTile)
-        mesh.add_node(Coordinate(x=0, y=3), NodeType.CoreTile)
-        mesh.add_node(Coordinate(x=1, y=3), NodeType.L3OnlyTile)
-        mesh.add_node(Coordinate(x=0, y=4), NodeType.L3OnlyTile)
-        mesh.add_node(Coordinate(x=1, y=4), NodeType.L3OnlyTile)
-        mesh.add_node(Coordinate(x=0, y=5), NodeType.L3OnlyTile)
-        mesh.add_node(Coordinate(x=1, y=5), NodeType.L3OnlyTile)
-        mesh.add_node(Coordinate(x=0, y=6), NodeType.MemTile)
-        mesh.add_node(Coordinate(x=1, y=6), NodeType.MemTile)
+        layout = """
+            P .
+            M M
+            C L
+            C L
+            L L
+            L L
+            M M
+            """
         if has_dma:
-            mesh.add_node(Coordinate(x=0, y=7), NodeType.DMATile)
-            mesh.add_node(Coordinate(x=1, y=7), NodeType.DMATile)
-        return mesh
+            layout += "D D"
+        return MeshLayout.from_ascii(name, layout)
 
     @classmethod
     def getMesh7(cls, name):
-        mesh = MeshTracker(name=name)
-        mesh.add_node(Coordinate(x=0, y=0), NodeType.PickleDeviceTile)
-        mesh.add_node(Coordinate(x=1, y=0), NodeType.MemTile)
-        mesh.add_node(Coordinate(x=0, y=1), NodeType.MemTile)
-        mesh.add_node(Coordinate(x=1, y=1), NodeType.MemTile)
-        mesh.add_node(Coordinate(x=0, y=2), NodeType.CoreTile)
-        mesh.add_node(Coordinate(x=1, y=2), NodeType.DMATile)
-        mesh.add_node(Coordinate(x=0, y=3), NodeType.MemTile)
-        mesh.add_node(Coordinate(x=1, y=3), NodeType.MemTile)
-        # mesh.add_node(Coordinate(x = 0, y = 4), NodeType.DMATile)
-        return mesh
+        layout = """
+            P M
+            M M
+            C D
+            M M
+            """
+        return MeshLayout.from_ascii(name, layout)
 
     @classmethod
     def getMesh8(cls, name):
-        mesh = MeshTracker(name=name)
-        mesh.add_node(Coordinate(x=0, y=0), NodeType.PickleDeviceTile)
-        mesh.add_node(Coordinate(x=1, y=0), NodeType.FunctionalMemTile)
-        mesh.add_node(Coordinate(x=0, y=1), NodeType.MemTile)
-        mesh.add_node(Coordinate(x=1, y=1), NodeType.MemTile)
-        mesh.add_node(Coordinate(x=0, y=2), NodeType.CoreTile)
-        mesh.add_node(Coordinate(x=1, y=2), NodeType.CoreTile)
-        mesh.add_node(Coordinate(x=0, y=3), NodeType.CoreTile)
-        mesh.add_node(Coordinate(x=1, y=3), NodeType.CoreTile)
-        mesh.add_node(Coordinate(x=0, y=4), NodeType.CoreTile)
-        mesh.add_node(Coordinate(x=1, y=4), NodeType.CoreTile)
-        mesh.add_node(Coordinate(x=0, y=5), NodeType.CoreTile)
-        mesh.add_node(Coordinate(x=1, y=5), NodeType.CoreTile)
-        mesh.add_node(Coordinate(x=0, y=6), NodeType.MemTile)
-        mesh.add_node(Coordinate(x=1, y=6), NodeType.MemTile)
-        mesh.add_node(Coordinate(x=0, y=7), NodeType.DMATile)
-        return mesh
+        layout = """
+            P F
+            M M
+            C C
+            C C
+            C C
+            C C
+            M M
+            D .
+            """
+        return MeshLayout.from_ascii(name, layout)
 
     @classmethod
     def getMesh9(cls, name):
-        mesh = MeshTracker(name=name)
-        mesh.add_node(Coordinate(x=0, y=1), NodeType.MemTile)
-        mesh.add_node(Coordinate(x=1, y=1), NodeType.MemTile)
-        mesh.add_node(Coordinate(x=0, y=2), NodeType.CoreTile)
-        mesh.add_node(Coordinate(x=1, y=2), NodeType.L3OnlyTile)
-        mesh.add_node(Coordinate(x=0, y=3), NodeType.L3OnlyTile)
-        mesh.add_node(Coordinate(x=1, y=3), NodeType.L3OnlyTile)
-        mesh.add_node(Coordinate(x=0, y=4), NodeType.L3OnlyTile)
-        mesh.add_node(Coordinate(x=1, y=4), NodeType.L3OnlyTile)
-        mesh.add_node(Coordinate(x=0, y=5), NodeType.L3OnlyTile)
-        mesh.add_node(Coordinate(x=1, y=5), NodeType.L3OnlyTile)
-        mesh.add_node(Coordinate(x=0, y=6), NodeType.MemTile)
-        mesh.add_node(Coordinate(x=1, y=6), NodeType.MemTile)
-        return mesh
+        layout = """
+            . .
+            M M
+            C L
+            L L
+            L L
+            L L
+            M M
+            """
+        return MeshLayout.from_ascii(name, layout)
 
     @classmethod
     def getMesh10(cls, name):
-        mesh = MeshTracker(name=name)
-        mesh.add_node(Coordinate(x=0, y=0), NodeType.PickleDeviceTile)
-        mesh.add_node(Coordinate(x=1, y=0), NodeType.FunctionalMemTile)
-        mesh.add_node(Coordinate(x=0, y=1), NodeType.MemTile)
-        mesh.add_node(Coordinate(x=1, y=1), NodeType.MemTile)
-        mesh.add_node(Coordinate(x=0, y=2), NodeType.CoreTile)
-        mesh.add_node(Coordinate(x=1, y=2), NodeType.L3OnlyTile)
-        mesh.add_node(Coordinate(x=0, y=3), NodeType.L3OnlyTile)
-        mesh.add_node(Coordinate(x=1, y=3), NodeType.L3OnlyTile)
-        mesh.add_node(Coordinate(x=0, y=4), NodeType.L3OnlyTile)
-        mesh.add_node(Coordinate(x=1, y=4), NodeType.L3OnlyTile)
-        mesh.add_node(Coordinate(x=0, y=5), NodeType.L3OnlyTile)
-        mesh.add_node(Coordinate(x=1, y=5), NodeType.L3OnlyTile)
-        mesh.add_node(Coordinate(x=0, y=6), NodeType.MemTile)
-        mesh.add_node(Coordinate(x=1, y=6), NodeType.MemTile)
-        mesh.add_node(Coordinate(x=0, y=7), NodeType.DMATile)
+        layout = """
+            P F
+            M M
+            C L
+            L L
+            L L
+            L L
+            M M
+            D .
+            """
+        return MeshLayout.from_ascii(name, layout)
+
+    @classmethod
+    def getMesh11(cls, name):
+        layout = """
+            C C
+            C C
+            C C
+            C C
+            """
+        return MeshLayout.from_ascii(name, layout)
+
+    # The IOD mesh of MultiCCDCache: a row of memory tiles with the DMA tiles
+    # spread among them, which is a ring with TopologyType.Torus. It has no
+    # core tile, so it is not validated as a MeshLayout.
+    @classmethod
+    def getIOD(cls, name: str, mem_channels: int, dma: int = 0) -> MeshTracker:
+        row = [NodeType.MemTile] * mem_channels
+        for i in reversed(range(dma)):
+            row.insert((2 * i + 1) * mem_channels // (2 * dma), NodeType.DMATile)
+        mesh = MeshTracker(name)
+        for x, node_type in enumerate(row):
+            mesh.add_node(Coordinate(x, 0), node_type)
         return mesh
 
+    # A rectangular mesh for any number of tiles. The cores and L3 only tiles
+    # form a grid of about aspect columns per row, with the L3 only tiles
+    # spread among the cores. The memory tiles are split between a row above
+    # and a row below that grid; the pickle devices and the functional memory
+    # tile are on the row above, and the DMA tiles on the row below. The grid
+    # is widened when these rows would not fit, and its empty positions are
+    # at the end of its rows, one per row starting from the last one.
+    @classmethod
+    def generate(
+        cls,
+        name: str,
+        cores: int,
+        l3_only: int = 0,
+        mem_channels: int = 2,
+        dma: int = 0,
+        pickle_devices: int = 0,
+        functional_mem: bool = False,
+        aspect: float = 1.0,
+    ) -> MeshTracker:
+        assert cores > 0, "The mesh needs at least one core tile"
+        assert aspect > 0
+        num_inner = cores + l3_only
+        top = ["P"] * pickle_devices + ["F"] * functional_mem
+        top += ["M"] * ((mem_channels + 1) // 2)
+        bottom = ["M"] * (mem_channels // 2) + ["D"] * dma
+        width = min(num_inner, max(1, round(math.sqrt(num_inner * aspect))))
+        width = max(width, len(top), len(bottom))
+        height = -(-num_inner // width)
 
+        inner = ["C"] * num_inner
+        for i in range(l3_only):
+            inner[int((i + 0.5) * num_inner / l3_only)] = "L"
+        row_lengths = [width] * height
+        for i in range(width * height - num_inner):
+            row_lengths[height - 1 - i % height] -= 1
+        rows = []
+        for row_length in row_lengths:
+            row, inner = inner[:row_length], inner[row_length:]
+            rows.append(row + ["."] * (width - row_length))
+        if top:
+            rows.insert(0, cls._get_edge_row(top, width, row_lengths[0]))
+        if bottom:
+            rows.append(cls._get_edge_row(bottom, width, row_lengths[-1]))
+        return MeshLayout.from_ascii(name, "\n".join(" ".join(r) for r in rows))
+
+    # The tiles are spread along the tiles of the adjacent row of the grid if
+    # they fit, so that each of them is connected to the grid.
     @classmethod
-    def getMesh11(cls, name):
-        mesh = MeshTracker(name=name)
-        mesh.add_node(Coordinate(x=0, y=0), NodeType.CoreTile)
-        mesh.add_node(Coordinate(x=1, y=0), NodeType.CoreTile)
-        mesh.add_node(Coordinate(x=0, y=1), NodeType.CoreTile)
-        mesh.add_node(Coordinate(x=1, y=1), NodeType.CoreTile)
-        mesh.add_node(Coordinate(x=0, y=2), NodeType.CoreTile)
-        mesh.add_node(Coordinate(x=1, y=2), NodeType.CoreTile)
-        mesh.add_node(Coordinate(x=0, y=3), NodeType.CoreTile)
-        mesh.add_node(Coordinate(x=1, y=3), NodeType.CoreTile)
-        return mesh
\ No newline at end of file
+    def _get_edge_row(cls, tiles, width, num_adjacent):
+        row = ["."] * width
+        if len(tiles) <= num_adjacent:
+            for i, tile in enumerate(tiles):
+                row[(2 * i + 1) * num_adjacent // (2 * len(tiles))] = tile
+        else:
+            row[: len(tiles)] = tiles
+        return row
+
+
+if __name__ == "__main__":
+    from ..utils.MeshAnalyzer import MeshAnalyzer
+
+    # core scaling of the generated meshes
+    for cores in [1, 2, 4, 8, 16, 32, 64, 128, 256]:
+        mesh = PrebuiltMesh.generate(
+            f"generated{cores}",
+            cores=cores,
+            mem_channels=max(2, cores // 8),
+            dma=2,
+            pickle_devices=1,
+        )
+        analyzer = MeshAnalyzer(mesh)
+        report = analyzer.analyze()
+        print(
+            f"{cores:>3} cores: {mesh.get_width()}x{mesh.get_height()}, "
+            f"diameter {analyzer.get_diameter():>2}, "
+            f"core -> L3 {report.core_to_l3.average:.3f} hops, "
+            f"L3 -> mem {report.l3_to_mem.average:.3f} hops"
+        )
+    print(MeshLayout.to_ascii(PrebuiltMesh.generate("example", 12, l3_only=4, dma=1)))
@@ -27,8 +27,15 @@ class Tile(SubSystem, RubyNetworkComponent):
         self._ruby_system = ruby_system
         self._cache_line_size = board.get_cache_line_size()
         self._mesh_descriptor = mesh_descriptor
+        self._coordinate = coordinate
         self.add_cross_tile_router(coordinate)
 
+    def get_coordinate(self) -> Coordinate:
+        return self._coordinate
+
+    def get_network_coordinate(self) -> Coordinate:
+        return self._coordinate
+
     def add_cross_tile_router(self, coordinate):
         self.cross_tile_router = self.create_router(self._ruby_system)
         self._mesh_descriptor.add_cross_tile_router(coordinate, self.cross_tile_router)
@@ -2,7 +2,7 @@
 # All rights reserved.
 # SPDX-License-Identifier: BSD-3-Clause
 
-from math import log2
+from typing import Optional
 
 from gem5.components.cachehierarchies.chi.nodes.abstract_node import AbstractNode
 from gem5.components.boards.abstract_board import AbstractBoard
@@ -16,6 +16,7 @@ from ..components.CoreTile import CoreTile
 from ..components.L3OnlyTile import L3OnlyTile
 from ..components.L3Slice import L3Slice
 from ..components.MeshDescriptor import MeshTracker, NodeType
+from ..utils.AddressInterleaving import AddressInterleaving, check_slice_ranges
 from ..utils.SizeArithmetic import SizeArithmetic
 
 # Will be similar to MeshCache, but this abstraction does not handle
@@ -37,6 +38,7 @@ class CCD(SubSystem, RubyNetworkComponent):
         ruby_system: RubySystem,
         mesh_descriptor: MeshTracker,
         data_prefetcher_class: str,
+        l3_interleaving: Optional[AddressInterleaving] = None,
     ) -> None:
         SubSystem.__init__(self=self)
         RubyNetworkComponent.__init__(self=self)
@@ -67,8 +69,15 @@ class CCD(SubSystem, RubyNetworkComponent):
         self._mesh_descriptor = mesh_descriptor
         self._data_prefetcher_class = data_prefetcher_class
         self._has_l3_only_tiles = False
-
-        print("Creating ccd_index:", ccd_index)
+        if l3_interleaving is None:
+            l3_interleaving = AddressInterleaving()
+        self._l3_interleaving = l3_interleaving
+
+        print(
+            f"Creating ccd_index: {ccd_index}, {mesh_descriptor.get_width()}x"
+            f"{mesh_descriptor.get_height()} mesh, {len(core_list)} cores, "
+            f"{mesh_descriptor.get_num_l3_slices()} L3 slices, {l3_size} L3"
+        )
 
         self._create_core_tiles(board, core_list, data_prefetcher_class)
         self._create_l3_only_tiles(board)
@@ -154,23 +163,13 @@ class CCD(SubSystem, RubyNetworkComponent):
     def _assign_addr_range(self, board: AbstractBoard) -> None:
         mem_start = self._find_board_mem_start(board)
         mem_size = board.get_memory().get_size()
-        interleaving_size = "4KiB"
-        num_offset_bits = int(log2(SizeArithmetic(interleaving_size).bytes))
         all_l3_slices = self.get_all_l3_slices()
-        num_l3_slices = len(all_l3_slices)
-        num_slice_indexing_bits = int(log2(num_l3_slices))
-        address_ranges = [
-            AddrRange(
-                start=mem_start,
-                size=mem_size,
-                intlvHighBit=num_offset_bits + num_slice_indexing_bits - 1,
-                intlvBits=num_slice_indexing_bits,
-                intlvMatch=i,
-            )
-            for i in range(num_l3_slices)
-        ]
-        for address_range, l3_slice in zip(address_ranges, all_l3_slices):
-            l3_slice.addr_ranges = address_range
+        slice_ranges = self._l3_interleaving.get_slice_ranges(
+            mem_start, mem_size, len(all_l3_slices)
+        )
+        check_slice_ranges(slice_ranges, mem_start, mem_size)
+        for ranges, l3_slice in zip(slice_ranges, all_l3_slices):
+            l3_slice.addr_ranges = [r.to_addr_range() for r in ranges]
 
     def _set_downstream_destinations(self) -> None:
         all_l3_slices = self.get_all_l3_slices()
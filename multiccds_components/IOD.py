@@ -3,6 +3,7 @@
 # SPDX-License-Identifier: BSD-3-Clause
 
 from math import log2
+from typing import Optional
 
 from MeshCache.multiccds_components import SimpleGlobalDirectoryTile
 
@@ -14,7 +15,13 @@ from gem5.components.cachehierarchies.chi.nodes.memory_controller import (
 
 from m5.objects import RubySystem, ClockDomain, SubSystem, AddrRange
 
-from ..components.MeshDescriptor import MeshTracker, Coordinate, NodeType
+from ..components.MeshDescriptor import (
+    Coordinate,
+    LinkClass,
+    MeshTracker,
+    NodeType,
+    TopologyType,
+)
 from ..components.NetworkComponents import RubyRouter, RubyNetworkComponent
 
 from .GlobalDirectory import GlobalDirectory
@@ -24,10 +31,23 @@ from .SimpleMemTile import SimpleMemTile
 from ..components.MeshDescriptor import MeshTracker, NodeType
 from ..components.MeshNetwork import MeshNetwork
 from ..components.NetworkComponents import RubyRouter
+from ..utils.AddressInterleaving import AddressInterleaving, check_slice_ranges
 from ..utils.SizeArithmetic import SizeArithmetic
 
 # Will be similar to MeshCache, but this abstraction does not handle
 # memory system setup
+#
+# The IOD is a small mesh described by its own MeshTracker, with one router per
+# tile. The global directories and the memory tiles are placed on the MemTiles
+# of the mesh, and the DMA tiles on its DMATiles (or on the MemTiles if there
+# are none), round-robin when there are more controllers than tiles. The CCDs
+# attach to the routers of the IOD through their IODPorts.
+#
+# By default there is one global directory per memory channel, owning the
+# addresses of the channel and linked to its memory tile. With
+# num_global_directories, the directories are interleaved over the whole
+# memory by directory_interleaving instead, 256B hashed by default, and every
+# memory tile is linked to the router of its IOD tile.
 class IOD(SubSystem, RubyNetworkComponent):
     def __init__(
         self,
@@ -35,23 +55,38 @@ class IOD(SubSystem, RubyNetworkComponent):
         ruby_system: RubySystem,
         num_memory_channels: int,
         is_fullsystem: bool,
+        iod_descriptor: MeshTracker,
+        topology: TopologyType = TopologyType.Mesh,
+        num_global_directories: Optional[int] = None,
+        directory_interleaving: Optional[AddressInterleaving] = None,
     ) -> None:
         SubSystem.__init__(self=self)
         RubyNetworkComponent.__init__(self=self)
 
+        assert (
+            iod_descriptor.get_num_tiles(NodeType.MemTile) > 0
+        ), f"The IOD mesh {iod_descriptor.name} has no MemTile"
+
         self._board = board
         self._ruby_system = ruby_system
         self._num_memory_channels = num_memory_channels
+        self._iod_descriptor = iod_descriptor
+        self._topology = topology
+        self._num_global_directories = num_global_directories
+        if directory_interleaving is None:
+            directory_interleaving = AddressInterleaving(
+                granularity="256B", hashed=True
+            )
+        self._directory_interleaving = directory_interleaving
 
+        self._create_iod_routers(ruby_system)
         self._create_mem_tiles(board, ruby_system, is_fullsystem)
         self._create_global_directory_tiles(board, ruby_system)
-        self._link_mem_tiles_to_global_directory()
+        if num_global_directories is None:
+            self._link_mem_tiles_to_global_directory()
         self._create_dma_tiles(board, ruby_system, is_fullsystem)
-        # we are not using the DMA controllers, and I don't know what's the best
-        # way to set up the links between the DMA tiles and the
-        # global directory / memory tiles, so I'll just connect the DMA tiles
-        # to the global directory for now.
-        self._link_dma_tiles_to_global_directory()
+        self._link_tiles_to_iod_routers()
+        self._create_iod_mesh()
 
     def get_global_directories(self) -> list[GlobalDirectory]:
         return [tile.global_directory for tile in self.global_directory_tiles]
@@ -59,6 +94,21 @@ class IOD(SubSystem, RubyNetworkComponent):
     def get_memory_controllers(self) -> list[MemoryController]:
         return [tile.memory_controller for tile in self.mem_tiles]
 
+    def get_iod_descriptor(self) -> MeshTracker:
+        return self._iod_descriptor
+
+    def get_iod_router(self, coordinate: Coordinate) -> RubyRouter:
+        return self._iod_descriptor.get_cross_tile_router(coordinate)
+
+    def _create_iod_routers(self, ruby_system: RubySystem):
+        coordinates = [
+            Coordinate.create_coordinate_from_tuple(c)
+            for c in self._iod_descriptor.get_sorted_coordinate()
+        ]
+        self.iod_routers = [self.create_router(ruby_system) for _ in coordinates]
+        for coordinate, router in zip(coordinates, self.iod_routers):
+            self._iod_descriptor.add_cross_tile_router(coordinate, router)
+
     def _create_mem_tiles(self, board: AbstractBoard, ruby_system: RubySystem, is_fullsystem: bool):
         if is_fullsystem:
             functional_mem_ports = board.get_mem_ports()[:1]
@@ -90,13 +140,27 @@ class IOD(SubSystem, RubyNetworkComponent):
             self.incorporate_ruby_subsystem(self.functional_memory_tile)
 
     def _create_global_directory_tiles(self, board: AbstractBoard, ruby_system: RubySystem):
+        if self._num_global_directories is None:
+            directory_ranges = [
+                mem_tile.get_address_range() for mem_tile in self.mem_tiles
+            ]
+        else:
+            mem_start = min(r.start.value for r in board.mem_ranges)
+            mem_size = board.get_memory().get_size()
+            slice_ranges = self._directory_interleaving.get_slice_ranges(
+                mem_start, mem_size, self._num_global_directories
+            )
+            check_slice_ranges(slice_ranges, mem_start, mem_size)
+            directory_ranges = [
+                [r.to_addr_range() for r in ranges] for ranges in slice_ranges
+            ]
         # create global directory tile
         self.global_directory_tiles = [
             SimpleGlobalDirectoryTile(
                 board=board,
                 ruby_system=ruby_system,
-                address_ranges=mem_tile.get_address_range(),
-            ) for mem_tile in self.mem_tiles
+                address_ranges=address_ranges,
+            ) for address_ranges in directory_ranges
         ]
         for tile in self.global_directory_tiles:
             self.incorporate_ruby_subsystem(tile)
@@ -124,13 +188,63 @@ class IOD(SubSystem, RubyNetworkComponent):
         for tile in self.dma_tiles:
             self.incorporate_ruby_subsystem(tile)
 
-    def _link_dma_tiles_to_global_directory(self):
-        if not hasattr(self, "dma_tiles"):
-            return
-        for dma_tile in self.dma_tiles:
-            dma_tile.dma_router_to_global_directory_link = self.create_int_link(
-                dma_tile.dma_router, self.global_directory_tiles[0].global_directory_router
+    # the coordinates of the IOD tiles of the given type, or of the MemTiles
+    # if there are none
+    def _get_tiles_coordinates(self, node_type: NodeType) -> list[Coordinate]:
+        coordinates = self._iod_descriptor.get_tiles_coordinates(node_type)
+        if not coordinates:
+            coordinates = self._iod_descriptor.get_tiles_coordinates(NodeType.MemTile)
+        return coordinates
+
+    def _link_to_iod_router(self, tile, router: RubyRouter, coordinate: Coordinate):
+        profile = self._iod_descriptor.get_link_profile(LinkClass.TileInternal)
+        iod_router = self.get_iod_router(coordinate)
+        tile.to_iod_router_link = self.create_int_link(
+            router, iod_router, profile=profile
+        )
+        tile.from_iod_router_link = self.create_int_link(
+            iod_router, router, profile=profile
+        )
+
+    def _link_tiles_to_iod_routers(self):
+        coordinates = self._get_tiles_coordinates(NodeType.MemTile)
+        # with one directory per channel, the memory tiles are reached through
+        # their global directory
+        if self._num_global_directories is not None:
+            for i, tile in enumerate(self.mem_tiles):
+                self._link_to_iod_router(
+                    tile, tile.memory_router, coordinates[i % len(coordinates)]
+                )
+        for i, tile in enumerate(self.global_directory_tiles):
+            self._link_to_iod_router(
+                tile,
+                tile.global_directory_router,
+                coordinates[i % len(coordinates)],
             )
-            dma_tile.global_directory_router_to_dma_link = self.create_int_link(
-                self.global_directory_tiles[0].global_directory_router, dma_tile.dma_router
+        if hasattr(self, "functional_memory_tile"):
+            self._link_to_iod_router(
+                self.functional_memory_tile,
+                self.functional_memory_tile.memory_router,
+                self._get_tiles_coordinates(NodeType.FunctionalMemTile)[0],
             )
+        if hasattr(self, "dma_tiles"):
+            coordinates = self._get_tiles_coordinates(NodeType.DMATile)
+            for i, tile in enumerate(self.dma_tiles):
+                self._link_to_iod_router(
+                    tile, tile.dma_router, coordinates[i % len(coordinates)]
+                )
+
+    def _create_iod_mesh(self):
+        iod_mesh_links = [
+            self.create_int_link(
+                self.get_iod_router(src),
+                self.get_iod_router(dst),
+                profile=self._iod_descriptor.get_mesh_link_profile(src, dst),
+            )
+            for src, dst, _ in TopologyType.get_links(
+                self._topology, self._iod_descriptor
+            )
+        ]
+        # gem5 doesn't like empty arrays
+        if iod_mesh_links:
+            self.iod_mesh_links = iod_mesh_links
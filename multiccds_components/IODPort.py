@@ -0,0 +1,73 @@
+# Copyright (c) 2026 The Regents of the University of California
+# All rights reserved.
+# SPDX-License-Identifier: BSD-3-Clause
+
+from typing import List, Optional
+
+from ..components.MeshDescriptor import Coordinate, LinkProfile, MeshTracker
+
+
+# A GMI-style port between a tile of a CCD and a tile of the IOD mesh, i.e. a
+# pair of links between their cross-tile routers. The profile defaults to the
+# IODAttach profile of the CCD's MeshTracker.
+class IODPort:
+    def __init__(
+        self,
+        ccd_coordinate: Coordinate,
+        iod_coordinate: Coordinate,
+        profile: Optional[LinkProfile] = None,
+    ) -> None:
+        self._ccd_coordinate = ccd_coordinate
+        self._iod_coordinate = iod_coordinate
+        self._profile = profile
+
+    def get_ccd_coordinate(self) -> Coordinate:
+        return self._ccd_coordinate
+
+    def get_iod_coordinate(self) -> Coordinate:
+        return self._iod_coordinate
+
+    def get_profile(self, default_profile: LinkProfile) -> LinkProfile:
+        if self._profile is None:
+            return default_profile
+        return self._profile
+
+    # num_ports ports per CCD, spread evenly over the last row of the CCD
+    # (the edge facing the IOD) and over the tiles of the IOD, the CCDs
+    # taking consecutive IOD tiles in row-major order.
+    @classmethod
+    def get_default_ports(
+        cls,
+        ccd_index: int,
+        num_ccds: int,
+        ccd_mesh: MeshTracker,
+        iod_mesh: MeshTracker,
+        num_ports: int = 1,
+    ) -> List["IODPort"]:
+        ccd_tiles = ccd_mesh.get_sorted_coordinate()
+        edge = [(x, y) for x, y in ccd_tiles if y == ccd_tiles[-1][1]]
+        assert num_ports <= len(edge), (
+            f"The last row of mesh {ccd_mesh.name} has {len(edge)} tiles, "
+            f"not enough for {num_ports} IOD ports"
+        )
+        iod_tiles = iod_mesh.get_sorted_coordinate()
+        num_all_ports = num_ccds * num_ports
+        ports = []
+        for i in range(num_ports):
+            port_index = ccd_index * num_ports + i
+            ports.append(
+                IODPort(
+                    Coordinate.create_coordinate_from_tuple(
+                        edge[(2 * i + 1) * len(edge) // (2 * num_ports)]
+                    ),
+                    Coordinate.create_coordinate_from_tuple(
+                        iod_tiles[
+                            (2 * port_index + 1) * len(iod_tiles) // (2 * num_all_ports)
+                        ]
+                    ),
+                )
+            )
+        return ports
+
+    def __str__(self) -> str:
+        return f"{self._ccd_coordinate} -> IOD {self._iod_coordinate}"
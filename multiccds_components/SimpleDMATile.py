@@ -20,6 +20,7 @@ class SimpleDMATile(SubSystem, RubyNetworkComponent):
     ):
         SubSystem.__init__(self=self)
         RubyNetworkComponent.__init__(self=self)
+        self._ruby_system = ruby_system
         self.dma_controller = DMARequestor(
             network=ruby_system.network,
             cache_line_size=board.get_cache_line_size(),
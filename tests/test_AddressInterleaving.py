@@ -0,0 +1,87 @@
+# Copyright (c) 2026 The Regents of the University of California
+# All rights reserved.
+# SPDX-License-Identifier: BSD-3-Clause
+
+import pytest
+
+from ..utils.AddressInterleaving import AddressInterleaving, check_slice_ranges
+
+mem_start = 0x80000000
+
+policies = [
+    AddressInterleaving(),
+    AddressInterleaving(granularity="64B"),
+    AddressInterleaving(granularity="64B", hashed=True),
+    AddressInterleaving(granularity="2MiB", hashed=True),
+    AddressInterleaving(granularity="256B", balance_bits=4),
+]
+
+
+@pytest.mark.parametrize("policy", policies, ids=str)
+@pytest.mark.parametrize("num_slices", [1, 2, 3, 6, 8, 12, 16])
+def test_coverage(policy, num_slices):
+    mem_size = 2**32
+    slice_ranges = policy.get_slice_ranges(mem_start, mem_size, num_slices)
+    check_slice_ranges(slice_ranges, mem_start, mem_size)
+
+
+# every block of a small memory is in exactly one range, the range of the
+# slice get_slice_index() gives
+@pytest.mark.parametrize("hashed", [False, True])
+def test_every_block_has_one_slice(hashed):
+    policy = AddressInterleaving(granularity="64B", hashed=hashed)
+    mem_size = 2**18
+    num_slices = 12
+    slice_ranges = policy.get_slice_ranges(mem_start, mem_size, num_slices)
+    for address in range(mem_start, mem_start + mem_size, 64):
+        owners = [
+            slice_id
+            for slice_id, ranges in enumerate(slice_ranges)
+            for r in ranges
+            if r.contains(address)
+        ]
+        assert owners == [
+            policy.get_slice_index(address, num_slices, mem_start + mem_size)
+        ]
+
+
+def test_missing_range_is_detected():
+    mem_size = 2**32
+    slice_ranges = AddressInterleaving().get_slice_ranges(mem_start, mem_size, 12)
+    slice_ranges[5].pop()
+    with pytest.raises(AssertionError):
+        check_slice_ranges(slice_ranges, mem_start, mem_size)
+
+
+# The slices own whole buckets, so with a number of slices that is not a
+# power of two some own one bucket more than others. The largest share of the
+# memory a slice gets is at most (1 + 2^-balance_bits) / num_slices.
+@pytest.mark.parametrize("balance_bits", [0, 2, 4])
+def test_balance(balance_bits):
+    policy = AddressInterleaving(balance_bits=balance_bits)
+    for num_slices in range(1, 65):
+        bucket_slices = policy.get_bucket_slices(num_slices)
+        shares = [
+            bucket_slices.count(slice_id) / len(bucket_slices)
+            for slice_id in range(num_slices)
+        ]
+        assert min(shares) > 0
+        assert max(shares) <= (1 + 2**-balance_bits) / num_slices
+
+
+def test_balance_of_12_slices():
+    # 64 buckets for 12 slices: 4 slices own 6 buckets and 8 own 5, i.e. the
+    # most loaded slices get 12.5% more than 1/12 of the memory, the bound of
+    # the default balance_bits
+    bucket_slices = AddressInterleaving().get_bucket_slices(12)
+    assert len(bucket_slices) == 64
+    assert max(bucket_slices.count(s) for s in range(12)) / 64 == 0.09375
+    # with 4 balance bits, 256 buckets, 22 of them for the most loaded slices
+    bucket_slices = AddressInterleaving(balance_bits=4).get_bucket_slices(12)
+    assert max(bucket_slices.count(s) for s in range(12)) / 256 == 22 / 256
+
+
+def test_power_of_two_slices_are_even():
+    for num_slices in [1, 2, 4, 8, 16, 32]:
+        bucket_slices = AddressInterleaving().get_bucket_slices(num_slices)
+        assert bucket_slices == list(range(num_slices))
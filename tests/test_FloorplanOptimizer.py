@@ -0,0 +1,50 @@
+# Copyright (c) 2026 The Regents of the University of California
+# All rights reserved.
+# SPDX-License-Identifier: BSD-3-Clause
+
+from ..components.MeshDescriptor import NodeType
+from ..utils.FloorplanOptimizer import FloorplanOptimizer
+
+
+def get_optimizer(seed=0):
+    return FloorplanOptimizer(
+        num_core_tiles=12,
+        num_l3_only_tiles=1,
+        num_mem_tiles=4,
+        num_dma_tiles=2,
+        num_pickle_device_tiles=1,
+        seed=seed,
+    )
+
+
+def test_optimize():
+    optimizer = get_optimizer()
+    initial_layout = optimizer._get_initial_layout()
+    mesh = optimizer.optimize("mesh", iterations=500, initial_layout=initial_layout)
+    assert optimizer.best_cost <= optimizer.get_cost(initial_layout)
+
+    layout = optimizer.mesh_to_layout(mesh)
+    assert sorted(layout) == sorted(initial_layout)
+    assert optimizer.get_cost(layout) == optimizer.best_cost
+    assert optimizer.layout_to_mesh("mesh", layout).to_dict() == mesh.to_dict()
+
+    # the memory and DMA tiles are on the boundary of the 4x5 mesh
+    assert (optimizer.get_width(), optimizer.get_height()) == (4, 5)
+    for node_type in [NodeType.MemTile, NodeType.DMATile]:
+        for c in mesh.get_tiles_coordinates(node_type):
+            x, y = c.get_hash()
+            assert x in (0, 3) or y in (0, 4)
+
+
+def test_optimize_is_deterministic():
+    meshes = [get_optimizer(seed).optimize("mesh", iterations=200) for seed in [1, 1]]
+    assert meshes[0].to_dict() == meshes[1].to_dict()
+
+
+def test_optimize_partial_last_row():
+    optimizer = FloorplanOptimizer(num_core_tiles=9, num_mem_tiles=4, width=4)
+    mesh = optimizer.optimize("mesh", iterations=200)
+    assert mesh.get_height() == 4
+    assert mesh.get_sorted_coordinate() == [
+        (x, y) for y in range(4) for x in range(4) if y < 3 or x == 0
+    ]
@@ -0,0 +1,76 @@
+# Copyright (c) 2026 The Regents of the University of California
+# All rights reserved.
+# SPDX-License-Identifier: BSD-3-Clause
+
+import pytest
+
+from ..benchmarks.MeshTrackerBenchmark import build_mesh
+from ..components.MeshDescriptor import (
+    Coordinate,
+    MeshTracker,
+    NodeType,
+    RoutingAlgorithm,
+)
+from ..utils.MeshAnalyzer import MeshAnalyzer
+
+
+def build_mesh_with_holes(rows):
+    mesh = MeshTracker(name="holes")
+    for y, row in enumerate(rows):
+        for x, tile in enumerate(row.split()):
+            if tile != ".":
+                node_type = NodeType.MemTile if tile == "M" else NodeType.CoreTile
+                mesh.add_node(Coordinate(x=x, y=y), node_type)
+    return mesh
+
+
+@pytest.mark.parametrize(
+    "routing_algorithm", [RoutingAlgorithm.Shortest, RoutingAlgorithm.XY]
+)
+def test_closed_form_matches_routes(routing_algorithm):
+    mesh = build_mesh(5, 4)
+    analyzer = MeshAnalyzer(mesh, routing_algorithm)
+    cores = mesh.get_tiles_coordinates(NodeType.CoreTile)
+    mem_tiles = mesh.get_tiles_coordinates(NodeType.MemTile)
+
+    # the link loads in closed form, then along the routing trees
+    loads = analyzer.get_all_to_all_link_loads(
+        cores, [1.0] * len(cores), mem_tiles, [1.0] * len(mem_tiles)
+    )
+    flows = [
+        (c.get_hash(), m.get_hash(), 1.0 / len(mem_tiles))
+        for c in cores
+        for m in mem_tiles
+    ]
+    routed_loads = analyzer.get_link_loads(flows)
+    assert loads.keys() == routed_loads.keys()
+    for link, load in loads.items():
+        assert load == pytest.approx(routed_loads[link])
+
+    stats = analyzer.get_hop_stats(cores, mem_tiles)
+    hops = [len(analyzer.get_route(c, m)) - 1 for c in cores for m in mem_tiles]
+    assert stats.average == pytest.approx(sum(hops) / len(hops))
+    assert stats.worst == max(hops)
+
+
+def test_get_nearest():
+    mesh = build_mesh_with_holes(["C C C", "C . C", "C C C"])
+    analyzer = MeshAnalyzer(mesh)
+    sources = [Coordinate(0, 0), Coordinate(2, 2), Coordinate(1, 0)]
+    destinations = [Coordinate(0, 2), Coordinate(2, 0)]
+    # the corners are two hops from both destinations and are spread over
+    # them, while the hole puts (1, 0) three hops away from (0, 2)
+    assert analyzer.get_nearest(sources, destinations) == [0, 1, 1]
+    assert analyzer.get_nearest(sources[1::-1], destinations) == [0, 1]
+    assert len(analyzer.get_route(Coordinate(1, 0), Coordinate(0, 2))) == 4
+
+
+def test_get_nearest_skips_unreachable_destinations():
+    mesh = build_mesh_with_holes(["C C . M", "C C . ."])
+    analyzer = MeshAnalyzer(mesh)
+    assert analyzer.get_distance_matrix()[0][2] == -1
+    sources = [Coordinate(0, 0), Coordinate(1, 1)]
+    destinations = [Coordinate(3, 0), Coordinate(1, 0)]
+    assert analyzer.get_nearest(sources, destinations) == [1, 1]
+    with pytest.raises(AssertionError):
+        analyzer.get_nearest(sources, destinations[:1])
@@ -0,0 +1,56 @@
+# Copyright (c) 2026 The Regents of the University of California
+# All rights reserved.
+# SPDX-License-Identifier: BSD-3-Clause
+
+import pytest
+
+from ..benchmarks.MeshTrackerBenchmark import build_mesh
+from ..components.MeshDescriptor import Coordinate, NodeType
+from ..components.MeshLayout import MeshLayout
+from ..components.PrebuiltMesh import PrebuiltMesh
+
+layout = "P . M\nM C C\nC L C\nD M ."
+
+
+def test_ascii_round_trip():
+    mesh = MeshLayout.from_ascii("mesh", layout)
+    assert (mesh.get_width(), mesh.get_height()) == (3, 4)
+    assert mesh.get_node_type(Coordinate(0, 0)) == NodeType.PickleDeviceTile
+    assert mesh.get_node_type(Coordinate(1, 2)) == NodeType.L3OnlyTile
+    assert not mesh.has_node(Coordinate(1, 0))
+    assert MeshLayout.to_ascii(mesh) == layout
+    one_line = MeshLayout.from_ascii("mesh", layout.replace("\n", " / "))
+    assert one_line.to_dict() == mesh.to_dict()
+
+
+def test_description_round_trip():
+    mesh = build_mesh(6, 6)
+    mesh.add_express_links(2)
+    description = MeshLayout.to_description(mesh)
+    assert "tiles" not in description and description["express_links"]
+    assert MeshLayout.from_description(description).to_dict() == mesh.to_dict()
+    mesh = PrebuiltMesh.getMesh3("mesh3", has_dma=True)
+    description = MeshLayout.to_description(mesh)
+    assert MeshLayout.from_description(description).to_dict() == mesh.to_dict()
+
+
+@pytest.mark.parametrize("extension", [".json", ".yaml", ".txt"])
+def test_save_and_load(tmp_path, extension):
+    if extension == ".yaml":
+        pytest.importorskip("yaml")
+    mesh = build_mesh(4, 5)
+    if extension != ".txt":
+        # a bare grid has no express links
+        mesh.add_express_links(2)
+    path = str(tmp_path / f"mesh4x5{extension}")
+    MeshLayout.save(mesh, path)
+    assert MeshLayout.load(path).to_dict() == mesh.to_dict()
+
+
+def test_invalid_layouts():
+    with pytest.raises(AssertionError, match="Unknown tile"):
+        MeshLayout.from_ascii("mesh", "C X")
+    with pytest.raises(AssertionError, match="no core tile"):
+        MeshLayout.from_ascii("mesh", "M M")
+    with pytest.raises(AssertionError, match="not connected"):
+        MeshLayout.from_ascii("mesh", "C C . M / C C . M")
@@ -0,0 +1,43 @@
+# Copyright (c) 2026 The Regents of the University of California
+# All rights reserved.
+# SPDX-License-Identifier: BSD-3-Clause
+
+import pytest
+
+from ..components.MeshDescriptor import NodeType
+from ..components.PrebuiltMesh import PrebuiltMesh
+
+
+@pytest.mark.parametrize("cores", [1, 2, 3, 7, 12, 16, 33, 64, 100])
+@pytest.mark.parametrize(
+    "l3_only, mem_channels, dma, pickle_devices, functional_mem",
+    [(0, 1, 0, 0, False), (0, 2, 1, 1, True), (3, 8, 2, 1, False), (1, 5, 3, 2, True)],
+)
+def test_generate(cores, l3_only, mem_channels, dma, pickle_devices, functional_mem):
+    # generate() goes through MeshLayout.from_ascii(), which also checks that
+    # the mesh is connected
+    mesh = PrebuiltMesh.generate(
+        "generated",
+        cores,
+        l3_only=l3_only,
+        mem_channels=mem_channels,
+        dma=dma,
+        pickle_devices=pickle_devices,
+        functional_mem=functional_mem,
+    )
+    for node_type, count in [
+        (NodeType.CoreTile, cores),
+        (NodeType.L3OnlyTile, l3_only),
+        (NodeType.MemTile, mem_channels),
+        (NodeType.DMATile, dma),
+        (NodeType.PickleDeviceTile, pickle_devices),
+        (NodeType.FunctionalMemTile, int(functional_mem)),
+    ]:
+        assert mesh.get_num_tiles(node_type) == count
+
+
+def test_generate_aspect():
+    square = PrebuiltMesh.generate("square", 64, mem_channels=4)
+    wide = PrebuiltMesh.generate("wide", 64, mem_channels=4, aspect=4.0)
+    assert (square.get_width(), square.get_height()) == (8, 10)
+    assert (wide.get_width(), wide.get_height()) == (16, 6)
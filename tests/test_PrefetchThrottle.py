@@ -0,0 +1,51 @@
+# Copyright (c) 2026 The Regents of the University of California
+# All rights reserved.
+# SPDX-License-Identifier: BSD-3-Clause
+
+from ..utils.PrefetchThrottle import PrefetchThrottle
+
+metadata = {
+    "agents": [
+        {"agent": f"agent{i}", "sequencer": f"seq{i}", "l3_slice": f"l3{i}"}
+        for i in range(3)
+    ]
+}
+
+
+def get_stats(issued, misses, stalls):
+    stats = {}
+    for i, (n, m, s) in enumerate(zip(issued, misses, stalls)):
+        stats[f"seq{i}.miss_latency_hist_seqr::samples"] = n
+        stats[f"l3{i}.cache.m_demand_misses"] = m
+        stats[f"l3{i}.reqRdy.m_stall_count"] = s
+    return stats
+
+
+baseline = get_stats([0, 0, 0], [120, 100, 100], [10, 10, 10])
+# slice 0: 70 useful and 30 late prefetches, slice 1: 10 useful and 90
+# unused, slice 2: 20 polluting
+stats = get_stats([100, 100, 100], [150, 190, 220], [40, 10, 10])
+
+
+def test_slice_stats():
+    slice_stats = PrefetchThrottle.get_slice_stats(metadata, stats, baseline)
+    assert [(s.useful, s.late, s.unused, s.polluting) for s in slice_stats] == [
+        (70, 30, 0, 0),
+        (10, 0, 90, 0),
+        (0, 0, 100, 20),
+    ]
+    assert slice_stats[0].get_accuracy() == 1.0
+    assert slice_stats[0].get_lateness() == 0.3
+    # without a baseline, every prefetch is useful
+    slice_stats = PrefetchThrottle.get_slice_stats(metadata, stats)
+    assert [(s.useful, s.late, s.unused) for s in slice_stats] == [(100, 0, 0)] * 3
+
+
+def test_tune():
+    throttle = PrefetchThrottle(max_outstanding=9, outstanding=[8, 8, 8])
+    tuned = throttle.tune(metadata, stats, baseline)
+    assert tuned.get_outstanding(3) == [9, 4, 4]
+    assert tuned.tune(metadata, stats, baseline).get_outstanding(3) == [9, 2, 2]
+    # a deep memory read queue halves every cap
+    busy = dict(stats, **{"mem_ctrl.dram.avgRdQLen": 20.0})
+    assert throttle.tune(metadata, busy, baseline).get_outstanding(3) == [4, 4, 4]
@@ -0,0 +1,35 @@
+# Copyright (c) 2026 The Regents of the University of California
+# All rights reserved.
+# SPDX-License-Identifier: BSD-3-Clause
+
+from ..benchmarks.MeshTrackerBenchmark import build_mesh
+from ..components.MeshDescriptor import NodeType
+from ..utils.AddressInterleaving import AddressInterleaving
+from ..utils.SubNumaClustering import SubNumaClustering
+
+mem_start = 0x80000000
+
+
+def test_regions():
+    mem_size = 2**32 + 2**21
+    regions = SubNumaClustering(2, 2).get_regions(mem_start, mem_size)
+    assert [start for start, _ in regions] == [mem_start + i * 2**30 for i in range(4)]
+    # the last region takes the remainder of the memory
+    assert [size for _, size in regions] == [2**30] * 3 + [2**30 + 2**21]
+
+
+def test_slice_ranges_stay_in_their_cluster():
+    mesh = build_mesh(6, 6)
+    clustering = SubNumaClustering(2, 2)
+    slices = mesh.get_tiles_coordinates(NodeType.CoreTile)
+    mem_size = 2**32
+    regions = clustering.get_regions(mem_start, mem_size)
+    slice_ranges = clustering.get_slice_ranges(
+        AddressInterleaving(hashed=True), slices, mesh, mem_start, mem_size
+    )
+    for c, ranges in zip(slices, slice_ranges):
+        assert ranges
+        region = regions[clustering.get_cluster(c, mesh)]
+        assert all((r.start, r.size) == region for r in ranges)
+    # the west and east halves of the first row of cores are in clusters 0 and 1
+    assert [clustering.get_cluster(c, mesh) for c in slices[:6]] == [0] * 3 + [1] * 3
@@ -0,0 +1,61 @@
+# Copyright (c) 2026 The Regents of the University of California
+# All rights reserved.
+# SPDX-License-Identifier: BSD-3-Clause
+
+from ..benchmarks.MeshTrackerBenchmark import build_mesh
+from ..components.MeshDescriptor import MeshTracker, RoutingAlgorithm, TopologyType
+from ..utils.AddressInterleaving import AddressInterleaving
+from ..utils.SubNumaClustering import SubNumaClustering
+from ..utils.TopologyPlan import TopologyPlan
+
+mem_start = 0x80000000
+mem_size = 2**32
+
+
+def get_args(mesh):
+    return (
+        mesh,
+        mem_start,
+        mem_size,
+        RoutingAlgorithm.XY,
+        TopologyType.Torus,
+        AddressInterleaving(hashed=True),
+        SubNumaClustering(2, 2),
+    )
+
+
+def test_replay(tmp_path):
+    mesh = build_mesh(6, 6)
+    plan = TopologyPlan.load_or_create(str(tmp_path), *get_args(mesh))
+    assert len(list(tmp_path.iterdir())) == 1
+    replayed = TopologyPlan.load_or_create(str(tmp_path), *get_args(build_mesh(6, 6)))
+    assert replayed._plan == plan._plan
+    assert replayed.get_mesh_descriptor().to_dict() == mesh.to_dict()
+    links = [
+        (src.get_hash(), dst.get_hash(), direction)
+        for src, dst, direction in TopologyType.get_links(TopologyType.Torus, mesh)
+    ]
+    assert [
+        (src.get_hash(), dst.get_hash(), direction)
+        for src, dst, direction, _, _ in replayed.get_mesh_links()
+    ] == links
+    assert [
+        [[r.start, r.size, r.masks, r.match] for r in ranges]
+        for ranges in replayed.get_l3_slice_ranges()
+    ] == plan._plan["l3_slice_ranges"]
+
+
+def test_matches():
+    plan = TopologyPlan.create(*get_args(build_mesh(6, 6)))
+    # a mesh of the same layout, then the mesh of the plan itself
+    for mesh in [build_mesh(6, 6), plan.get_mesh_descriptor()]:
+        assert plan.matches(*get_args(mesh))
+        args = list(get_args(mesh))
+        args[2] = mem_size // 2
+        assert not plan.matches(*args)
+        args = list(get_args(mesh))
+        args[5] = AddressInterleaving()
+        assert not plan.matches(*args)
+    assert not plan.matches(*get_args(build_mesh(6, 8)))
+    mesh = MeshTracker.from_dict(build_mesh(4, 6).to_dict())
+    assert not plan.matches(*get_args(mesh))
@@ -0,0 +1,257 @@
+# Copyright (c) 2026 The Regents of the University of California
+# All rights reserved.
+# SPDX-License-Identifier: BSD-3-Clause
+
+# Address interleaving of the L3 slices. Every slice gets interleaved ranges
+# sharing the same masks, evaluated like gem5's AddrRange: bit i of the
+# selector of an address is the parity of address & masks[i].
+
+import random
+from typing import Any, Dict, List, Optional
+
+from .SizeArithmetic import SizeArithmetic
+
+
+def get_selector(address: int, masks: List[int]) -> int:
+    selector = 0
+    for i, mask in enumerate(masks):
+        selector |= (bin(address & mask).count("1") & 1) << i
+    return selector
+
+
+class InterleavedRange:
+    def __init__(self, start: int, size: int, masks: List[int], match: int) -> None:
+        self.start = start
+        self.size = size
+        self.masks = masks
+        self.match = match
+
+    def contains(self, address: int) -> bool:
+        if not (self.start <= address < self.start + self.size):
+            return False
+        return get_selector(address, self.masks) == self.match
+
+    def to_addr_range(self):
+        from m5.objects import AddrRange
+
+        if not self.masks:
+            return AddrRange(start=self.start, size=self.size)
+        return AddrRange(
+            start=self.start,
+            size=self.size,
+            masks=self.masks,
+            intlvMatch=self.match,
+        )
+
+    def __str__(self) -> str:
+        masks = ", ".join(hex(mask) for mask in self.masks)
+        return (
+            f"[{hex(self.start)}, {hex(self.start + self.size)}) "
+            f"masks=[{masks}] match={self.match}"
+        )
+
+
+class AddressInterleaving:
+    min_granularity = 64
+    max_granularity = 2**21
+
+    def __init__(
+        self,
+        granularity: str = "4KiB",
+        hashed: bool = False,
+        hash_high_bit: Optional[int] = None,
+        balance_bits: int = 2,
+    ) -> None:
+        granularity_bytes = SizeArithmetic(granularity).bytes
+        assert (
+            granularity_bytes & (granularity_bytes - 1) == 0
+        ), f"The interleaving granularity {granularity} is not a power of two"
+        assert (
+            self.min_granularity <= granularity_bytes <= self.max_granularity
+        ), f"The interleaving granularity {granularity} is not in [64B, 2MiB]"
+        self._granularity = granularity
+        self._offset_bits = granularity_bytes.bit_length() - 1
+        self._hashed = hashed
+        # the highest address bit folded into the selector, by default the
+        # highest bit of the last address of the memory
+        self._hash_high_bit = hash_high_bit
+        # A number of slices that is not a power of two shares 2^balance_bits
+        # more buckets than slices, so that no slice gets more than
+        # (1 + 2^-balance_bits) / num_slices of the memory.
+        self._balance_bits = balance_bits
+
+    def get_params(self) -> Dict[str, Any]:
+        return {
+            "granularity": self._granularity,
+            "hashed": self._hashed,
+            "hash_high_bit": self._hash_high_bit,
+            "balance_bits": self._balance_bits,
+        }
+
+    def get_granularity(self) -> str:
+        return self._granularity
+
+    def is_hashed(self) -> bool:
+        return self._hashed
+
+    def get_num_selector_bits(self, num_slices: int) -> int:
+        assert num_slices > 0
+        num_bits = (num_slices - 1).bit_length()
+        if num_slices & (num_slices - 1) != 0:
+            num_bits += self._balance_bits
+        return num_bits
+
+    def get_masks(self, num_slices: int, mem_end: int) -> List[int]:
+        num_bits = self.get_num_selector_bits(num_slices)
+        if self._hash_high_bit is None:
+            hash_high_bit = (mem_end - 1).bit_length() - 1
+        else:
+            hash_high_bit = self._hash_high_bit
+        masks = []
+        for i in range(num_bits):
+            mask = 1 << (self._offset_bits + i)
+            # fold the higher bits in, so that power-of-two strides spread
+            # over the slices
+            if self._hashed:
+                bit = self._offset_bits + i + num_bits
+                while bit <= hash_high_bit:
+                    mask |= 1 << bit
+                    bit += num_bits
+            masks.append(mask)
+        return masks
+
+    # bucket_slices[b] is the slice owning the addresses whose selector is b
+    def get_bucket_slices(self, num_slices: int) -> List[int]:
+        num_buckets = 1 << self.get_num_selector_bits(num_slices)
+        return [bucket % num_slices for bucket in range(num_buckets)]
+
+    def get_slice_ranges(
+        self, start: int, size: int, num_slices: int
+    ) -> List[List[InterleavedRange]]:
+        masks = self.get_masks(num_slices, start + size)
+        slice_ranges = [[] for _ in range(num_slices)]
+        for bucket, slice_id in enumerate(self.get_bucket_slices(num_slices)):
+            slice_ranges[slice_id].append(
+                InterleavedRange(start=start, size=size, masks=masks, match=bucket)
+            )
+        return slice_ranges
+
+    def get_slice_index(self, address: int, num_slices: int, mem_end: int) -> int:
+        selector = get_selector(address, self.get_masks(num_slices, mem_end))
+        return self.get_bucket_slices(num_slices)[selector]
+
+    def __str__(self) -> str:
+        hashed = "hashed" if self._hashed else "linear"
+        return f"{self._granularity} {hashed}"
+
+
+def _get_rank(vectors: List[int]) -> int:
+    # rank over GF(2) of the given bit vectors
+    rank = 0
+    pivots = {}
+    for vector in vectors:
+        while vector:
+            high_bit = vector.bit_length() - 1
+            if high_bit not in pivots:
+                pivots[high_bit] = vector
+                rank += 1
+                break
+            vector ^= pivots[high_bit]
+    return rank
+
+
+def _get_aligned_block_bits(start: int, size: int) -> int:
+    # log2 of the largest 2^b aligned block inside [start, start + size)
+    block_bits = size.bit_length() - 1
+    while block_bits > 0:
+        block_start = -(-start // (1 << block_bits)) << block_bits
+        if block_start + (1 << block_bits) <= start + size:
+            break
+        block_bits -= 1
+    return block_bits
+
+
+# Checks that every address in [start, start + size) is contained in the
+# ranges of exactly one slice. The ranges of all the slices must share the
+# masks and their matches must cover every selector value exactly once, in
+# which case each address belongs to the one range matching its selector.
+# The masks must also be linearly independent over GF(2) so that every
+# selector value, hence every slice, is actually reached. The owners of a
+# sample of addresses are then looked up from their selectors.
+def check_slice_ranges(
+    slice_ranges: List[List[InterleavedRange]],
+    start: int,
+    size: int,
+    num_samples: int = 1024,
+    seed: int = 0,
+) -> None:
+    all_ranges = [r for ranges in slice_ranges for r in ranges]
+    assert all_ranges, "No address range was assigned"
+    for slice_id, ranges in enumerate(slice_ranges):
+        assert ranges, f"Slice {slice_id} has no address range"
+    masks = all_ranges[0].masks
+    for r in all_ranges:
+        assert (
+            r.start == start and r.size == size
+        ), f"Range {r} does not cover [{hex(start)}, {hex(start + size)})"
+        assert r.masks == masks, f"Range {r} does not share the masks {masks}"
+    matches = sorted(r.match for r in all_ranges)
+    assert matches == list(
+        range(1 << len(masks))
+    ), "The ranges do not cover every selector value exactly once"
+    # The low block_bits bits take every value in the largest aligned block
+    # inside the memory, so every selector value occurs in that block if the
+    # masks restricted to those bits are independent.
+    block_bits = _get_aligned_block_bits(start, size)
+    block_mask = (1 << block_bits) - 1
+    assert _get_rank([mask & block_mask for mask in masks]) == len(
+        masks
+    ), "Some slices are never selected: the masks are not linearly independent"
+
+    # all the ranges share their bounds and masks, so an address is in the
+    # ranges whose match is its selector
+    owners_by_match = {}
+    for slice_id, ranges in enumerate(slice_ranges):
+        for r in ranges:
+            owners_by_match.setdefault(r.match, []).append(slice_id)
+    rng = random.Random(seed)
+    samples = [start, start + size - 1]
+    samples += [rng.randrange(start, start + size) for _ in range(num_samples)]
+    for address in samples:
+        owners = owners_by_match.get(get_selector(address, masks), [])
+        assert len(owners) == 1, f"Address {hex(address)} maps to slices {owners}"
+
+
+if __name__ == "__main__":
+    mem_start = 0x80000000
+    mem_size = 2**32
+    policies = [
+        AddressInterleaving(),
+        AddressInterleaving(granularity="64B"),
+        AddressInterleaving(granularity="64B", hashed=True),
+        AddressInterleaving(granularity="4KiB", hashed=True),
+        AddressInterleaving(granularity="2MiB", hashed=True),
+    ]
+    for policy in policies:
+        for num_slices in [1, 2, 4, 6, 8, 12, 16, 32]:
+            slice_ranges = policy.get_slice_ranges(mem_start, mem_size, num_slices)
+            check_slice_ranges(slice_ranges, mem_start, mem_size, num_samples=256)
+    print("Every address maps to exactly one slice for all the policies.")
+
+    # share of the accesses of a power-of-two strided stream going to the
+    # most loaded slice; 1 / num_slices is ideal
+    num_slices = 12
+    strides = [2**i for i in range(6, 22, 3)]
+    print(f"\nmax slice share of a strided stream, {num_slices} slices")
+    print(f"{'policy':>14} " + " ".join(f"{s:>8}" for s in strides))
+    for policy in policies:
+        shares = []
+        for stride in strides:
+            counts = [0] * num_slices
+            for i in range(4096):
+                address = mem_start + (i * stride) % mem_size
+                counts[
+                    policy.get_slice_index(address, num_slices, mem_start + mem_size)
+                ] += 1
+            shares.append(max(counts) / 4096)
+        print(f"{str(policy):>14} " + " ".join(f"{s:>8.3f}" for s in shares))
@@ -0,0 +1,287 @@
+# Copyright (c) 2026 The Regents of the University of California
+# All rights reserved.
+# SPDX-License-Identifier: BSD-3-Clause
+
+# Places a given number of tiles of each type on a mesh by simulated
+# annealing, minimizing the core -> L3 -> memory hops and the hottest link of
+# MeshAnalyzer's uniform traffic. The memory and DMA tiles stay on the
+# boundary of the mesh unless io_on_edges is False.
+
+import math
+import random
+from typing import Dict, List, Optional, Tuple
+
+from ..components.MeshDescriptor import (
+    Coordinate,
+    MeshTracker,
+    NodeType,
+    RoutingAlgorithm,
+)
+from .MeshAnalyzer import add_dimension_ordered_loads
+
+
+class FloorplanOptimizer:
+    def __init__(
+        self,
+        num_core_tiles: int,
+        num_l3_only_tiles: int = 0,
+        num_mem_tiles: int = 2,
+        num_dma_tiles: int = 0,
+        num_pickle_device_tiles: int = 0,
+        num_functional_mem_tiles: int = 0,
+        width: Optional[int] = None,
+        routing_algorithm: RoutingAlgorithm = RoutingAlgorithm.Shortest,
+        hotspot_weight: float = 1.0,
+        io_weight: float = 0.25,
+        l3_miss_ratio: float = 1.0,
+        io_on_edges: bool = True,
+        seed: int = 0,
+    ) -> None:
+        assert num_core_tiles > 0, "The mesh needs at least one core tile"
+        assert num_functional_mem_tiles <= 1
+        self._tile_counts = {
+            NodeType.CoreTile: num_core_tiles,
+            NodeType.L3OnlyTile: num_l3_only_tiles,
+            NodeType.MemTile: num_mem_tiles,
+            NodeType.DMATile: num_dma_tiles,
+            NodeType.PickleDeviceTile: num_pickle_device_tiles,
+            NodeType.FunctionalMemTile: num_functional_mem_tiles,
+        }
+        num_tiles = sum(self._tile_counts.values())
+        if width is None:
+            width = max(1, round(math.sqrt(num_tiles)))
+        self._width = width
+        self._height = (num_tiles + width - 1) // width
+        self._num_tiles = num_tiles
+        # MeshAnalyzer routes ties on the vertical links first
+        if routing_algorithm == RoutingAlgorithm.XY:
+            self._dimension_order = "xy"
+        else:
+            self._dimension_order = "yx"
+        self._hotspot_weight = hotspot_weight
+        self._io_weight = io_weight
+        self._l3_miss_ratio = l3_miss_ratio
+        self._random = random.Random(seed)
+
+        # tile types that may only be placed on the boundary of the mesh
+        if io_on_edges:
+            self._edge_types = {
+                NodeType.MemTile,
+                NodeType.FunctionalMemTile,
+                NodeType.DMATile,
+            }
+        else:
+            self._edge_types = set()
+        self._is_edge = [
+            self._is_edge_position(index) for index in range(num_tiles)
+        ]
+        num_edge_tiles = sum(self._tile_counts[t] for t in self._edge_types)
+        assert num_edge_tiles <= sum(self._is_edge), (
+            f"{num_edge_tiles} tiles must be on the boundary of the "
+            f"{self._width}x{self._height} mesh, which only has "
+            f"{sum(self._is_edge)} positions"
+        )
+
+    def get_width(self) -> int:
+        return self._width
+
+    def get_height(self) -> int:
+        return self._height
+
+    def _get_position(self, index: int) -> Tuple[int, int]:
+        return (index % self._width, index // self._width)
+
+    # a position is on the boundary if one of its neighbors is not in the mesh
+    def _is_edge_position(self, index: int) -> bool:
+        x, y = self._get_position(index)
+        for nx, ny in ((x, y - 1), (x, y + 1), (x - 1, y), (x + 1, y)):
+            if not (0 <= nx < self._width and 0 <= ny < self._height):
+                return True
+            if ny * self._width + nx >= self._num_tiles:
+                return True
+        return False
+
+    # A layout is the list of node types of the first num_tiles positions of
+    # the mesh in row-major order.
+    def _get_initial_layout(self) -> List[int]:
+        edge_positions = [i for i in range(self._num_tiles) if self._is_edge[i]]
+        self._random.shuffle(edge_positions)
+        layout = [None] * self._num_tiles
+        for node_type in self._edge_types:
+            for _ in range(self._tile_counts[node_type]):
+                layout[edge_positions.pop()] = node_type
+        remaining = []
+        for node_type, count in self._tile_counts.items():
+            if node_type not in self._edge_types:
+                remaining.extend([node_type] * count)
+        self._random.shuffle(remaining)
+        for index in range(self._num_tiles):
+            if layout[index] is None:
+                layout[index] = remaining.pop()
+        return layout
+
+    def _is_valid_swap(self, layout: List[int], a: int, b: int) -> bool:
+        if layout[a] == layout[b]:
+            return False
+        if layout[a] in self._edge_types and not self._is_edge[b]:
+            return False
+        if layout[b] in self._edge_types and not self._is_edge[a]:
+            return False
+        return True
+
+    def _get_positions(self, layout: List[int]) -> Dict[int, List[Tuple[int, int]]]:
+        positions = {node_type: [] for node_type in self._tile_counts}
+        for index, node_type in enumerate(layout):
+            positions[node_type].append(self._get_position(index))
+        return positions
+
+    # Sum of the Manhattan distances between every tile of one group and every
+    # tile of the other, from the histograms of their coordinates.
+    def _get_total_hops(
+        self, group_a: List[Tuple[int, int]], group_b: List[Tuple[int, int]]
+    ) -> int:
+        total = 0
+        for axis, size in ((0, self._width), (1, self._height)):
+            count_a = [0] * size
+            count_b = [0] * size
+            for position in group_a:
+                count_a[position[axis]] += 1
+            for position in group_b:
+                count_b[position[axis]] += 1
+            for i, ca in enumerate(count_a):
+                if ca == 0:
+                    continue
+                for j, cb in enumerate(count_b):
+                    total += ca * cb * abs(i - j)
+        return total
+
+    def _get_average_hops(
+        self, group_a: List[Tuple[int, int]], group_b: List[Tuple[int, int]]
+    ) -> float:
+        if not group_a or not group_b:
+            return 0.0
+        return self._get_total_hops(group_a, group_b) / (len(group_a) * len(group_b))
+
+    def _get_hotspot_factor(self, positions: Dict[int, List[Tuple[int, int]]]) -> float:
+        cores = positions[NodeType.CoreTile]
+        l3_slices = positions[NodeType.CoreTile] + positions[NodeType.L3OnlyTile]
+        mem_tiles = positions[NodeType.MemTile]
+        loads = {}
+        add_dimension_ordered_loads(
+            self._width,
+            self._height,
+            self._dimension_order,
+            cores,
+            [1.0] * len(cores),
+            l3_slices,
+            [1.0 / len(l3_slices)] * len(l3_slices),
+            loads,
+        )
+        if mem_tiles:
+            l3_slice_traffic = len(cores) / len(l3_slices) * self._l3_miss_ratio
+            add_dimension_ordered_loads(
+                self._width,
+                self._height,
+                self._dimension_order,
+                l3_slices,
+                [l3_slice_traffic] * len(l3_slices),
+                mem_tiles,
+                [1.0 / len(mem_tiles)] * len(mem_tiles),
+                loads,
+            )
+        if not loads:
+            return 0.0
+        return max(loads.values()) * len(loads) / sum(loads.values())
+
+    def get_cost(self, layout: List[int]) -> float:
+        positions = self._get_positions(layout)
+        cores = positions[NodeType.CoreTile]
+        l3_slices = cores + positions[NodeType.L3OnlyTile]
+        io_tiles = positions[NodeType.DMATile] + positions[NodeType.PickleDeviceTile]
+        cost = self._get_average_hops(cores, l3_slices)
+        cost += self._get_average_hops(l3_slices, positions[NodeType.MemTile])
+        cost += self._io_weight * self._get_average_hops(io_tiles, l3_slices)
+        cost += self._hotspot_weight * self._get_hotspot_factor(positions)
+        return cost
+
+    def _search(
+        self, layout: List[int], iterations: int, initial_temperature: float
+    ) -> Tuple[List[int], float]:
+        cost = self.get_cost(layout)
+        best_layout, best_cost = list(layout), cost
+        final_temperature = initial_temperature * 1e-3
+        movable = [
+            index
+            for index in range(self._num_tiles)
+            if layout[index] != NodeType.CoreTile
+        ]
+        for i in range(iterations):
+            temperature = initial_temperature * (
+                final_temperature / initial_temperature
+            ) ** (i / max(1, iterations - 1))
+            # Most of the tiles are usually cores, so pick the first tile
+            # among the other types to avoid proposing useless swaps.
+            a = self._random.choice(movable)
+            b = self._random.randrange(self._num_tiles)
+            if not self._is_valid_swap(layout, a, b):
+                continue
+            layout[a], layout[b] = layout[b], layout[a]
+            new_cost = self.get_cost(layout)
+            delta = new_cost - cost
+            if delta <= 0 or self._random.random() < math.exp(-delta / temperature):
+                cost = new_cost
+                if cost < best_cost:
+                    best_layout, best_cost = list(layout), cost
+            else:
+                layout[a], layout[b] = layout[b], layout[a]
+        return best_layout, best_cost
+
+    def optimize(
+        self,
+        name: str,
+        iterations: int = 2000,
+        initial_temperature: float = 1.0,
+        initial_layout: Optional[List[int]] = None,
+    ) -> MeshTracker:
+        if initial_layout is None:
+            initial_layout = self._get_initial_layout()
+        assert len(initial_layout) == self._num_tiles
+        layout, self.best_cost = self._search(
+            list(initial_layout), iterations, initial_temperature
+        )
+        return self.layout_to_mesh(name, layout)
+
+    def layout_to_mesh(self, name: str, layout: List[int]) -> MeshTracker:
+        mesh = MeshTracker(name=name)
+        for index, node_type in enumerate(layout):
+            x, y = self._get_position(index)
+            mesh.add_node(Coordinate(x=x, y=y), node_type)
+        return mesh
+
+    def mesh_to_layout(self, mesh: MeshTracker) -> List[int]:
+        # the inverse of layout_to_mesh(), e.g. to score an existing layout
+        grid = mesh.get_node_type_grid()
+        assert mesh.get_width() == self._width
+        return grid[: self._num_tiles]
+
+
+if __name__ == "__main__":
+    import time
+
+    from ..components.MeshLayout import MeshLayout
+    from .MeshAnalyzer import MeshAnalyzer
+
+    for num_core_tiles, num_mem_tiles in [(64, 8), (128, 16)]:
+        optimizer = FloorplanOptimizer(
+            num_core_tiles=num_core_tiles,
+            num_mem_tiles=num_mem_tiles,
+            num_dma_tiles=2,
+            num_pickle_device_tiles=1,
+        )
+        start = time.time()
+        mesh = optimizer.optimize(name=f"optimized{num_core_tiles}")
+        elapsed = time.time() - start
+        print(f"{num_core_tiles} cores, search took {elapsed:.1f}s")
+        print(MeshAnalyzer(mesh).analyze())
+        for row in MeshLayout.to_ascii(mesh).split("\n"):
+            print("  " + row)
@@ -0,0 +1,569 @@
+# Copyright (c) 2026 The Regents of the University of California
+# All rights reserved.
+# SPDX-License-Identifier: BSD-3-Clause
+
+# Hop counts and uniform traffic link loads of a MeshTracker layout, along the
+# routes SimpleNetwork would take. No gem5 objects are created.
+
+from typing import Dict, List, Optional, Tuple
+
+from ..components.MeshDescriptor import (
+    Coordinate,
+    MeshTracker,
+    NodeType,
+    RoutingAlgorithm,
+    TopologyType,
+)
+
+# a directed link between the cross tile routers of two tiles
+Link = Tuple[Tuple[int, int], Tuple[int, int]]
+# (source tile, destination tile, amount of traffic)
+Flow = Tuple[Tuple[int, int], Tuple[int, int], float]
+
+
+class HopStats:
+    def __init__(self, average: float, worst: int) -> None:
+        self.average = average
+        self.worst = worst
+
+    def __str__(self) -> str:
+        return f"avg {self.average:.3f} hops, worst {self.worst} hops"
+
+
+# Adds the link loads of an all-to-all traffic pattern on a width x height
+# mesh without holes, where the tile at sources[i] sends
+# source_amounts[i] * destination_weights[j] to the tile at destinations[j],
+# and every route resolves the dimensions in dimension_order ("xy" or "yx").
+def add_dimension_ordered_loads(
+    width: int,
+    height: int,
+    dimension_order: str,
+    sources: List[Tuple[int, int]],
+    source_amounts: List[float],
+    destinations: List[Tuple[int, int]],
+    destination_weights: List[float],
+    loads: Dict[Link, float],
+) -> None:
+    # YX routing is XY routing on the transposed mesh
+    transposed = dimension_order == "yx"
+    if transposed:
+        width, height = height, width
+    a = [[0.0] * width for _ in range(height)]
+    b = [[0.0] * width for _ in range(height)]
+    for (x, y), amount in zip(sources, source_amounts):
+        if transposed:
+            x, y = y, x
+        a[y][x] += amount
+    for (x, y), weight in zip(destinations, destination_weights):
+        if transposed:
+            x, y = y, x
+        b[y][x] += weight
+
+    def add(src_x, src_y, dst_x, dst_y, load):
+        if load <= 0.0:
+            return
+        if transposed:
+            link = ((src_y, src_x), (dst_y, dst_x))
+        else:
+            link = ((src_x, src_y), (dst_x, dst_y))
+        loads[link] = loads.get(link, 0.0) + load
+
+    # A route first moves along its source row to the destination column, so
+    # the east link out of column x in row y carries the traffic of the
+    # sources of that row at or left of x to the destinations right of x.
+    b_columns = [sum(b[y][x] for y in range(height)) for x in range(width)]
+    b_total = sum(b_columns)
+    for y in range(height):
+        a_row_total = sum(a[y])
+        a_left = 0.0
+        b_left = 0.0
+        for x in range(width - 1):
+            a_left += a[y][x]
+            b_left += b_columns[x]
+            add(x, y, x + 1, y, a_left * (b_total - b_left))
+            add(x + 1, y, x, y, (a_row_total - a_left) * b_left)
+    # It then moves along the destination column to the destination row, so
+    # the south link out of row y in column x carries the traffic of the
+    # sources in rows at or above y to the destinations of column x below y.
+    a_rows = [sum(row) for row in a]
+    a_total = sum(a_rows)
+    for x in range(width):
+        b_column_total = b_columns[x]
+        a_above = 0.0
+        b_above = 0.0
+        for y in range(height - 1):
+            a_above += a_rows[y]
+            b_above += b[y][x]
+            add(x, y, x, y + 1, (b_column_total - b_above) * a_above)
+            add(x, y + 1, x, y, b_above * (a_total - a_above))
+
+
+class MeshAnalyzer:
+    def __init__(
+        self,
+        mesh_descriptor: MeshTracker,
+        routing_algorithm: RoutingAlgorithm = RoutingAlgorithm.Shortest,
+        topology: TopologyType = TopologyType.Mesh,
+    ) -> None:
+        self._mesh_descriptor = mesh_descriptor
+        self._routing_algorithm = routing_algorithm
+        self._topology = topology
+
+        # tiles in row-major order; the index of a tile is its position here
+        self._tiles = mesh_descriptor.get_sorted_coordinate()
+        self._tile_index = {tile: i for i, tile in enumerate(self._tiles)}
+        self._width = mesh_descriptor.get_width()
+        self._height = mesh_descriptor.get_height()
+        self._neighbors = self._build_neighbors()
+        self._routing_trees: List[Optional[Tuple[List[int], List[int]]]] = [
+            None
+        ] * len(self._tiles)
+        self._hops_to: List[Optional[List[int]]] = [None] * len(self._tiles)
+
+    def get_tiles(self) -> List[Tuple[int, int]]:
+        return list(self._tiles)
+
+    # (neighbor index, link weight) for every outgoing mesh link of every
+    # tile, in the order MeshNetwork.create_mesh() creates them
+    def _build_neighbors(self) -> List[List[Tuple[int, int]]]:
+        horizontal_weight, vertical_weight = RoutingAlgorithm.get_link_weights(
+            self._routing_algorithm
+        )
+        neighbors = [[] for _ in self._tiles]
+        for src, dst, _ in TopologyType.get_links(
+            self._topology, self._mesh_descriptor
+        ):
+            weight = horizontal_weight if src.y == dst.y else vertical_weight
+            neighbors[self._tile_index[src.get_hash()]].append(
+                (self._tile_index[dst.get_hash()], weight)
+            )
+        return neighbors
+
+    # Routes towards one destination form a tree. For every tile, returns the
+    # next hop towards the destination (None for the destination itself) and
+    # the tiles sorted by decreasing distance to the destination, so that a
+    # tile always comes before its next hop.
+    def _get_routing_tree(self, destination: int) -> Tuple[List[int], List[int]]:
+        tree = self._routing_trees[destination]
+        if tree is not None:
+            return tree
+        # The mesh links are bidirectional with the same weight in both
+        # directions, so the distances from the destination are also the
+        # distances to it. Link weights are small integers, so a bucket queue
+        # keeps this linear in the number of links.
+        unreachable = -1
+        distance = [unreachable] * len(self._tiles)
+        distance[destination] = 0
+        buckets = [[destination]]
+        order = []
+        d = 0
+        while d < len(buckets):
+            for u in buckets[d]:
+                if distance[u] != d:
+                    continue
+                order.append(u)
+                for v, weight in self._neighbors[u]:
+                    if distance[v] == unreachable or d + weight < distance[v]:
+                        distance[v] = d + weight
+                        while len(buckets) <= d + weight:
+                            buckets.append([])
+                        buckets[d + weight].append(v)
+            d += 1
+        next_hop = [None] * len(self._tiles)
+        for u in order[1:]:
+            # among the links on a minimal path, take the lightest one
+            next_weight = None
+            for v, weight in self._neighbors[u]:
+                if distance[v] == distance[u] - weight and (
+                    next_weight is None or weight < next_weight
+                ):
+                    next_hop[u] = v
+                    next_weight = weight
+        order.reverse()
+        tree = (next_hop, order)
+        self._routing_trees[destination] = tree
+        return tree
+
+    def _get_route(self, source: int, destination: int) -> List[int]:
+        next_hop, _ = self._get_routing_tree(destination)
+        if source != destination and next_hop[source] is None:
+            raise ValueError(
+                f"Tile {self._tiles[destination]} is not reachable from "
+                f"tile {self._tiles[source]}"
+            )
+        route = [source]
+        while route[-1] != destination:
+            route.append(next_hop[route[-1]])
+        return route
+
+    def get_route(
+        self, source: Coordinate, destination: Coordinate
+    ) -> List[Coordinate]:
+        route = self._get_route(
+            self._tile_index[source.get_hash()],
+            self._tile_index[destination.get_hash()],
+        )
+        return [
+            Coordinate.create_coordinate_from_tuple(self._tiles[u]) for u in route
+        ]
+
+    # Number of hops from every tile to the destination along the routes.
+    # Unreachable tiles are at distance -1.
+    def _get_hops_to(self, destination: int) -> List[int]:
+        hops = self._hops_to[destination]
+        if hops is None and self._get_dimension_order() is not None:
+            dx, dy = self._tiles[destination]
+            hops = [abs(x - dx) + abs(y - dy) for x, y in self._tiles]
+            self._hops_to[destination] = hops
+        elif hops is None:
+            next_hop, order = self._get_routing_tree(destination)
+            hops = [-1] * len(self._tiles)
+            hops[destination] = 0
+            for u in reversed(order):
+                if next_hop[u] is not None:
+                    hops[u] = hops[next_hop[u]] + 1
+            self._hops_to[destination] = hops
+        return hops
+
+    # Number of mesh hops between every pair of tiles along the routed path,
+    # indexed like get_tiles(): matrix[source][destination].
+    def get_distance_matrix(self) -> List[List[int]]:
+        columns = [self._get_hops_to(v) for v in range(len(self._tiles))]
+        return [list(row) for row in zip(*columns)]
+
+    # Index in destinations of the closest destination of every source. Ties
+    # go to the destination with the fewest sources so far, and the
+    # destinations a source cannot reach are skipped.
+    def get_nearest(
+        self, sources: List[Coordinate], destinations: List[Coordinate]
+    ) -> List[int]:
+        hops = [
+            self._get_hops_to(self._tile_index[d.get_hash()]) for d in destinations
+        ]
+        num_sources = [0] * len(destinations)
+        nearest = []
+        for source in sources:
+            s = self._tile_index[source.get_hash()]
+            reachable = [i for i in range(len(destinations)) if hops[i][s] >= 0]
+            assert reachable, f"Tile {source} cannot reach any of the destinations"
+            i = min(reachable, key=lambda i: (hops[i][s], num_sources[i]))
+            num_sources[i] += 1
+            nearest.append(i)
+        return nearest
+
+    # largest number of hops between two tiles
+    def get_diameter(self) -> int:
+        return max(
+            max(self._get_hops_to(v)) for v in range(len(self._tiles))
+        )
+
+    # Total bandwidth_factor of the links crossing the middle of the mesh in
+    # one direction, for the narrower of the vertical and horizontal cuts.
+    def get_bisection_bandwidth(self) -> int:
+        cuts = []
+        for axis, size in ((0, self._width), (1, self._height)):
+            if size < 2:
+                continue
+            bandwidth = 0
+            for src, dst, _ in TopologyType.get_links(
+                self._topology, self._mesh_descriptor
+            ):
+                if src.get_hash()[axis] < size // 2 <= dst.get_hash()[axis]:
+                    profile = self._mesh_descriptor.get_mesh_link_profile(src, dst)
+                    bandwidth += profile.bandwidth_factor
+            cuts.append(bandwidth)
+        return min(cuts, default=0)
+
+    # On a mesh without holes, every route is a minimal path that resolves one
+    # dimension and then the other, which lets the hop counts and link loads
+    # be computed in closed form. Returns "xy" or "yx" in that case, None
+    # otherwise.
+    def _get_dimension_order(self) -> Optional[str]:
+        if self._topology != TopologyType.Mesh:
+            return None
+        if self._mesh_descriptor.get_express_links():
+            return None
+        if len(self._tiles) != self._width * self._height:
+            return None
+        if self._routing_algorithm == RoutingAlgorithm.XY:
+            return "xy"
+        # With equal weights, the routes take the first minimal link in the
+        # order of _build_neighbors(), i.e. the vertical links come first.
+        return "yx"
+
+    def get_hop_stats(
+        self,
+        sources: List[Coordinate],
+        destinations: List[Coordinate],
+        destination_weights: Optional[List[float]] = None,
+    ) -> HopStats:
+        # Every source spreads its traffic over the destinations according to
+        # destination_weights (uniformly by default).
+        if not sources or not destinations:
+            return HopStats(average=0.0, worst=0)
+        if destination_weights is None:
+            destination_weights = [1.0] * len(destinations)
+        total_weight = sum(destination_weights)
+        if self._get_dimension_order() is not None:
+            total, worst = self._get_manhattan_hop_totals(
+                sources, destinations, destination_weights
+            )
+            return HopStats(
+                average=total / (len(sources) * total_weight), worst=worst
+            )
+        source_indices = [self._tile_index[s.get_hash()] for s in sources]
+        total = 0.0
+        worst = 0
+        for destination, weight in zip(destinations, destination_weights):
+            if weight <= 0:
+                continue
+            hops = self._get_hops_to(self._tile_index[destination.get_hash()])
+            source_hops = [hops[u] for u in source_indices]
+            total += sum(source_hops) * weight
+            worst = max(worst, max(source_hops))
+        return HopStats(average=total / (len(sources) * total_weight), worst=worst)
+
+    def _get_manhattan_hop_totals(
+        self,
+        sources: List[Coordinate],
+        destinations: List[Coordinate],
+        destination_weights: List[float],
+    ) -> Tuple[float, int]:
+        # histograms of the source coordinates along each axis give the sum of
+        # distances to a destination in O(width + height), and the extremes of
+        # x + y and x - y give the farthest source in O(1)
+        count_x = [0] * self._width
+        count_y = [0] * self._height
+        for source in sources:
+            count_x[source.x] += 1
+            count_y[source.y] += 1
+        sums = [source.x + source.y for source in sources]
+        diffs = [source.x - source.y for source in sources]
+        min_sum, max_sum = min(sums), max(sums)
+        min_diff, max_diff = min(diffs), max(diffs)
+        total = 0.0
+        worst = 0
+        for destination, weight in zip(destinations, destination_weights):
+            if weight <= 0:
+                continue
+            dx, dy = destination.x, destination.y
+            total += weight * (
+                sum(c * abs(x - dx) for x, c in enumerate(count_x) if c)
+                + sum(c * abs(y - dy) for y, c in enumerate(count_y) if c)
+            )
+            worst = max(
+                worst,
+                max_sum - (dx + dy),
+                (dx + dy) - min_sum,
+                max_diff - (dx - dy),
+                (dx - dy) - min_diff,
+            )
+        return total, worst
+
+    def get_link_loads(self, flows: List[Flow]) -> Dict[Link, float]:
+        # group the traffic by destination, then push it down the routing
+        # tree of that destination: the load of the link leaving a tile is
+        # the traffic injected at that tile plus everything routed through it
+        demand_by_destination = {}
+        for source, destination, amount in flows:
+            demand = demand_by_destination.setdefault(
+                self._tile_index[destination], [0.0] * len(self._tiles)
+            )
+            demand[self._tile_index[source]] += amount
+        loads = {}
+        for destination, demand in demand_by_destination.items():
+            self._add_tree_loads(destination, demand, loads)
+        return loads
+
+    def _add_tree_loads(
+        self, destination: int, demand: List[float], loads: Dict[Link, float]
+    ) -> None:
+        next_hop, order = self._get_routing_tree(destination)
+        for u in order:
+            v = next_hop[u]
+            if v is None or demand[u] == 0.0:
+                continue
+            link = (self._tiles[u], self._tiles[v])
+            loads[link] = loads.get(link, 0.0) + demand[u]
+            demand[v] += demand[u]
+
+    # Link loads when every source sends source_amounts[s] * weight[d] /
+    # sum(weights) to every destination d, e.g. cores spreading their misses
+    # over the L3 slices.
+    def get_all_to_all_link_loads(
+        self,
+        sources: List[Coordinate],
+        source_amounts: List[float],
+        destinations: List[Coordinate],
+        destination_weights: List[float],
+        loads: Optional[Dict[Link, float]] = None,
+    ) -> Dict[Link, float]:
+        if loads is None:
+            loads = {}
+        total_weight = sum(destination_weights)
+        if not sources or total_weight <= 0:
+            return loads
+        dimension_order = self._get_dimension_order()
+        if dimension_order is not None:
+            add_dimension_ordered_loads(
+                self._width,
+                self._height,
+                dimension_order,
+                [source.get_hash() for source in sources],
+                source_amounts,
+                [destination.get_hash() for destination in destinations],
+                [weight / total_weight for weight in destination_weights],
+                loads,
+            )
+            return loads
+        source_demand = [0.0] * len(self._tiles)
+        for source, amount in zip(sources, source_amounts):
+            source_demand[self._tile_index[source.get_hash()]] += amount
+        for destination, weight in zip(destinations, destination_weights):
+            if weight <= 0:
+                continue
+            self._add_tree_loads(
+                self._tile_index[destination.get_hash()],
+                [amount * weight / total_weight for amount in source_demand],
+                loads,
+            )
+        return loads
+
+    def get_l3_slice_coordinates(self) -> List[Coordinate]:
+        # same order as MeshCache._get_all_l3_slices()
+        return self._mesh_descriptor.get_tiles_coordinates(
+            NodeType.CoreTile
+        ) + self._mesh_descriptor.get_tiles_coordinates(NodeType.L3OnlyTile)
+
+    # Uniform traffic: every core sends one unit of L2 misses, spread over the
+    # L3 slices like the address interleaving does; every slice sends
+    # l3_miss_ratio of what it receives to the memory tiles, spread evenly.
+    def get_uniform_link_loads(
+        self,
+        l3_slice_weights: Optional[List[float]] = None,
+        l3_miss_ratio: float = 1.0,
+    ) -> Dict[Link, float]:
+        cores = self._mesh_descriptor.get_tiles_coordinates(NodeType.CoreTile)
+        l3_slices = self.get_l3_slice_coordinates()
+        mem_tiles = self._mesh_descriptor.get_tiles_coordinates(NodeType.MemTile)
+        if l3_slice_weights is None:
+            l3_slice_weights = [1.0] * len(l3_slices)
+        loads = self.get_all_to_all_link_loads(
+            cores, [1.0] * len(cores), l3_slices, l3_slice_weights
+        )
+        total_weight = sum(l3_slice_weights)
+        l3_slice_traffic = [
+            len(cores) * weight / total_weight * l3_miss_ratio
+            for weight in l3_slice_weights
+        ]
+        return self.get_all_to_all_link_loads(
+            l3_slices, l3_slice_traffic, mem_tiles, [1.0] * len(mem_tiles), loads
+        )
+
+    def analyze(
+        self,
+        l3_slice_weights: Optional[List[float]] = None,
+        l3_miss_ratio: float = 1.0,
+    ) -> "MeshAnalysisReport":
+        cores = self._mesh_descriptor.get_tiles_coordinates(NodeType.CoreTile)
+        l3_slices = self.get_l3_slice_coordinates()
+        mem_tiles = self._mesh_descriptor.get_tiles_coordinates(NodeType.MemTile)
+        return MeshAnalysisReport(
+            name=self._mesh_descriptor.name,
+            core_to_l3=self.get_hop_stats(cores, l3_slices, l3_slice_weights),
+            l3_to_mem=self.get_hop_stats(l3_slices, mem_tiles),
+            link_loads=self.get_uniform_link_loads(l3_slice_weights, l3_miss_ratio),
+        )
+
+
+class MeshAnalysisReport:
+    def __init__(
+        self,
+        name: str,
+        core_to_l3: HopStats,
+        l3_to_mem: HopStats,
+        link_loads: Dict[Link, float],
+    ) -> None:
+        self.name = name
+        self.core_to_l3 = core_to_l3
+        self.l3_to_mem = l3_to_mem
+        self.link_loads = link_loads
+
+    def get_max_link_load(self) -> float:
+        return max(self.link_loads.values(), default=0.0)
+
+    def get_average_link_load(self) -> float:
+        if not self.link_loads:
+            return 0.0
+        return sum(self.link_loads.values()) / len(self.link_loads)
+
+    def get_hottest_links(self, n: int = 4) -> List[Tuple[Link, float]]:
+        return sorted(self.link_loads.items(), key=lambda kv: -kv[1])[:n]
+
+    def __str__(self) -> str:
+        s = [
+            f"{self.name}:",
+            f"  core -> L3:  {self.core_to_l3}",
+            f"  L3 -> mem:   {self.l3_to_mem}",
+            f"  link load:   avg {self.get_average_link_load():.3f}, "
+            f"max {self.get_max_link_load():.3f}",
+        ]
+        for (src, dst), load in self.get_hottest_links():
+            s.append(f"    {src} -> {dst}: {load:.3f}")
+        return "\n".join(s)
+
+
+if __name__ == "__main__":
+    import copy
+
+    from ..benchmarks.MeshTrackerBenchmark import build_mesh
+    from ..components.PrebuiltMesh import PrebuiltMesh
+
+    for routing_algorithm in [RoutingAlgorithm.Shortest, RoutingAlgorithm.XY]:
+        print(f"routing: {RoutingAlgorithm.to_string(routing_algorithm)}")
+        for mesh in [
+            PrebuiltMesh.getMesh1("mesh1", has_dma=True),
+            PrebuiltMesh.getMesh3("mesh3", has_dma=True),
+            PrebuiltMesh.getMesh8("mesh8"),
+        ]:
+            print(MeshAnalyzer(mesh, routing_algorithm).analyze())
+
+    for width, height in [(8, 10), (16, 10)]:
+        mesh = build_mesh(width, height)
+        print(f"topologies of {mesh.name}:")
+        for topology in [
+            TopologyType.Mesh,
+            TopologyType.Torus,
+            TopologyType.FoldedTorus,
+            TopologyType.RingOfRings,
+        ]:
+            analyzer = MeshAnalyzer(mesh, topology=topology)
+            report = analyzer.analyze()
+            print(
+                f"  {TopologyType.to_string(topology):>12}: "
+                f"diameter {analyzer.get_diameter():>2}, "
+                f"bisection {analyzer.get_bisection_bandwidth():>4}, "
+                f"core -> L3 {report.core_to_l3.average:.3f} hops, "
+                f"max link load {report.get_max_link_load():.1f}"
+            )
+
+    for base_mesh in [
+        PrebuiltMesh.getMesh3("mesh3", has_dma=True),
+        PrebuiltMesh.getMesh8("mesh8"),
+    ]:
+        print(f"express links on {base_mesh.name}:")
+        for skip in [None, 2, 4]:
+            # every skip on its own copy of the mesh
+            mesh = base_mesh
+            if skip is not None:
+                mesh = copy.deepcopy(base_mesh)
+                mesh.add_express_links(skip)
+            analyzer = MeshAnalyzer(mesh)
+            mem_to_dma = analyzer.get_hop_stats(
+                mesh.get_tiles_coordinates(NodeType.MemTile),
+                mesh.get_tiles_coordinates(NodeType.DMATile),
+            )
+            print(
+                f"  skip {str(skip):>4}: diameter {analyzer.get_diameter()}, "
+                f"mem -> DMA {mem_to_dma}"
+            )
@@ -0,0 +1,257 @@
+# Copyright (c) 2026 The Regents of the University of California
+# All rights reserved.
+# SPDX-License-Identifier: BSD-3-Clause
+
+# Grids of the statistics of the mesh links of a SimpleNetwork, one per
+# direction, from the stats.txt of a run and the network.json written by
+# MeshNetworkBase.dump_network_metadata() after m5.instantiate().
+
+import argparse
+import csv
+import json
+import re
+from typing import Any, Dict, List, Optional, Tuple
+
+from .StatsReport import read_stats
+
+metrics = {
+    "utilization": "link_utilization",
+    "messages": "total_msg_count",
+    "wait": "avg_msg_wait_time",
+    "queued": "m_buf_msgs",
+    "stall": "m_stall_time",
+}
+# the metrics summed over the message buffers of a link, one per vnet
+buffer_metrics = ["queued", "stall"]
+
+_throttle_stat = re.compile(r"^(.+)\.throttle0*(\d+)\.([\w.:]+)$")
+_buffer_stat = re.compile(r"^(.+)\.buffers\d+\.(\w+)$")
+
+
+class LinkTraffic:
+    def __init__(
+        self,
+        path: str,
+        src: Optional[Tuple[int, int]],
+        dst: Optional[Tuple[int, int]],
+        direction: Optional[str],
+        values: Dict[str, float],
+    ) -> None:
+        self.path = path
+        self.src = src
+        self.dst = dst
+        self.direction = direction
+        self.values = values
+
+    def get(self, metric: str) -> float:
+        return self.values.get(metric, 0.0)
+
+
+class MeshHeatmap:
+    def __init__(self, metadata: Dict[str, Any], stats: Dict[str, float]) -> None:
+        assert (
+            metadata["backend"] == "Simple"
+        ), "Only the statistics of SimpleNetwork can be joined"
+        self._metadata = metadata
+        self._stats = stats
+        self._sim_seconds = stats.get("simSeconds", 0.0)
+
+        throttle_stats = {}
+        buffer_stats = {}
+        for name, value in stats.items():
+            match = _throttle_stat.match(name)
+            if match:
+                router, index, stat = match.groups()
+                throttle_stats.setdefault((router, int(index)), {})[stat] = value
+                continue
+            match = _buffer_stat.match(name)
+            if match:
+                link, stat = match.groups()
+                link_stats = buffer_stats.setdefault(link, {})
+                link_stats[stat] = link_stats.get(stat, 0.0) + value
+
+        # the statistics of the throttle driving every link
+        link_stats = {}
+        for router in metadata["routers"]:
+            for index, link in enumerate(router["throttles"]):
+                link_stats[link] = throttle_stats.get((router["path"], index), {})
+
+        def get_values(path):
+            values = {}
+            for metric, stat in metrics.items():
+                if metric in buffer_metrics:
+                    value = buffer_stats.get(path, {}).get(stat)
+                else:
+                    value = link_stats.get(path, {}).get(stat)
+                if value is not None:
+                    values[metric] = value
+            return values
+
+        def get_coordinate(d, key):
+            return None if key not in d else tuple(d[key])
+
+        self._int_links = [
+            (
+                link,
+                LinkTraffic(
+                    link["path"],
+                    get_coordinate(link, "coordinate"),
+                    get_coordinate(link, "dst_coordinate"),
+                    link.get("direction"),
+                    get_values(link["path"]),
+                ),
+            )
+            for link in metadata["int_links"]
+        ]
+        self._ext_links = [
+            (
+                link,
+                LinkTraffic(
+                    link["path"],
+                    get_coordinate(link, "coordinate"),
+                    None,
+                    None,
+                    get_values(link["path"]),
+                ),
+            )
+            for link in metadata["ext_links"]
+        ]
+        self._router_coordinates = {
+            router["id"]: get_coordinate(router, "coordinate")
+            for router in metadata["routers"]
+        }
+
+    @classmethod
+    def load(cls, metadata_path: str, stats_path: str, dump: int = 0) -> "MeshHeatmap":
+        with open(metadata_path) as f:
+            metadata = json.load(f)
+        return cls(metadata, read_stats(stats_path, dump))
+
+    # the links between the tiles, which have a direction
+    def get_mesh_links(self) -> List[LinkTraffic]:
+        return [
+            traffic for _, traffic in self._int_links if traffic.direction is not None
+        ]
+
+    def get_hottest_links(self, metric: str, n: int = 8) -> List[LinkTraffic]:
+        return sorted(self.get_mesh_links(), key=lambda link: -link.get(metric))[:n]
+
+    def get_size(self) -> Tuple[int, int]:
+        coordinates = [c for c in self._router_coordinates.values() if c is not None]
+        assert coordinates, "No router has a mesh coordinate"
+        return (
+            max(x for x, _ in coordinates) + 1,
+            max(y for _, y in coordinates) + 1,
+        )
+
+    def _get_rate(self, num_messages: float) -> float:
+        if self._sim_seconds == 0.0:
+            return 0.0
+        return num_messages / self._sim_seconds / 1e6
+
+    # Messages per simulated microsecond (injected, ejected) by the
+    # controllers of every tile. The messages the routers of a tile send
+    # are the ones they receive, from the other routers or from the
+    # controllers, up to the messages still buffered at the end.
+    def get_tile_rates(self) -> Dict[Tuple[int, int], Tuple[float, float]]:
+        sent = {}
+        received = {}
+        ejected = {}
+        for link, traffic in self._int_links:
+            src = self._router_coordinates[link["src"]]
+            dst = self._router_coordinates[link["dst"]]
+            if src == dst:
+                continue
+            num_messages = traffic.get("messages")
+            if src is not None:
+                sent[src] = sent.get(src, 0.0) + num_messages
+            if dst is not None:
+                received[dst] = received.get(dst, 0.0) + num_messages
+        for link, traffic in self._ext_links:
+            tile = self._router_coordinates[link["router"]]
+            if tile is not None:
+                ejected[tile] = ejected.get(tile, 0.0) + traffic.get("messages")
+        tiles = set(sent) | set(received) | set(ejected)
+        return {
+            tile: (
+                self._get_rate(
+                    sent.get(tile, 0.0)
+                    + ejected.get(tile, 0.0)
+                    - received.get(tile, 0.0)
+                ),
+                self._get_rate(ejected.get(tile, 0.0)),
+            )
+            for tile in tiles
+        }
+
+    def format_grid(self, values: Dict[Tuple[int, int], float]) -> str:
+        width, height = self.get_size()
+        rows = ["    " + "".join(f"{x:>9}" for x in range(width))]
+        for y in range(height):
+            row = f"{y:>4}"
+            for x in range(width):
+                if (x, y) in values:
+                    row += f"{values[(x, y)]:>9.3g}"
+                else:
+                    row += f"{'.':>9}"
+            rows.append(row)
+        return "\n".join(rows)
+
+    def format_link_heatmaps(self, metric: str) -> str:
+        links_by_direction = {}
+        for link in self.get_mesh_links():
+            links_by_direction.setdefault(link.direction, {})
+            # several links of a direction leave a tile with express links
+            values = links_by_direction[link.direction]
+            values[link.src] = max(values.get(link.src, 0.0), link.get(metric))
+        s = []
+        for direction in ["north", "south", "west", "east"]:
+            if direction in links_by_direction:
+                s.append(f"{metric} of the {direction} links:")
+                s.append(self.format_grid(links_by_direction[direction]))
+        return "\n".join(s)
+
+    def format_tile_heatmaps(self) -> str:
+        rates = self.get_tile_rates()
+        return "\n".join(
+            [
+                "messages injected per us:",
+                self.format_grid({t: injected for t, (injected, _) in rates.items()}),
+                "messages ejected per us:",
+                self.format_grid({t: ejected for t, (_, ejected) in rates.items()}),
+            ]
+        )
+
+    def save_csv(self, path: str) -> None:
+        with open(path, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(["path", "src", "dst", "direction"] + list(metrics))
+            for _, link in self._int_links + self._ext_links:
+                writer.writerow(
+                    [
+                        link.path,
+                        "" if link.src is None else f"{link.src[0]} {link.src[1]}",
+                        "" if link.dst is None else f"{link.dst[0]} {link.dst[1]}",
+                        link.direction or "",
+                    ]
+                    + [link.values.get(metric, "") for metric in metrics]
+                )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("metadata", help="output of dump_network_metadata()")
+    parser.add_argument("stats", help="gem5 stats.txt")
+    parser.add_argument("--metric", choices=list(metrics), default="utilization")
+    parser.add_argument("--dump", type=int, default=0)
+    parser.add_argument("--csv", help="write the statistics of every link")
+    args = parser.parse_args()
+
+    heatmap = MeshHeatmap.load(args.metadata, args.stats, args.dump)
+    print(heatmap.format_link_heatmaps(args.metric))
+    print(heatmap.format_tile_heatmaps())
+    print(f"hottest links by {args.metric}:")
+    for link in heatmap.get_hottest_links(args.metric):
+        print(f"  {link.src} -> {link.dst}: {link.get(args.metric):.3g}")
+    if args.csv:
+        heatmap.save_csv(args.csv)
@@ -0,0 +1,246 @@
+# Copyright (c) 2026 The Regents of the University of California
+# All rights reserved.
+# SPDX-License-Identifier: BSD-3-Clause
+
+# Caps the prefetches in flight of the LLC prefetch agent of every slice, with
+# the outstanding requests of its sequencer and the TBEs of its dummy cache.
+# The prefetch distance is not tuned. The cap is fixed for a simulation, so
+# tune() reads the statistics of a run and returns the throttle of the next
+# one (additive increase, multiplicative decrease).
+
+import argparse
+import json
+import re
+from typing import Any, Dict, List, Optional
+
+from .StatsReport import print_table, read_stats
+
+# average utilization of the transaction buffers of a CHI controller
+tbe_utilization_stat = "storTBEs.avg_util"
+# number of the reads of a sequencer that miss in its cache
+sequencer_miss_stat = "miss_latency_hist_seqr::samples"
+# number of the requests of a CHI controller stalled behind a busy line
+stalled_request_stat = "reqRdy.m_stall_count"
+_mem_queue_stat = re.compile(r"\.avgRdQLen$")
+
+
+class PrefetchStats:
+    def __init__(
+        self,
+        issued: float,
+        useful: float,
+        late: float,
+        polluting: float,
+        tbe_utilization: float,
+    ) -> None:
+        self.issued = issued
+        self.useful = useful
+        self.late = late
+        self.unused = max(0.0, issued - useful - late)
+        self.polluting = polluting
+        self.tbe_utilization = tbe_utilization
+
+    # the prefetches of lines read by the cores, late or not
+    def get_accuracy(self) -> float:
+        if self.issued == 0.0:
+            return 1.0
+        return (self.useful + self.late) / self.issued
+
+    def get_lateness(self) -> float:
+        if self.useful + self.late == 0.0:
+            return 0.0
+        return self.late / (self.useful + self.late)
+
+
+class PrefetchThrottle:
+    def __init__(
+        self,
+        max_outstanding: int = 16,
+        min_outstanding: int = 1,
+        outstanding: Optional[List[int]] = None,
+        target_tbe_utilization: float = 0.75,
+        target_mem_queue_length: float = 8.0,
+        low_accuracy: float = 0.4,
+        high_accuracy: float = 0.75,
+        high_lateness: float = 0.1,
+    ) -> None:
+        assert 0 < min_outstanding <= max_outstanding
+        assert low_accuracy <= high_accuracy
+        self._max_outstanding = max_outstanding
+        self._min_outstanding = min_outstanding
+        self._outstanding = outstanding
+        self._target_tbe_utilization = target_tbe_utilization
+        self._target_mem_queue_length = target_mem_queue_length
+        self._low_accuracy = low_accuracy
+        self._high_accuracy = high_accuracy
+        self._high_lateness = high_lateness
+
+    def get_params(self) -> Dict[str, Any]:
+        return {
+            "max_outstanding": self._max_outstanding,
+            "min_outstanding": self._min_outstanding,
+            "outstanding": self._outstanding,
+            "target_tbe_utilization": self._target_tbe_utilization,
+            "target_mem_queue_length": self._target_mem_queue_length,
+            "low_accuracy": self._low_accuracy,
+            "high_accuracy": self._high_accuracy,
+            "high_lateness": self._high_lateness,
+        }
+
+    # the prefetches in flight of the agent of every slice, all of them at
+    # max_outstanding until tuned
+    def get_outstanding(self, num_slices: int) -> List[int]:
+        if self._outstanding is None:
+            return [self._max_outstanding] * num_slices
+        assert (
+            len(self._outstanding) == num_slices
+        ), f"The throttle has {len(self._outstanding)} slices, not {num_slices}"
+        return list(self._outstanding)
+
+    # Caps the prefetches in flight through the sequencer of an agent and
+    # its dummy cache.
+    def configure(self, sequencer, dummy_cache, outstanding: int) -> None:
+        sequencer.max_outstanding_requests = outstanding
+        dummy_cache.number_of_TBEs = outstanding
+
+    # The prefetches are classified against a baseline run without the
+    # pickle prefetcher: useful ones remove demand misses, late ones add
+    # demand requests stalled behind a busy line, and polluting ones add
+    # demand misses. Without a baseline, every prefetch is useful.
+    @classmethod
+    def get_slice_stats(
+        cls,
+        metadata: Dict[str, Any],
+        stats: Dict[str, float],
+        baseline: Optional[Dict[str, float]] = None,
+    ) -> List[PrefetchStats]:
+        slice_stats = []
+        for agent in metadata["agents"]:
+            l3_slice = agent["l3_slice"]
+            issued = stats.get(f"{agent['sequencer']}.{sequencer_miss_stat}", 0.0)
+            misses = stats.get(f"{l3_slice}.cache.m_demand_misses", 0.0)
+            useful = issued
+            late = 0.0
+            polluting = 0.0
+            if baseline is not None:
+                saved = baseline.get(f"{l3_slice}.cache.m_demand_misses", 0.0) - (
+                    misses - issued
+                )
+                useful = min(issued, max(0.0, saved))
+                polluting = max(0.0, -saved)
+                stall_stat = f"{l3_slice}.{stalled_request_stat}"
+                stalled = stats.get(stall_stat, 0.0) - baseline.get(stall_stat, 0.0)
+                late = min(issued - useful, max(0.0, stalled))
+            slice_stats.append(
+                PrefetchStats(
+                    issued,
+                    useful,
+                    late,
+                    polluting,
+                    stats.get(f"{agent['l3_slice']}.{tbe_utilization_stat}", 0.0),
+                )
+            )
+        return slice_stats
+
+    # the average length of the deepest memory read queue
+    @classmethod
+    def get_mem_queue_length(cls, stats: Dict[str, float]) -> float:
+        return max(
+            (value for name, value in stats.items() if _mem_queue_stat.search(name)),
+            default=0.0,
+        )
+
+    def tune(
+        self,
+        metadata: Dict[str, Any],
+        stats: Dict[str, float],
+        baseline: Optional[Dict[str, float]] = None,
+    ) -> "PrefetchThrottle":
+        slice_stats = self.get_slice_stats(metadata, stats, baseline)
+        mem_busy = self.get_mem_queue_length(stats) > self._target_mem_queue_length
+        outstanding = []
+        for current, s in zip(self.get_outstanding(len(slice_stats)), slice_stats):
+            # back off when the slice or the memory is busy or the prefetches
+            # are inaccurate, grow when they are accurate or late
+            accuracy = s.get_accuracy()
+            if (
+                mem_busy
+                or s.tbe_utilization > self._target_tbe_utilization
+                or accuracy < self._low_accuracy
+            ):
+                current = max(self._min_outstanding, current // 2)
+            elif (
+                accuracy > self._high_accuracy
+                or s.get_lateness() > self._high_lateness
+            ):
+                current = min(self._max_outstanding, current + 1)
+            outstanding.append(current)
+        params = self.get_params()
+        params["outstanding"] = outstanding
+        return PrefetchThrottle(**params)
+
+    def __str__(self) -> str:
+        if self._outstanding is None:
+            return f"{self._max_outstanding} prefetches in flight per slice"
+        return f"{self._outstanding} prefetches in flight"
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("metadata", help="output of dump_llc_prefetch_metadata()")
+    parser.add_argument("stats", help="gem5 stats.txt")
+    parser.add_argument("--baseline", help="stats.txt without the pickle prefetcher")
+    parser.add_argument("--dump", type=int, default=0)
+    parser.add_argument("--params", help="write the parameters of the next run")
+    args = parser.parse_args()
+
+    with open(args.metadata) as f:
+        metadata = json.load(f)
+    stats = read_stats(args.stats, args.dump)
+    baseline = None
+    if args.baseline:
+        baseline = read_stats(args.baseline, args.dump)
+    throttle = PrefetchThrottle(**metadata["throttle"])
+    tuned = throttle.tune(metadata, stats, baseline)
+
+    print(
+        f"memory read queue length {PrefetchThrottle.get_mem_queue_length(stats):.2f}"
+    )
+    slice_stats = PrefetchThrottle.get_slice_stats(metadata, stats, baseline)
+    num_slices = len(slice_stats)
+    print_table(
+        [
+            ("slice", 5, ""),
+            ("issued", 10, ".0f"),
+            ("useful", 10, ".0f"),
+            ("late", 10, ".0f"),
+            ("unused", 10, ".0f"),
+            ("polluting", 10, ".0f"),
+            ("accuracy", 9, ".3f"),
+            ("TBE util", 9, ".3f"),
+            ("in flight", 10, ""),
+        ],
+        [
+            (
+                i,
+                s.issued,
+                s.useful,
+                s.late,
+                s.unused,
+                s.polluting,
+                s.get_accuracy(),
+                s.tbe_utilization,
+                f"{current} -> {tuned_outstanding}",
+            )
+            for i, (s, current, tuned_outstanding) in enumerate(
+                zip(
+                    slice_stats,
+                    throttle.get_outstanding(num_slices),
+                    tuned.get_outstanding(num_slices),
+                )
+            )
+        ],
+    )
+    if args.params:
+        with open(args.params, "w") as f:
+            json.dump(tuned.get_params(), f, indent=1)
@@ -0,0 +1,60 @@
+# Copyright (c) 2026 The Regents of the University of California
+# All rights reserved.
+# SPDX-License-Identifier: BSD-3-Clause
+
+# Reading gem5 stats.txt dumps and printing the tables of the stats tools.
+
+import re
+from typing import Any, Dict, Iterable, List, Sequence, Tuple
+
+# (title, width, format) of a column of a table
+Column = Tuple[str, int, str]
+
+
+# The statistics of the given dump of a stats.txt file, by name. Vectors
+# keep their "name::element" entries and distributions are skipped.
+def read_stats(path: str, dump: int = 0) -> Dict[str, float]:
+    stats = {}
+    current_dump = -1
+    with open(path) as f:
+        for line in f:
+            if line.startswith("---------- Begin"):
+                current_dump += 1
+                continue
+            if current_dump != dump or line.startswith("----------"):
+                continue
+            fields = line.split()
+            if len(fields) < 2:
+                continue
+            try:
+                stats[fields[0]] = float(fields[1])
+            except ValueError:
+                continue
+    assert stats, f"{path} has no statistics dump {dump}"
+    return stats
+
+
+# The statistics matching pattern, whose first group is the path of an
+# object and second group the name of the statistic, by object then by
+# statistic. Only the statistics whose name starts with prefix are kept.
+def group_stats(
+    stats: Dict[str, float], pattern: "re.Pattern[str]", prefix: str = ""
+) -> Dict[str, Dict[str, float]]:
+    groups = {}
+    for name, value in stats.items():
+        match = pattern.match(name)
+        if match and name.startswith(prefix):
+            obj, stat = match.group(1, 2)
+            groups.setdefault(obj, {})[stat] = value
+    return groups
+
+
+def print_table(columns: List[Column], rows: Iterable[Sequence[Any]]) -> None:
+    print(" ".join(f"{title:>{width}}" for title, width, _ in columns))
+    for row in rows:
+        print(
+            " ".join(
+                f"{value:>{width}{spec}}"
+                for value, (_, width, spec) in zip(row, columns)
+            )
+        )
@@ -0,0 +1,116 @@
+# Copyright (c) 2026 The Regents of the University of California
+# All rights reserved.
+# SPDX-License-Identifier: BSD-3-Clause
+
+# Sub-NUMA clustering: the mesh and the memory are cut into as many clusters
+# and regions, and the addresses of a region are interleaved among the L3
+# slices of its cluster only. Placing pages in the local region is up to the
+# OS or the workload.
+
+from typing import Any, Dict, List, Tuple
+
+from ..components.MeshDescriptor import Coordinate, MeshTracker
+from .AddressInterleaving import (
+    AddressInterleaving,
+    InterleavedRange,
+    check_slice_ranges,
+)
+
+
+class SubNumaClustering:
+    def __init__(self, num_columns: int = 2, num_rows: int = 2) -> None:
+        assert num_columns > 0 and num_rows > 0
+        self._num_columns = num_columns
+        self._num_rows = num_rows
+
+    def get_params(self) -> Dict[str, Any]:
+        return {"num_columns": self._num_columns, "num_rows": self._num_rows}
+
+    def get_num_clusters(self) -> int:
+        return self._num_columns * self._num_rows
+
+    def get_cluster(self, coordinate: Coordinate, mesh: MeshTracker) -> int:
+        column = coordinate.x * self._num_columns // mesh.get_width()
+        row = coordinate.y * self._num_rows // mesh.get_height()
+        return row * self._num_columns + column
+
+    # The regions are multiples of the largest interleaving granularity, the
+    # last one taking the remainder of the memory.
+    def get_regions(self, start: int, size: int) -> List[Tuple[int, int]]:
+        num_clusters = self.get_num_clusters()
+        alignment = AddressInterleaving.max_granularity
+        region_size = size // num_clusters // alignment * alignment
+        assert region_size > 0, "The memory is too small to be split in clusters"
+        regions = []
+        for cluster in range(num_clusters):
+            region_start = start + cluster * region_size
+            if cluster == num_clusters - 1:
+                region_size = start + size - region_start
+            regions.append((region_start, region_size))
+        return regions
+
+    # The ranges of the L3 slices at the given coordinates, in the same order.
+    def get_slice_ranges(
+        self,
+        interleaving: AddressInterleaving,
+        slice_coordinates: List[Coordinate],
+        mesh: MeshTracker,
+        start: int,
+        size: int,
+    ) -> List[List[InterleavedRange]]:
+        clusters = [self.get_cluster(c, mesh) for c in slice_coordinates]
+        slice_ranges = [None] * len(slice_coordinates)
+        for cluster, (region_start, region_size) in enumerate(
+            self.get_regions(start, size)
+        ):
+            slice_ids = [i for i, c in enumerate(clusters) if c == cluster]
+            assert slice_ids, f"Cluster {cluster} of {mesh.name} has no L3 slice"
+            cluster_ranges = interleaving.get_slice_ranges(
+                region_start, region_size, len(slice_ids)
+            )
+            check_slice_ranges(cluster_ranges, region_start, region_size)
+            for slice_id, ranges in zip(slice_ids, cluster_ranges):
+                slice_ranges[slice_id] = ranges
+        return slice_ranges
+
+    def __str__(self) -> str:
+        return f"SNC {self._num_columns}x{self._num_rows}"
+
+
+if __name__ == "__main__":
+    from ..components.MeshDescriptor import NodeType
+    from ..benchmarks.MeshTrackerBenchmark import build_mesh
+    from ..components.PrebuiltMesh import PrebuiltMesh
+    from .MeshAnalyzer import MeshAnalyzer
+
+    # average core -> home L3 slice hops, for a core accessing the memory of
+    # its own cluster
+    meshes = [
+        PrebuiltMesh.getMesh3("mesh3", has_dma=False),
+        PrebuiltMesh.getMesh8("mesh8"),
+        build_mesh(8, 10),
+        build_mesh(16, 18),
+    ]
+    clusterings = [
+        SubNumaClustering(1, 1),
+        SubNumaClustering(2, 1),
+        SubNumaClustering(1, 2),
+        SubNumaClustering(2, 2),
+    ]
+    for mesh in meshes:
+        analyzer = MeshAnalyzer(mesh)
+        cores = mesh.get_tiles_coordinates(NodeType.CoreTile)
+        l3_slices = analyzer.get_l3_slice_coordinates()
+        print(f"{mesh.name}: {len(cores)} cores, {len(l3_slices)} L3 slices")
+        for clustering in clusterings:
+            total = 0.0
+            for cluster in range(clustering.get_num_clusters()):
+                local_cores = [
+                    c for c in cores if clustering.get_cluster(c, mesh) == cluster
+                ]
+                local_slices = [
+                    c for c in l3_slices if clustering.get_cluster(c, mesh) == cluster
+                ]
+                stats = analyzer.get_hop_stats(local_cores, local_slices)
+                total += stats.average * len(local_cores)
+            print(f"  {str(clustering):>8}: avg {total / len(cores):.3f} hops")
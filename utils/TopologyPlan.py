@@ -0,0 +1,351 @@
+# Copyright (c) 2026 The Regents of the University of California
+# All rights reserved.
+# SPDX-License-Identifier: BSD-3-Clause
+
+# The mesh links and the L3 slice ranges MeshCache derives from its
+# configuration, saved as JSON so that a sweep computes them once. Only
+# MeshCache replays plans: the CCDs and IOD of MultiCCDCache build their own
+# meshes, which a plan does not describe.
+
+import hashlib
+import json
+import os
+from typing import Any, Dict, List, Optional, Tuple
+
+from ..components.MeshDescriptor import (
+    Coordinate,
+    LinkProfile,
+    MeshTracker,
+    NodeType,
+    RoutingAlgorithm,
+    TopologyType,
+)
+from .AddressInterleaving import (
+    AddressInterleaving,
+    InterleavedRange,
+    check_slice_ranges,
+)
+from .SubNumaClustering import SubNumaClustering
+
+
+class TopologyPlan:
+    version = 1
+
+    def __init__(self, plan: Dict[str, Any]) -> None:
+        assert (
+            plan.get("version") == self.version
+        ), f"Topology plan version {plan.get('version')} is not {self.version}"
+        self._plan = plan
+        self._mesh_descriptor = None
+
+    @classmethod
+    def get_config(
+        cls,
+        mesh_descriptor: MeshTracker,
+        mem_start: int,
+        mem_size: int,
+        routing_algorithm: RoutingAlgorithm = RoutingAlgorithm.Shortest,
+        topology: TopologyType = TopologyType.Mesh,
+        l3_interleaving: Optional[AddressInterleaving] = None,
+        snc_clustering: Optional[SubNumaClustering] = None,
+    ) -> Dict[str, Any]:
+        return {
+            "mesh": mesh_descriptor.to_dict(),
+            **cls._get_params(
+                mem_start,
+                mem_size,
+                routing_algorithm,
+                topology,
+                l3_interleaving,
+                snc_clustering,
+            ),
+        }
+
+    # the configuration but the mesh
+    @classmethod
+    def _get_params(
+        cls,
+        mem_start: int,
+        mem_size: int,
+        routing_algorithm: RoutingAlgorithm,
+        topology: TopologyType,
+        l3_interleaving: Optional[AddressInterleaving],
+        snc_clustering: Optional[SubNumaClustering],
+    ) -> Dict[str, Any]:
+        if l3_interleaving is None:
+            l3_interleaving = AddressInterleaving()
+        return {
+            "mem_start": mem_start,
+            "mem_size": mem_size,
+            "routing_algorithm": routing_algorithm,
+            "topology": topology,
+            "l3_interleaving": l3_interleaving.get_params(),
+            "snc_clustering": (
+                None if snc_clustering is None else snc_clustering.get_params()
+            ),
+        }
+
+    @classmethod
+    def hash_config(cls, config: Dict[str, Any]) -> str:
+        canonical = json.dumps(config, sort_keys=True, separators=(",", ":"))
+        return hashlib.sha256(canonical.encode()).hexdigest()
+
+    @classmethod
+    def create(
+        cls,
+        mesh_descriptor: MeshTracker,
+        mem_start: int,
+        mem_size: int,
+        routing_algorithm: RoutingAlgorithm = RoutingAlgorithm.Shortest,
+        topology: TopologyType = TopologyType.Mesh,
+        l3_interleaving: Optional[AddressInterleaving] = None,
+        snc_clustering: Optional[SubNumaClustering] = None,
+    ) -> "TopologyPlan":
+        if l3_interleaving is None:
+            l3_interleaving = AddressInterleaving()
+        config = cls.get_config(
+            mesh_descriptor,
+            mem_start,
+            mem_size,
+            routing_algorithm,
+            topology,
+            l3_interleaving,
+            snc_clustering,
+        )
+
+        horizontal_weight, vertical_weight = RoutingAlgorithm.get_link_weights(
+            routing_algorithm
+        )
+        mesh_links = []
+        for src, dst, direction in TopologyType.get_links(topology, mesh_descriptor):
+            weight = horizontal_weight if src.y == dst.y else vertical_weight
+            profile = mesh_descriptor.get_mesh_link_profile(src, dst)
+            mesh_links.append(
+                [
+                    src.x,
+                    src.y,
+                    dst.x,
+                    dst.y,
+                    direction,
+                    weight,
+                    profile.bandwidth_factor,
+                    profile.latency,
+                ]
+            )
+
+        # same order as MeshCache._get_all_l3_slices()
+        l3_slice_coordinates = mesh_descriptor.get_tiles_coordinates(
+            NodeType.CoreTile
+        ) + mesh_descriptor.get_tiles_coordinates(NodeType.L3OnlyTile)
+        if snc_clustering is None:
+            slice_ranges = l3_interleaving.get_slice_ranges(
+                mem_start, mem_size, len(l3_slice_coordinates)
+            )
+            check_slice_ranges(slice_ranges, mem_start, mem_size)
+            snc_regions = []
+        else:
+            slice_ranges = snc_clustering.get_slice_ranges(
+                l3_interleaving,
+                l3_slice_coordinates,
+                mesh_descriptor,
+                mem_start,
+                mem_size,
+            )
+            core_clusters = [
+                snc_clustering.get_cluster(c, mesh_descriptor)
+                for c in mesh_descriptor.get_tiles_coordinates(NodeType.CoreTile)
+            ]
+            snc_regions = [
+                [
+                    region_start,
+                    region_size,
+                    [i for i, c in enumerate(core_clusters) if c == cluster],
+                ]
+                for cluster, (region_start, region_size) in enumerate(
+                    snc_clustering.get_regions(mem_start, mem_size)
+                )
+            ]
+
+        return TopologyPlan(
+            {
+                "version": cls.version,
+                "config": config,
+                "config_hash": cls.hash_config(config),
+                "mesh_links": mesh_links,
+                "l3_slice_ranges": [
+                    [[r.start, r.size, r.masks, r.match] for r in ranges]
+                    for ranges in slice_ranges
+                ],
+                "snc_regions": snc_regions,
+            }
+        )
+
+    @classmethod
+    def load(cls, path: str) -> "TopologyPlan":
+        with open(path) as f:
+            return TopologyPlan(json.load(f))
+
+    def save(self, path: str) -> None:
+        # write to a temporary file first so that concurrent runs of a sweep
+        # never read a partial plan
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(self._plan, f)
+        os.replace(tmp_path, path)
+
+    # Loads the plan of this configuration from cache_dir, or creates it and
+    # saves it there.
+    @classmethod
+    def load_or_create(
+        cls,
+        cache_dir: str,
+        mesh_descriptor: MeshTracker,
+        mem_start: int,
+        mem_size: int,
+        routing_algorithm: RoutingAlgorithm = RoutingAlgorithm.Shortest,
+        topology: TopologyType = TopologyType.Mesh,
+        l3_interleaving: Optional[AddressInterleaving] = None,
+        snc_clustering: Optional[SubNumaClustering] = None,
+    ) -> "TopologyPlan":
+        args = (
+            mesh_descriptor,
+            mem_start,
+            mem_size,
+            routing_algorithm,
+            topology,
+            l3_interleaving,
+            snc_clustering,
+        )
+        config_hash = cls.hash_config(cls.get_config(*args))
+        path = os.path.join(cache_dir, f"{config_hash}.json")
+        if os.path.exists(path):
+            return cls.load(path)
+        plan = cls.create(*args)
+        os.makedirs(cache_dir, exist_ok=True)
+        plan.save(path)
+        return plan
+
+    def get_config_hash(self) -> str:
+        return self._plan["config_hash"]
+
+    # Whether the plan was made for this configuration. The mesh descriptor
+    # of the plan is not serialized again, so it must not be modified.
+    def matches(
+        self,
+        mesh_descriptor: MeshTracker,
+        mem_start: int,
+        mem_size: int,
+        routing_algorithm: RoutingAlgorithm = RoutingAlgorithm.Shortest,
+        topology: TopologyType = TopologyType.Mesh,
+        l3_interleaving: Optional[AddressInterleaving] = None,
+        snc_clustering: Optional[SubNumaClustering] = None,
+    ) -> bool:
+        if mesh_descriptor is not self._mesh_descriptor:
+            config = self.get_config(
+                mesh_descriptor,
+                mem_start,
+                mem_size,
+                routing_algorithm,
+                topology,
+                l3_interleaving,
+                snc_clustering,
+            )
+            return self.get_config_hash() == self.hash_config(config)
+        params = self._get_params(
+            mem_start,
+            mem_size,
+            routing_algorithm,
+            topology,
+            l3_interleaving,
+            snc_clustering,
+        )
+        return all(self._plan["config"][key] == value for key, value in params.items())
+
+    def get_mesh_descriptor(self) -> MeshTracker:
+        if self._mesh_descriptor is None:
+            self._mesh_descriptor = MeshTracker.from_dict(self._plan["config"]["mesh"])
+        return self._mesh_descriptor
+
+    def get_routing_algorithm(self) -> RoutingAlgorithm:
+        return self._plan["config"]["routing_algorithm"]
+
+    def get_topology(self) -> TopologyType:
+        return self._plan["config"]["topology"]
+
+    def get_memory(self) -> Tuple[int, int]:
+        return (self._plan["config"]["mem_start"], self._plan["config"]["mem_size"])
+
+    # (source, destination, direction, weight, profile) of every mesh link,
+    # in the order MeshNetwork.create_mesh() creates them
+    def get_mesh_links(
+        self,
+    ) -> List[Tuple[Coordinate, Coordinate, str, int, LinkProfile]]:
+        return [
+            (
+                Coordinate(src_x, src_y),
+                Coordinate(dst_x, dst_y),
+                direction,
+                weight,
+                LinkProfile(bandwidth_factor, latency),
+            )
+            for (
+                src_x,
+                src_y,
+                dst_x,
+                dst_y,
+                direction,
+                weight,
+                bandwidth_factor,
+                latency,
+            ) in self._plan["mesh_links"]
+        ]
+
+    def get_l3_slice_ranges(self) -> List[List[InterleavedRange]]:
+        return [
+            [
+                InterleavedRange(start=start, size=size, masks=masks, match=match)
+                for start, size, masks, match in ranges
+            ]
+            for ranges in self._plan["l3_slice_ranges"]
+        ]
+
+    def get_snc_regions(self) -> List[Tuple[int, int, List[int]]]:
+        return [tuple(region) for region in self._plan["snc_regions"]]
+
+
+if __name__ == "__main__":
+    import tempfile
+    import time
+
+    from ..benchmarks.MeshTrackerBenchmark import build_mesh
+
+    mem_start = 0x80000000
+    mem_size = 2**34
+    print(f"{'mesh':>10} {'create (ms)':>12} {'load (ms)':>10} {'size (KiB)':>11}")
+    with tempfile.TemporaryDirectory() as cache_dir:
+        for width, height in [(8, 10), (16, 18), (32, 34)]:
+            mesh = build_mesh(width, height)
+            mesh.add_express_links(4)
+            args = (
+                cache_dir,
+                mesh,
+                mem_start,
+                mem_size,
+                RoutingAlgorithm.XY,
+                TopologyType.Torus,
+                AddressInterleaving(hashed=True),
+                SubNumaClustering(2, 2),
+            )
+            start = time.time()
+            plan = TopologyPlan.load_or_create(*args)
+            create_time = (time.time() - start) * 1000
+            start = time.time()
+            replayed = TopologyPlan.load_or_create(*args)
+            load_time = (time.time() - start) * 1000
+            assert replayed.get_config_hash() == plan.get_config_hash()
+            assert replayed._plan == plan._plan
+            path = os.path.join(cache_dir, f"{plan.get_config_hash()}.json")
+            print(
+                f"{f'{width}x{height}':>10} {create_time:>12.1f} "
+                f"{load_time:>10.1f} {os.path.getsize(path) / 1024:>11.1f}"
+            )
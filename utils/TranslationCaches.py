@@ -0,0 +1,88 @@
+# Copyright (c) 2026 The Regents of the University of California
+# All rights reserved.
+# SPDX-License-Identifier: BSD-3-Clause
+
+# The TLBs of the MMUs of a pickle device, whose page walks go through the
+# device cache. Only Arm has the shared L2 TLB and the walk cache.
+
+import argparse
+import re
+from typing import Dict, List, Optional, Tuple
+
+from .StatsReport import group_stats, print_table, read_stats
+
+_tlb_stat = re.compile(r"^(.*\.(?:mmu|functional_mmu)\.(?:itb|dtb|l2_shared))\.(\w+)$")
+
+
+class TranslationCaches:
+    def __init__(
+        self,
+        l1_entries: int = 64,
+        l2_entries: Optional[int] = None,
+        walk_cache_levels: Optional[List[str]] = None,
+    ) -> None:
+        assert l1_entries > 0
+        assert l2_entries is None or l2_entries > 0
+        self._l1_entries = l1_entries
+        self._l2_entries = l2_entries
+        self._walk_cache_levels = walk_cache_levels
+
+    def configure(self, mmu, isa) -> None:
+        from gem5.isas import ISA
+
+        mmu.itb.size = self._l1_entries
+        mmu.dtb.size = self._l1_entries
+        if isa != ISA.ARM:
+            assert self._l2_entries is None and self._walk_cache_levels is None, (
+                f"The {isa.value} MMUs have no L2 TLB or page-walk cache, "
+                f"set only l1_entries"
+            )
+            return
+        l2_entries = 1024 if self._l2_entries is None else self._l2_entries
+        walk_cache_levels = self._walk_cache_levels
+        if walk_cache_levels is None:
+            walk_cache_levels = ["L1", "L2"]
+        mmu.l2_shared.size = l2_entries
+        mmu.l2_shared.partial_levels = walk_cache_levels
+        mmu.itb.next_level = mmu.l2_shared
+        mmu.dtb.next_level = mmu.l2_shared
+
+    # (accesses, hit rate) of every TLB. The TLBs count either their hits
+    # and misses, or their read and write accesses and misses.
+    @classmethod
+    def get_stats(
+        cls, stats: Dict[str, float], prefix: str = ""
+    ) -> Dict[str, Tuple[float, float]]:
+        rates = {}
+        for tlb, s in group_stats(stats, _tlb_stat, prefix).items():
+            if "hits" in s and "misses" in s:
+                accesses = s["hits"] + s["misses"]
+                misses = s["misses"]
+            else:
+                accesses = s.get("rdAccesses", 0.0) + s.get("wrAccesses", 0.0)
+                misses = s.get("rdMisses", 0.0) + s.get("wrMisses", 0.0)
+            hit_rate = 0.0 if accesses == 0.0 else 1.0 - misses / accesses
+            rates[tlb] = (accesses, hit_rate)
+        return rates
+
+    def __str__(self) -> str:
+        description = f"{self._l1_entries}-entry L1 TLBs"
+        if self._l2_entries is not None:
+            description += f", {self._l2_entries}-entry Arm L2 TLB"
+        if self._walk_cache_levels is not None:
+            description += f", Arm walks cached at {', '.join(self._walk_cache_levels)}"
+        return description
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("stats", help="gem5 stats.txt")
+    parser.add_argument("--prefix", default="", help="path of the devices")
+    parser.add_argument("--dump", type=int, default=0)
+    args = parser.parse_args()
+
+    rates = TranslationCaches.get_stats(read_stats(args.stats, args.dump), args.prefix)
+    print_table(
+        [("TLB", 60, ""), ("accesses", 10, ".0f"), ("hit rate", 9, ".3f")],
+        [(tlb, *rate) for tlb, rate in sorted(rates.items())],
+    )